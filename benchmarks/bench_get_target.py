@@ -0,0 +1,60 @@
+#! python
+'''Caller resolution benchmark
+Compare the resolution of the caller module through "inspect.stack" (the old "get_target" approach) with the frame walking done by "get_caller_module", from a deep call stack.
+
+Run it from the root of the repository like "python benchmarks/bench_get_target.py [stack_depth] [repetitions]"
+'''
+
+from inspect import getmodule, stack as inspect_stack
+from pathlib import Path
+from sys import argv, path as sys_path, setrecursionlimit
+from timeit import timeit
+
+sys_path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simplifiedapp._introspection import get_caller_module, get_target
+
+DEFAULT_STACK_DEPTH = 200
+DEFAULT_REPETITIONS = 50
+
+
+def caller_from_stack():
+	'''Caller module, the old way
+	What "get_target" used to do before walking the frames.
+	'''
+
+	return getmodule(inspect_stack()[2][0])
+
+def caller_from_frames():
+	'''Caller module, the new way
+	Same lookup through "get_caller_module".
+	'''
+
+	return get_caller_module(depth=1)
+
+def deep_call(depth, function):
+	'''Run a function at depth
+	Nest calls until the stack is "depth" frames deeper and run the function there.
+	'''
+
+	if depth:
+		return deep_call(depth - 1, function)
+	return function()
+
+def main(stack_depth=DEFAULT_STACK_DEPTH, repetitions=DEFAULT_REPETITIONS):
+	'''Run the benchmark
+	Time both approaches and the full "get_target" call, print the results.
+	'''
+
+	setrecursionlimit(max(1000, stack_depth * 2))
+	assert deep_call(stack_depth, caller_from_stack) is deep_call(stack_depth, caller_from_frames)
+
+	results = {}
+	for name, function in (('inspect.stack', caller_from_stack), ('get_caller_module', caller_from_frames), ('get_target', get_target)):
+		results[name] = timeit(lambda: deep_call(stack_depth, function), number=repetitions) / repetitions
+		print('{:>20}: {:10.3f} ms per call (stack depth {})'.format(name, results[name] * 1000, stack_depth))
+	print('{:>20}: {:10.1f}x'.format('speedup', results['inspect.stack'] / results['get_caller_module']))
+
+
+if __name__ == '__main__':
+	main(*(int(value) for value in argv[1:3]))
@@ -7,13 +7,28 @@ ToDo:
 '''
 
 from argparse import SUPPRESS, ArgumentDefaultsHelpFormatter, ArgumentParser, RawDescriptionHelpFormatter
-from inspect import getmodule, stack
+from collections.abc import Mapping
+from functools import partial
+from inspect import getmodule, isclass, stack
 from logging import basicConfig as logging_basicConfig, getLogger
 from logging.handlers import SysLogHandler
-from pprint import pprint as pretty_print
+from os import environ
+from pathlib import Path
 import sys
 
-from ._introspection import IS_CLASS, IS_FUNCTION, IS_MODULE, enumerate_object_callables, execute_callable, get_target, object_metadata, parameters_from_class, parameters_from_function
+from ._async import EVENT_LOOPS, event_loop_factory, is_async_callable, run_awaitable
+from ._batch import record_arguments, record_parameters, run_batch
+from ._cache import CACHE_DIR_ENVIRONMENT_VARIABLE, DiskCache
+from ._concurrent import run_concurrently
+from ._csv_stream import CSV_DIALECTS, parse_columns
+from ._introspection import IS_CLASS, IS_FUNCTION, IS_MODULE, compile_arguments, enumerate_object_callables, execute_callable, get_target, index_module_callables, introspect_callable, object_metadata, parameters_from_callable, parameters_from_class, parameters_from_function
+from ._input import INPUT_FILE_FORMATS, load_input_files, read_json_lines, read_json_values
+from ._map import EXECUTORS, map_arguments, run_map
+from ._memoize import ResultCache, execute_memoized, memoize
+from ._output import OUTPUT_FORMATS, open_writer, write_result
+from ._output_file import open_output
+from ._serializers import SERIALIZERS, register_serializer
+from ._timings import TIMINGS_FORMATS, PhaseTimer, timer_phase
 from . import argparse_patched
 
 __version__ = '0.8.0.dev4'
@@ -47,15 +62,84 @@ class LocalFormatterClass(ArgumentDefaultsHelpFormatter, RawDescriptionHelpForma
 	pass
 
 
+class LazyParsersMap(Mapping):
+	'''Subparsers built on demand
+	A replacement for the "name to parser" mapping of the argparse subparsers action. The names are known upfront (so they can be listed in the help and validated) but each parser is only built the first time it's requested, which argparse only does for the subcommand found in the arguments.
+	'''
+	
+	def __init__(self, factories):
+		'''Magic initialization
+		Store the parser factories.
+		
+		:param dict factories: a mapping of subcommand names and callables that build the corresponding parser (with no arguments)
+		:returns None: init shouldn't return anything
+		'''
+		
+		super().__init__()
+		
+		self._factories = factories
+		self._parsers = {}
+	
+	def __contains__(self, item):
+		'''Magic membership
+		Check the name without building the parser.
+		'''
+		
+		return item in self._factories
+	
+	def __getitem__(self, item):
+		'''Magic item retrieval
+		Build the parser on the first request.
+		'''
+		
+		if item not in self._parsers:
+			LOGGER.debug('Building parser for subcommand: %s', item)
+			self._parsers[item] = self._factories[item]()
+		return self._parsers[item]
+	
+	def __iter__(self):
+		'''Magic iteration
+		Iterate over the names, without building any parser.
+		'''
+		
+		return iter(self._factories)
+	
+	def __len__(self):
+		'''Magic length
+		The amount of subcommands.
+		'''
+		
+		return len(self._factories)
+
+
 class IntrospectedArgumentParser(ArgumentParser):
 	'''
 	'''
 
+	BUILTIN_OPTIONS_GROUP = ('simplifiedapp options', 'options of the app runner itself (logging, output, execution, caching, and input), shared by every target')
 	BUILTIN_OPTIONS = {
 		'--log-level'		: {'choices' : ['notset', 'debug', 'info', 'warning', 'error', 'critical'], 'default' : 'info', 'help' : 'minimum severity of the messages to be logged'},
 		'--log-to-syslog'	: {'action' : 'store_true', 'default' : False, 'help' : 'send logs to syslog.'},
-		# 'input-file'		: {'action' : InputFiles, 'nargs' : 2, 'default' : argparse.SUPPRESS, 'help' : 'read parameters from a file or standard input (using the "-" special name). Consumes 2 parameters: first one is the path (or "-") and second one is the format'},
-		# 'output-file'		: {'action' : 'store_true', 'default' : False, 'help' : 'output a JSON object as a string'},
+		'--timings'		: {'action' : 'store_true', 'default' : False, 'help' : 'report the time spent on each phase of the run to stderr'},
+		'--timings-format'	: {'choices' : list(TIMINGS_FORMATS), 'default' : TIMINGS_FORMATS[0], 'help' : 'format of the timings report: aligned text lines or a single JSON record'},
+		'--event-loop'		: {'choices' : list(EVENT_LOOPS), 'default' : EVENT_LOOPS[0], 'help' : 'event loop used to run asynchronous targets; "auto" uses uvloop if it\'s installed'},
+		'--output-format'	: {'choices' : list(OUTPUT_FORMATS), 'default' : OUTPUT_FORMATS[0], 'help' : 'how to write the result; "auto" streams iterators one item per line, prints strings as they are and formats everything else (within "--max-depth", "--max-items", and "--max-bytes"). "lines" and "jsonl" write every item of an iterable result (or the result itself) as a line of text or as a JSON document. "json" writes the whole result as a single JSON document, in chunks. "csv" and "tsv" write every item as a row, with a header if they are mappings (or "--columns" is used). "pickle" pickles the whole result and "raw" writes bytes as they are (and everything else as text)'},
+		'--output-file'		: {'default' : None, 'metavar' : 'PATH', 'help' : 'write the output into this file instead of the standard output. The file is replaced atomically once complete and it\'s compressed if the name ends in ".gz", ".bz2", or ".xz"'},
+		'--writer-queue'	: {'type' : int, 'default' : None, 'metavar' : 'DEPTH', 'help' : 'write the output from a separate thread, with a queue of up to DEPTH pending writes, so the target keeps producing while the output is written. Queued writes are joined into bigger ones'},
+		'--max-depth'		: {'type' : int, 'default' : None, 'help' : 'deepest nesting level of the result shown by the "auto" output format, deeper containers are elided'},
+		'--max-items'		: {'type' : int, 'default' : None, 'help' : 'amount of items shown per container of the result by the "auto" output format, the rest are elided'},
+		'--max-bytes'		: {'type' : int, 'default' : None, 'help' : 'size limit for the output of the "auto" output format, the rest is cut'},
+		'--columns'		: {'type' : parse_columns, 'default' : None, 'metavar' : 'NAMES', 'help' : 'comma separated names of the columns written by the "csv" and "tsv" output formats (and their order), the keys of the first row by default'},
+		'--json'			: {'action' : 'store_const', 'const' : 'json', 'dest' : 'output_format', 'default' : SUPPRESS, 'help' : 'shortcut for "--output-format json"'},
+		'--batch-input'		: {'default' : None, 'metavar' : 'PATH', 'help' : 'run the target once per line of a JSON Lines file (or standard input with "-"), each line being a mapping of parameter names and values. One output record is written per line. For module targets only the subcommand name is taken from the command line'},
+		'--map'				: {'default' : None, 'metavar' : 'PARAM', 'help' : 'run the target once per element of the PARAM parameter (a variable positional parameter or a list), concurrently. One output record is written per element'},
+		'--workers'			: {'type' : int, 'default' : None, 'help' : 'size of the pool used by "--map", the amount of CPUs by default'},
+		'--executor'		: {'choices' : list(EXECUTORS), 'default' : EXECUTORS[0], 'help' : 'pool used by "--map"; use "process" for CPU bound targets'},
+		'--unordered'		: {'action' : 'store_true', 'default' : False, 'help' : 'write the "--map" records as soon as they are done, instead of in the order of the elements'},
+		'--concurrency'		: {'type' : int, 'default' : None, 'help' : 'run an asynchronous target concurrently on a single event loop, with at most this amount of calls in flight, over the elements of "--map" or the lines of "--batch-input" (instead of the pool or the sequential run)'},
+		'--cache-dir'		: {'default' : None, 'help' : 'directory used to cache expensive work (like introspection, or the results of memoized targets) across runs. Defaults to the "{}" environment variable, no caching if neither is set'.format(CACHE_DIR_ENVIRONMENT_VARIABLE)},
+		'--iterable-input'	: {'nargs' : 2, 'default' : None, 'metavar' : ('PARAM', 'PATH'), 'help' : 'feed the PARAM parameter with an iterator over the elements of a JSON array or the documents of a JSON Lines file (or standard input, using the "-" special name), parsed incrementally as the target consumes them. The parameter is taken out of the command line'},
+		'--input-file'		: {'action' : 'append', 'nargs' : 2, 'default' : None, 'metavar' : ('PATH', 'FORMAT'), 'help' : 'read parameters from a file or standard input (using the "-" special name). Consumes 2 parameters: first one is the path (or "-") and second one is the format, one of: {}. Can be repeated, later files override earlier ones'.format(', '.join(INPUT_FILE_FORMATS))},
 	}
 
 	@classmethod
@@ -129,7 +213,7 @@ class IntrospectedArgumentParser(ArgumentParser):
 		
 		:param dict raw_parameters: a mapping of parameter name to parameter details like the one returned by "parameters_from_callable"
 		:param str container_name: the name of the object containing the provided parameters
-		:param dict? initial_values: a mapping of parameter names and values to use as default (overriding the ones in the signature if present)
+		:param dict? initial_values: a mapping of parameter names and values to use as default (overriding the ones in the signature if present). A SUPPRESS value means that the value comes from somewhere else (like "--iterable-input") so the parameter is left out
 		:returns dict: a mapping of parameter names and details that can be used to build an ArgumentParser
 		'''
 		
@@ -141,6 +225,9 @@ class IntrospectedArgumentParser(ArgumentParser):
 			for warning in warnings:
 				LOGGER.warning(warning.format(parameter_name=parameter, parent_description=container_name))
 			if parameter in initial_values:
+				if initial_values[parameter] is SUPPRESS:
+					LOGGER.debug('Leaving parameter "%s" of "%s" out of the command line', parameter, container_name)
+					continue
 				parameter_args['default'] = initial_values[parameter]
 			parameter_name = '_'.join((container_name, parameter))
 			parameter_name = parameter_name.replace('_', '-')
@@ -150,16 +237,19 @@ class IntrospectedArgumentParser(ArgumentParser):
 		return parameters
 	
 	@classmethod
-	def from_callable(cls, callable_, from_class=False, parents=None, initial_values={}):
+	def from_callable(cls, callable_, from_class=False, parents=None, initial_values={}, callable_metadata=None, raw_parameters=None):
 		'''Extract argparse info from callable
 		Uses introspection to build a dict out of a callable, usable to build an argparse tree.
 		
+		The metadata and the parameters can be provided (from a cache, for example) to skip the introspection.
+		
 		ToDo:
 		- Documentation
 		'''
 
 		LOGGER.debug('Generating parser data for callable: %s', callable_)
-		callable_metadata = object_metadata(callable_)
+		if callable_metadata is None:
+			callable_metadata = object_metadata(callable_)
 
 		parser_args = {
 			'prog'				: callable_metadata['name'],
@@ -171,9 +261,10 @@ class IntrospectedArgumentParser(ArgumentParser):
 			parser_args['parents'] = parents
 		result = cls(**parser_args)
 		
-		raw_parameters = parameters_from_function(callable_, function_metadata=callable_metadata, from_class=from_class)
+		if raw_parameters is None:
+			raw_parameters = parameters_from_function(callable_, function_metadata=callable_metadata, from_class=from_class)
 		if 'version' in callable_metadata:
-			raw_parameters['version'] = {'version': callable_metadata['version'], 'positional': False}
+			raw_parameters = raw_parameters | {'version' : {'version': callable_metadata['version'], 'positional': False}}
 		parameters = cls._prepare_parameters(raw_parameters=raw_parameters, container_name=callable_metadata['name'],
 									   initial_values=initial_values)
 		for parameter_name, kwargs in parameters.items():
@@ -184,16 +275,19 @@ class IntrospectedArgumentParser(ArgumentParser):
 		return result
 	
 	@classmethod
-	def from_class(cls, class_, parents=None, initial_values={}):
+	def from_class(cls, class_, parents=None, initial_values={}, class_metadata=None, raw_parameters=None):
 		'''Extract argparse info from class
 		Uses introspection to build a dict out of a class, usable to build an argparse tree.
+		
+		The metadata and the parameters can be provided (from a cache, for example) to skip the introspection.
 
 		ToDo:
 		- Documentation
 		'''
 		
 		LOGGER.debug('Generating parser data for class: %s', class_)
-		class_metadata = object_metadata(class_)
+		if class_metadata is None:
+			class_metadata = object_metadata(class_)
 		
 		parser_args = {
 			'prog'				: class_metadata['name'],
@@ -204,9 +298,10 @@ class IntrospectedArgumentParser(ArgumentParser):
 		if parents is not None:
 			parser_args['parents'] = parents
 		result = cls(**parser_args)
-		raw_parameters = parameters_from_class(class_)
+		if raw_parameters is None:
+			raw_parameters = parameters_from_class(class_)
 		if 'version' in class_metadata:
-			raw_parameters['version'] = {'version': class_metadata['version'], 'positional': False}
+			raw_parameters = raw_parameters | {'version' : {'version': class_metadata['version'], 'positional': False}}
 		parameters = cls._prepare_parameters(raw_parameters=raw_parameters, container_name=class_metadata['name'],
 											 initial_values=initial_values)
 		for parameter_name, kwargs in parameters.items():
@@ -216,6 +311,53 @@ class IntrospectedArgumentParser(ArgumentParser):
 		
 		return result
 	
+	@classmethod
+	def from_module(cls, module, parents=None, initial_values={}, introspection_cache=None, timer=None):
+		'''Extract argparse info from module
+		Builds a parser with a subcommand for each public function and class in the module. The subcommands are listed from a cheap index of the module and only the one requested in the arguments gets introspected and built.
+
+		The metadata, the parameters, and the arguments plan of the subcommand end up in the "introspection" attribute of the parsed arguments (next to "callable"), so they don't need to be introspected again.
+		
+		:param module: the module to build the parser for
+		:param list? parents: parent parsers, as in "argparse.ArgumentParser"
+		:param dict? initial_values: a mapping of parameter names and values to use as default on the subcommands
+		:param DiskCache? introspection_cache: the cache used for the introspection of the subcommands
+		:param PhaseTimer? timer: the timer for the introspection and "parser construction" phases of the subcommand
+		:returns IntrospectedArgumentParser: the parser for the module
+		'''
+		
+		LOGGER.debug('Generating parser data for module: %s', module)
+		module_metadata = object_metadata(module)
+		
+		parser_args = {
+			'prog'				: module_metadata['name'],
+			'description'		: module_metadata.get('description', None),
+			'epilog'			: module_metadata.get('long_description', None),
+			'formatter_class'	: LocalFormatterClass,
+		}
+		if parents is not None:
+			parser_args['parents'] = parents
+		result = cls(**parser_args)
+		if 'version' in module_metadata:
+			result.add_argument('--version', action='version', version=module_metadata['version'])
+		
+		def subcommand_factory(callable_):
+			def factory():
+				callable_metadata, raw_parameters = introspect_callable(callable_, cache=introspection_cache, timer=timer)
+				with timer_phase(timer, 'parser construction'):
+					if isclass(callable_):
+						subparser = cls.from_class(class_=callable_, initial_values=initial_values, class_metadata=callable_metadata, raw_parameters=raw_parameters)
+					else:
+						subparser = cls.from_callable(callable_=callable_, initial_values=initial_values, callable_metadata=callable_metadata, raw_parameters=raw_parameters)
+				subparser.set_defaults(introspection=(callable_metadata, raw_parameters, compile_arguments(raw_parameters)))
+				return subparser
+			return factory
+		
+		subparsers = result.add_subparsers(title='{} callables'.format(module_metadata['name']), dest='subcommand', required=True)
+		subparsers._name_parser_map = subparsers.choices = LazyParsersMap({name : subcommand_factory(callable_) for name, callable_ in index_module_callables(module).items()})
+		
+		return result
+	
 	@classmethod
 	def new_base_parser(cls):
 		'''Return new base parser
@@ -227,26 +369,27 @@ class IntrospectedArgumentParser(ArgumentParser):
 
 		LOGGER.debug('Creating new base parser')
 		result = cls(formatter_class=LocalFormatterClass, add_help=False)
+		builtin_group = result.add_argument_group(*cls.BUILTIN_OPTIONS_GROUP)
 		for parameter_name, kwargs in cls.BUILTIN_OPTIONS.items():
-			result.add_argument(parameter_name, **kwargs)
+			builtin_group.add_argument(parameter_name, **kwargs)
 
 		return result
 		
 	@classmethod
-	def run_callable(cls, callable_, args_w_keys={}):
-		'''Extract argparse info from callable
-        Uses introspection to build a dict out of a callable, usable to build an argparse tree.
-
-        ToDo:
-        - Documentation
-        '''
+	def bind_arguments(cls, callable_name, parameters, args_w_keys={}):
+		'''Arguments for the callable
+		Pick the values of the callable parameters out of the parsed arguments, removing the callable name prefix added by "_prepare_parameters" and merging the "key=value" pairs of the variable keyword parameter.
+
+		:param str callable_name: the name of the callable, as in its metadata
+		:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+		:param dict args_w_keys: the parsed arguments, with "_" instead of "-" in the names
+		:returns dict: the values for the callable parameters, usable with "execute_callable"
+		'''
 
-		callable_metadata = object_metadata(callable_)
-		callable_args_w_keys, callable_name = {}, callable_metadata['name']
-		parameters = parameters_from_callable(callable_, callable_metadata=callable_metadata)
+		callable_args_w_keys, prefix = {}, callable_name + '_'
 		for key, values in args_w_keys.items():
-			if key[:len(callable_name)] == callable_name:
-				param_name = key[len(callable_name)+1:]
+			if key.startswith(prefix) and (key[len(prefix):] in parameters):
+				param_name = key[len(prefix):]
 				if ('special' in parameters[param_name]) and (parameters[param_name]['special'] == 'varkw'):
 					callable_args_w_keys[param_name] = {}
 					for kw_dict in values:
@@ -254,11 +397,68 @@ class IntrospectedArgumentParser(ArgumentParser):
 				else:
 					callable_args_w_keys[param_name] = values
 
+		return callable_args_w_keys
+
+	@classmethod
+	def run_callable(cls, callable_, args_w_keys={}, callable_metadata=None, parameters=None):
+		'''Extract argparse info from callable
+        Uses introspection to build a dict out of a callable, usable to build an argparse tree.
+        
+        The metadata and the parameters can be provided (from a cache, for example) to skip the introspection.
+
+        ToDo:
+        - Documentation
+        '''
+
+		if callable_metadata is None:
+			callable_metadata = object_metadata(callable_)
+		if parameters is None:
+			parameters = parameters_from_callable(callable_, callable_metadata=callable_metadata)
+		callable_args_w_keys = cls.bind_arguments(callable_metadata['name'], parameters, args_w_keys=args_w_keys)
+
 		result = execute_callable(callable_, args_w_keys=callable_args_w_keys, callable_metadata=callable_metadata, parameters=parameters)
 		return str(result)
 
 
-def main(target = None, sys_argv = None):
+def build_target_parser(target, target_type, base_parser, initial_values={}, introspection_cache=None, timer=None, parser_cache=None):
+	'''Build the parser for a target
+	Introspect the target (if it's a class or a function) and build its parser, with the base parser as parent. A parser cache can be provided to reuse the parsers across runs in the same process (like in a daemon), they're keyed by the target and the initial values.
+
+	:param target: the module, class, or function, as returned by "get_target"
+	:param str target_type: the type of the target, as returned by "get_target"
+	:param IntrospectedArgumentParser base_parser: the parser with the builtin options
+	:param dict? initial_values: a mapping of parameter names and values to use as default
+	:param DiskCache? introspection_cache: the cache used for the introspection
+	:param PhaseTimer? timer: the timer for the introspection and "parser construction" phases
+	:param dict? parser_cache: a mapping to store the built parsers into and to get them from
+	:returns tuple: the parser and, for classes and functions, the metadata and parameters of the target (None for modules)
+	'''
+
+	parser_key = (target, repr(sorted(initial_values.items())))
+	if (parser_cache is not None) and (parser_key in parser_cache):
+		LOGGER.debug('Reusing the parser for: %s', target)
+		return parser_cache[parser_key]
+
+	target_metadata = target_parameters = None
+	if target_type == IS_MODULE:
+		with timer_phase(timer, 'parser construction'):
+			parser = IntrospectedArgumentParser.from_module(module=target, parents=[base_parser], initial_values=initial_values, introspection_cache=introspection_cache, timer=timer)
+	elif target_type == IS_CLASS:
+		target_metadata, target_parameters = introspect_callable(target, cache=introspection_cache, timer=timer)
+		with timer_phase(timer, 'parser construction'):
+			parser = IntrospectedArgumentParser.from_class(class_=target, parents=[base_parser], initial_values=initial_values, class_metadata=target_metadata, raw_parameters=target_parameters)
+	elif target_type == IS_FUNCTION:
+		target_metadata, target_parameters = introspect_callable(target, cache=introspection_cache, timer=timer)
+		with timer_phase(timer, 'parser construction'):
+			parser = IntrospectedArgumentParser.from_callable(callable_=target, parents=[base_parser], initial_values=initial_values, callable_metadata=target_metadata, raw_parameters=target_parameters)
+	else:
+		raise RuntimeError('Unknown target type "{}"'.format(target_type))
+
+	if parser_cache is not None:
+		parser_cache[parser_key] = parser, target_metadata, target_parameters
+	return parser, target_metadata, target_parameters
+
+def main(target = None, sys_argv = None, parser_cache = None, instance_pool = None):
 	'''Simplified run of an app.
 	Performs a simplified procedure of an app run. It will build and argparse object out of a module, class, or callable referenced via "target" and run it.
 
@@ -267,67 +467,153 @@ def main(target = None, sys_argv = None):
 	The following options will be added automatically:
 	- log_level: to set the logging level, anything supported by the "logging" module.
 	- log_to_syslog: configures the logging module to send the logs to syslog. This is only supported in POSIX where a "/dev/log" device exists.
-	- input_file: if this is set, it should contain the path to an input file and a second parameter stating the format. The file will be parsed an used as part of the configuration.
-	- json: transforms the resulting object into a json string. If the result is a string this won't happen.
-	- _json_default: if this is set, it should point to a function that will be used in the json conversion as the default casting. If not defined, "str" is then used (everything is casted to string).
+	- timings: report the time spent on each phase (base parser creation, logging setup, get_target, metadata, parameters, parser construction, argv parsing, binding, execution, and output) to stderr, as aligned text or as a JSON record (with "--timings-format json").
+	- event_loop: the event loop used for asynchronous targets (coroutine functions, async methods, and asynchronous generators), "asyncio" (the default), "uvloop" (it should be installed), or "auto" (uvloop if installed).
+	- output_format: how to write the result, "auto" (the default), "lines", "jsonl", "json", "csv", "tsv", "pickle", or "raw" (see below). The "json" switch is a shortcut for "--output-format json".
+	- columns: comma separated names of the columns for the "csv" and "tsv" output formats.
+	- output_file: write the output into this file instead of the standard output. The content goes into a temporary file (compressed with gzip, bz2, or xz if the name ends in ".gz", ".bz2", or ".xz") which is renamed to the final name once complete, so partial files are never observed. Nothing is written if the run fails.
+	- writer_queue: write the output from a dedicated thread, fed through a queue with room for this many writes. Producing the next item overlaps with writing the previous ones and the queued writes are joined into bigger ones; errors of the writer (like a closed pipe) stop the run.
+	- batch_input: path to a JSON Lines file (or "-" for the standard input) with a mapping of parameter names and values per line. The target is introspected once and then executed for every line in the same process, writing one output record per line (an empty one, or "null" with "jsonl", if the line failed). The run exits with an error if any line failed.
+	- map: the name of a parameter (variable positional or list valued) to fan the target out over. The target is executed once per element of the parameter (with the rest of the arguments unchanged) on a pool of "workers" threads or processes (as in "executor") and one output record is written per element, in order unless "unordered" is set. Every worker introspects the target once. The run exits with an error if any call failed.
+	- concurrency: for asynchronous targets, run the calls of "map" or "batch_input" concurrently on a single event loop, with at most this amount of calls in flight. The records are written as the calls complete (in order, unless "unordered" is set).
+	- cache_dir: a directory where the introspection results are cached, keyed by the target's qualified name, its source file details (modification time and size) and this module's version. Warm runs rebuild the parser from the cached data instead of introspecting the target again. The SIMPLIFIEDAPP_CACHE_DIR environment variable is used when not provided. The results of targets flagged with "memoize" are also stored there, keyed by the bound arguments and the code of the target, and reused by later runs with the same arguments.
+	- iterable_input: the name of a parameter and the path to a JSON array or JSON Lines file (or "-" for the standard input). The parameter gets an iterator over the elements, parsed incrementally (in chunks) as the target consumes them, instead of a value from the command line, so huge inputs don't go through argv or memory. A variable positional parameter gets the elements unpacked (which materializes them, as any "*args" call does); combined with "map" over the same parameter the calls are fed lazily. Results are not memoized when this is used.
+	- input_file: if this is set, it should contain the path to an input file (or "-" for the standard input) and a second parameter stating the format ("json" or "ini"); it can be repeated. The files are parsed right after the base options, before the target's parser is built, and their values are used as the defaults of the target's parameters (the command line still wins). With a cache directory the parsed values are cached, keyed by the path, modification time, and size of the file, so big shared configurations are parsed only once.
+
+	A "parser_cache" dict can be provided to reuse the parsers built by previous runs in the same process, as in "build_target_parser". Likewise, an "instance_pool" (as in "simplifiedapp._pool.InstancePool") reuses the parent instances of instance methods across runs; batch and map runs always reuse them across their own calls.
 
 	A callable will be called and passed all the configuration options. In the case of a class method, a class instance will be created first, passing all the configuration to the constructor and then the instance method will be called with all the configuration.
 
-	Results; if your code returns:
+	Results; asynchronous targets are driven on an event loop first, then if your code returns:
+	- a generator or an iterator (sync or async), every item will be printed in its own line as soon as it's produced. With "--output-format jsonl" every item will be printed as a JSON document, and with "--output-format lines" or "jsonl" any other iterable (like a list) gets the same treatment.
 	- a string, it will be printed as is.
-	- any other type of object will be printed with pprint
-	- any other type of object, and the json flag was passed as True, then it will be printed as a json string (json.dumps)
+	- any other type of object will be formatted (mappings and sequences as indented blocks, keeping the order of the keys) and written in chunks. The "max_depth", "max_items", and "max_bytes" options truncate the output (nesting, items per container, and size) and a summary of the elided content is added at the end.
+	- with "--output-format json" (or the json flag) any object is written as a single JSON document, streamed in chunks (iterators become arrays) with orjson if it's installed. Non JSON serializable values are converted with "str".
+	- with "--output-format csv" (or "tsv") every item of an iterable is written as a row, streamed in big writes without materializing iterators: mappings, named tuples, and dataclasses as their values, with the keys of the first one (or the "columns" option) as the header, "pickle" writes the whole result as a pickle, and "raw" writes bytes as they are (strings and everything else are encoded as text, and the items of iterables are concatenated).
 
 	ToDo:
-	- Implement a multipass algorithm, early loading the input_files
-	- Generalize "output" via output_file (instead of the lonely json)
 	- Add support to log_file (send logs to file)
 	- Documentation
 	'''
 
+	timer = PhaseTimer()
+
 	if sys_argv is None:
 		sys_argv = sys.argv[1:] if len(sys.argv) > 1 else []
 
-	base_parser = IntrospectedArgumentParser.new_base_parser()
-	base_values, sys_argv = base_parser.parse_known_args(sys_argv)
-	initial_values = vars(base_values)
-
-	log_parameters = DEFAULT_LOG_PARAMETERS.copy()
-	if hasattr(base_values, 'log_level') and len(base_values.log_level):
-		log_parameters['level'] = base_values.log_level.upper()
-	if hasattr(base_values, 'log_to_syslog') and base_values.log_to_syslog:
-		log_parameters['handlers'] = [SysLogHandler(address = '/dev/log')]
-	logging_basicConfig(**log_parameters)
-	LOGGER.debug('Logging configured  with: %s', log_parameters)
-
-	target, target_type = get_target(target=target)
-
-	if target_type == IS_MODULE:
-		LOGGER.debug('Generating parser data for target as a module')
-		raise NotImplementedError('Module target')
-	elif target_type == IS_CLASS:
-		parser = IntrospectedArgumentParser.from_class(class_=target, parents=[base_parser], initial_values=initial_values)
-	elif target_type == IS_FUNCTION:
-		parser = IntrospectedArgumentParser.from_callable(callable_=target, parents=[base_parser], initial_values=initial_values)
-	else:
-		raise RuntimeError('Unknown target type "{}"'.format(target_type))
-
-	args = parser.parse_args(sys_argv)
-	args_w_keys = {key.replace('-', '_') : value for key, value in vars(args).items()}
-	callable_ = args_w_keys.pop('callable')
-	result = parser.run_callable(callable_=callable_, args_w_keys=args_w_keys)
-
-	if isinstance(result, str):
-		LOGGER.debug('The result is a string. Printing it as is.')
-		print(result, end='')
-	else:
-		if hasattr(args, 'json') and args.json:
-			LOGGER.debug('The result is an object. Printing it as a json string.')
-			print(json.dumps(result, default = args._json_default if hasattr(args, '_json_default') else str))
-		else:
-			LOGGER.debug('The result is an object. Printing it with pprint.')
-			pretty_print(result, width = PPRINT_WIDTH)
+	with timer.phase('base parser'):
+		base_parser = IntrospectedArgumentParser.new_base_parser()
+		base_values, sys_argv = base_parser.parse_known_args(sys_argv)
+	initial_values = {}	#Only from the input files, the builtin options shouldn't touch the defaults of the target
 
+	try:
+		with timer.phase('logging setup'):
+			log_parameters = DEFAULT_LOG_PARAMETERS.copy()
+			if hasattr(base_values, 'log_level') and len(base_values.log_level):
+				log_parameters['level'] = base_values.log_level.upper()
+			if hasattr(base_values, 'log_to_syslog') and base_values.log_to_syslog:
+				log_parameters['handlers'] = [SysLogHandler(address = '/dev/log')]
+			logging_basicConfig(**log_parameters)
+		LOGGER.debug('Logging configured  with: %s', log_parameters)
+
+		with timer.phase('get_target'):
+			target, target_type = get_target(target=target)
+
+		cache_dir = base_values.cache_dir if base_values.cache_dir is not None else environ.get(CACHE_DIR_ENVIRONMENT_VARIABLE)
+		introspection_cache = None if not cache_dir else DiskCache(Path(cache_dir) / 'introspection', namespace=__version__)
+		result_cache = None if not cache_dir else ResultCache(Path(cache_dir) / 'results', namespace=__version__)
+		try:
+			loop_factory = event_loop_factory(base_values.event_loop)
+		except RuntimeError as error:
+			base_parser.error(str(error))
+
+		if base_values.input_file:
+			input_cache = None if not cache_dir else DiskCache(Path(cache_dir) / 'input', namespace=__version__)
+			with timer.phase('input files'):
+				try:
+					input_values = load_input_files(base_values.input_file, cache=input_cache)
+				except (OSError, ValueError) as error:
+					base_parser.error('unable to load the input files: {}'.format(error))
+			LOGGER.debug('Values from the input files: %s', input_values)
+			initial_values = {**initial_values, **input_values}
+		if base_values.iterable_input is not None:
+			initial_values = {**initial_values, base_values.iterable_input[0] : SUPPRESS}
+
+		if (base_values.columns is not None) and (base_values.output_format not in CSV_DIALECTS):
+			base_parser.error('"--columns" requires "--output-format csv" or "tsv"')
+		if (base_values.writer_queue is not None) and (base_values.writer_queue < 1):
+			base_parser.error('"--writer-queue" should be positive')
+		if (base_values.iterable_input is not None) and (base_values.batch_input is not None):
+			base_parser.error('"--iterable-input" can\'t be used with "--batch-input"')
+		if (base_values.concurrency is not None) and (base_values.map is None) and (base_values.batch_input is None):
+			base_parser.error('"--concurrency" requires "--map" or "--batch-input"')
+
+		if base_values.batch_input is not None:
+			if target_type == IS_MODULE:
+				module_callables = index_module_callables(target)
+				if not sys_argv or (sys_argv[0] not in module_callables):
+					base_parser.error('a subcommand is required in batch mode, one of: {}'.format(', '.join(module_callables)))
+				callable_, sys_argv = module_callables[sys_argv[0]], sys_argv[1:]
+			else:
+				callable_ = target
+			if sys_argv:
+				base_parser.error('the arguments come from the batch input in batch mode, unrecognized arguments: {}'.format(' '.join(sys_argv)))
+			target_metadata, target_parameters = introspect_callable(callable_, cache=introspection_cache, timer=timer)
+			with timer.phase('execution'), open_output(base_values.output_file) as output, open_writer(output, queue_depth=base_values.writer_queue) as writer:
+				if base_values.concurrency is None:
+					executed, failed = run_batch(callable_, read_json_lines(base_values.batch_input), writer, callable_metadata=target_metadata, parameters=target_parameters, format_=base_values.output_format, loop_factory=loop_factory, instance_pool=instance_pool)
+				elif is_async_callable(callable_):
+					executed, failed = run_concurrently(callable_, read_json_lines(base_values.batch_input), writer, callable_metadata=target_metadata, parameters=target_parameters, concurrency=base_values.concurrency, prepare=partial(record_arguments, parameters=record_parameters(callable_, target_parameters, callable_metadata=target_metadata)), ordered=not base_values.unordered, format_=base_values.output_format, loop_factory=loop_factory, instance_pool=instance_pool)
+				else:
+					base_parser.error('"--concurrency" requires an asynchronous target')
+			if failed:
+				raise SystemExit('{} out of {} batch records failed'.format(failed, executed))
+			return
+
+		parser, target_metadata, target_parameters = build_target_parser(target, target_type, base_parser, initial_values=initial_values, introspection_cache=introspection_cache, timer=timer, parser_cache=parser_cache)
+
+		with timer.phase('argv parsing'):
+			args = parser.parse_args(sys_argv)
+		args_w_keys = {key.replace('-', '_') : value for key, value in vars(args).items()}
+		callable_ = args_w_keys.pop('callable')
+		if target_type == IS_MODULE:
+			del args_w_keys['subcommand']
+			target_metadata, target_parameters, arguments_plan = args_w_keys.pop('introspection')
+
+		with timer.phase('binding'):
+			callable_args_w_keys = parser.bind_arguments(target_metadata['name'], target_parameters, args_w_keys=args_w_keys)
+			if target_type != IS_MODULE:
+				arguments_plan = compile_arguments(target_parameters)
+			if base_values.iterable_input is not None:
+				iterable_parameter, iterable_path = base_values.iterable_input
+				if (iterable_parameter not in target_parameters) or (target_parameters[iterable_parameter].get('special') == 'varkw'):
+					parser.error('"--iterable-input" requires a positional or keyword parameter of the target, got: {}'.format(iterable_parameter))
+				callable_args_w_keys[iterable_parameter] = read_json_values(iterable_path)
+
+		if base_values.map is not None:
+			with timer.phase('execution'), open_output(base_values.output_file) as output, open_writer(output, queue_depth=base_values.writer_queue) as writer:
+				if base_values.concurrency is not None:
+					if not is_async_callable(callable_):
+						base_parser.error('"--concurrency" requires an asynchronous target')
+					calls = enumerate(map_arguments(callable_args_w_keys, base_values.map, target_parameters), start=1)
+					executed, failed = run_concurrently(callable_, calls, writer, callable_metadata=target_metadata, parameters=target_parameters, concurrency=base_values.concurrency, ordered=not base_values.unordered, format_=base_values.output_format, loop_factory=loop_factory, instance_pool=instance_pool)
+				else:
+					executed, failed = run_map(callable_, callable_args_w_keys, base_values.map, target_parameters, writer, workers=base_values.workers, executor=base_values.executor, ordered=not base_values.unordered, format_=base_values.output_format, event_loop=base_values.event_loop, introspection_cache=introspection_cache)
+			if failed:
+				raise SystemExit('{} out of {} mapped calls failed'.format(failed, executed))
+			return
+
+		with timer.phase('execution'):
+			result = execute_memoized(None if base_values.iterable_input is not None else result_cache, callable_, args_w_keys=callable_args_w_keys, callable_metadata=target_metadata, parameters=target_parameters, plan=arguments_plan, loop_factory=None, resolve_loop_factory=loop_factory, instance_pool=instance_pool)
+			if hasattr(result, '__await__'):
+				result = run_awaitable(result, loop_factory=loop_factory)	#Asynchronous iterators are left for the output, to be streamed
+
+		with timer.phase('output'), open_output(base_values.output_file) as output:
+			write_result(result, output, format_=base_values.output_format, loop_factory=loop_factory, width=PPRINT_WIDTH, max_depth=base_values.max_depth, max_items=base_values.max_items, max_bytes=base_values.max_bytes, columns=base_values.columns, queue_depth=base_values.writer_queue)
+	finally:
+		if base_values.timings:
+			sys.stdout.flush()
+			timer.report(sys.stderr, format_=base_values.timings_format)
 
 
 	return
@@ -27,6 +27,40 @@ import argparse
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--version', action='version', version=simplifiedapp.__version__)
-parser.parse_args()
+subparsers = parser.add_subparsers(dest='command')
+freeze_parser = subparsers.add_parser('freeze', help='generate a standalone CLI module for a target, without any runtime introspection')
+freeze_parser.add_argument('target', help='the target to freeze, as "package.module:callable"')
+freeze_parser.add_argument('-o', '--output', default='-', help='path of the generated module, "-" for standard output')
+serve_parser = subparsers.add_parser('serve', help='keep a target warm (imported, introspected, and with its parser built) and run it for the clients of a Unix domain socket')
+serve_parser.add_argument('target', help='the target to serve, as "package.module:callable" or "package.module"')
+serve_parser.add_argument('--socket', required=True, help='path of the Unix domain socket')
+serve_parser.add_argument('--workers', type=int, default=0, help='amount of preforked worker processes, each one serves a single request in isolation. With 0 the requests are served one by one by the daemon itself')
+serve_parser.add_argument('--log-level', choices=['notset', 'debug', 'info', 'warning', 'error', 'critical'], default='info', help='minimum severity of the daemon messages to be logged')
+client_parser = subparsers.add_parser('client', add_help=False, help='run a target through a daemon started with "serve", forwarding the arguments, environment, and working directory')
+client_parser.add_argument('--socket', required=True, help='path of the Unix domain socket of the daemon, it should come before the arguments of the target')
+client_parser.add_argument('argv', nargs='*', help='the arguments for the target, forwarded verbatim (including "--help"). A leading "--" is dropped')
+
+if sys.argv[1:2] == ['client']:	#Split by hand, argparse would take the options meant for the target (like "--help")
+	from simplifiedapp._server import run_client, split_client_argv
+	try:
+		socket_path, target_argv = split_client_argv(sys.argv[2:])
+	except ValueError as error:
+		client_parser.error(str(error))
+	sys.exit(run_client(socket_path, target_argv))
+
+args = parser.parse_args()
+
+if args.command == 'freeze':
+	from simplifiedapp._freeze import freeze_target
+	frozen_source = freeze_target(args.target)
+	if args.output == '-':
+		sys.stdout.write(frozen_source)
+	else:
+		with open(args.output, 'w') as output_file:
+			output_file.write(frozen_source)
+elif args.command == 'serve':
+	from simplifiedapp._server import serve
+	logging.basicConfig(level=args.log_level.upper(), **simplifiedapp.DEFAULT_LOG_PARAMETERS)
+	serve(args.target, args.socket, workers=args.workers)
 
 # simplifiedapp.main(target = target, sys_argv = sys_argv)
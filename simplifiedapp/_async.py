@@ -0,0 +1,109 @@
+#! python
+'''Asynchronous targets
+Drive coroutines and asynchronous generators produced by the targets on an event loop, so "async def" targets can be used like any other.
+'''
+
+from asyncio import new_event_loop, set_event_loop
+from inspect import isasyncgen, isasyncgenfunction, isawaitable, iscoroutinefunction, unwrap
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+EVENT_LOOPS = ('asyncio', 'uvloop', 'auto')
+
+
+def is_async_callable(callable_):
+	'''Asynchronous callable detection
+	Check if the callable is a coroutine function or an asynchronous generator function, including decorated ones (following "__wrapped__") and methods.
+
+	:param callable_: the callable to check
+	:returns bool: True if calling it would produce a coroutine or an asynchronous generator
+	'''
+
+	callable_ = getattr(callable_, '__func__', callable_)
+	try:
+		callable_ = unwrap(callable_)
+	except ValueError:
+		pass
+	return iscoroutinefunction(callable_) or isasyncgenfunction(callable_)
+
+def is_async_result(result):
+	'''Asynchronous result detection
+	Check if the result of a call needs an event loop to be consumed.
+
+	:param result: the result to check
+	:returns bool: True for awaitables (like coroutines) and asynchronous generators
+	'''
+
+	return isawaitable(result) or isasyncgen(result)
+
+def event_loop_factory(event_loop='asyncio'):
+	'''Event loop factory
+	Get a callable that creates new event loops of the requested kind. "uvloop" requires the uvloop package while "auto" uses it only if it's installed.
+
+	:param str event_loop: one of EVENT_LOOPS
+	:returns Callable: a function without parameters that returns a new event loop
+	'''
+
+	if event_loop == 'asyncio':
+		return new_event_loop
+	elif event_loop in ('uvloop', 'auto'):
+		try:
+			import uvloop
+		except ImportError:
+			if event_loop == 'uvloop':
+				raise RuntimeError('The uvloop event loop was requested but the "uvloop" package is not installed')
+			LOGGER.debug('The uvloop package is not installed, using the asyncio event loop')
+			return new_event_loop
+		return uvloop.new_event_loop
+	else:
+		raise ValueError('Unknown event loop: {}'.format(event_loop))
+
+async def collect_async_iterator(async_iterator):
+	'''Consume an asynchronous iterator
+	Gather all the items produced by the asynchronous iterator.
+
+	:param async_iterator: the asynchronous iterator (or iterable) to consume
+	:returns list: the produced items
+	'''
+
+	return [item async for item in async_iterator]
+
+def run_awaitable(awaitable, loop_factory=None):
+	'''Run until complete
+	Drive the awaitable on a fresh event loop, which is closed (after finishing the asynchronous generators and the default executor) when done. Like "asyncio.run" but with a configurable loop.
+
+	:param awaitable: the coroutine (or any awaitable) to run
+	:param Callable? loop_factory: the function creating the loop, like the ones returned by "event_loop_factory". A regular asyncio loop is used by default
+	:returns Any: the result of the awaitable
+	'''
+
+	loop = new_event_loop() if loop_factory is None else loop_factory()
+	try:
+		set_event_loop(loop)
+		return loop.run_until_complete(awaitable)
+	finally:
+		try:
+			loop.run_until_complete(loop.shutdown_asyncgens())
+			loop.run_until_complete(loop.shutdown_default_executor())
+		finally:
+			set_event_loop(None)
+			loop.close()
+
+def resolve_async_result(result, loop_factory=new_event_loop):
+	'''Synchronous version of a result
+	Await the result if it's an awaitable and gather the items of an asynchronous generator into a list. Other results are returned as they are.
+
+	:param result: the result of calling a target
+	:param Callable loop_factory: the function creating the loop, like the ones returned by "event_loop_factory"
+	:returns Any: the synchronous result
+	'''
+
+	if isasyncgen(result):
+		LOGGER.debug('Collecting the items of asynchronous generator: %s', result)
+		return run_awaitable(collect_async_iterator(result), loop_factory=loop_factory)
+	elif isawaitable(result):
+		LOGGER.debug('Running awaitable on an event loop: %s', result)
+		return run_awaitable(result, loop_factory=loop_factory)
+	else:
+		return result
@@ -0,0 +1,142 @@
+#! python
+'''Background writing
+Hand the output over to a dedicated thread through a bounded queue, so producing the next item of a result overlaps with writing the previous ones.
+'''
+
+from logging import getLogger
+from queue import Queue
+from threading import Thread
+
+LOGGER = getLogger(__name__)
+
+WRITER_QUEUE_DEPTH = 64	#Writes waiting for the writer thread before the producer blocks
+WRITE_BATCH_SIZE = 256 * 1024	#Bytes of queued writes joined into a single write
+_FLUSH, _STOP = object(), object()
+
+
+class BackgroundWriter:
+	'''Threaded writer
+	Binary writer queuing the data for a thread which writes it into the wrapped writer. The queue is bounded, so a slow output makes the producer wait instead of piling the result up in memory. Whatever is queued when the thread wakes up is joined into writes of up to WRITE_BATCH_SIZE bytes.
+
+	An error of the writer thread (like a broken pipe) is raised in the producer by the next "write", "flush", or the context exit. Exiting the context waits for the queued data to be written and flushed.
+	'''
+
+	def __init__(self, writer, queue_depth=WRITER_QUEUE_DEPTH, batch_size=WRITE_BATCH_SIZE):
+		'''Magic initialization
+		Create the queue and start the thread.
+
+		:param writer: the binary writer to write into, like "simplifiedapp._output.IncrementalWriter"
+		:param int queue_depth: the maximum amount of writes waiting in the queue
+		:param int batch_size: the maximum size of the joined writes, in bytes
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		if queue_depth < 1:
+			raise ValueError('The queue depth should be positive, got: {}'.format(queue_depth))
+		self.writer = writer
+		self.encoding = getattr(writer, 'encoding', None) or 'utf-8'
+		self.batch_size = batch_size
+		self.error = None
+		self._queue = Queue(maxsize=queue_depth)
+		self._thread = Thread(target=self._run, name='simplifiedapp-writer', daemon=True)
+		self._thread.start()
+
+	def __enter__(self):
+		'''Magic context entry
+		Nothing to do, returns the writer.
+		'''
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		'''Magic context exit
+		Close the writer, raising the error of the thread only if there's no other exception going on.
+		'''
+
+		try:
+			self.close()
+		except Exception:
+			if exc_type is None:
+				raise
+			LOGGER.debug('Ignoring writer error while handling another exception', exc_info=True)
+
+	def _run(self):
+		'''Writer thread
+		Take the data out of the queue, join it into batches, and write it until the stop marker shows up. After an error, the data is discarded (so the producer never blocks on a full queue) until the stop marker.
+
+		:returns None: nothing
+		'''
+
+		queue, stop = self._queue, False
+		while not stop:
+			batch, size, flush = [], 0, False
+			item = queue.get()
+			while True:
+				if item is _STOP:
+					stop = flush = True
+					break
+				elif item is _FLUSH:
+					flush = True
+				else:
+					batch.append(item)
+					size += len(item)
+				if (size >= self.batch_size) or queue.empty():
+					break
+				item = queue.get()
+			if self.error is not None:
+				continue
+			try:
+				if batch:
+					self.writer.write(batch[0] if len(batch) == 1 else b''.join(batch))
+				if flush:
+					self.writer.flush()
+			except BaseException as error:
+				LOGGER.debug('The writer thread failed: %s', error)
+				self.error = error
+
+	def _raise_error(self):
+		'''Propagate the error
+		Raise the error of the writer thread, if any.
+
+		:returns None: nothing
+		'''
+
+		if self.error is not None:
+			raise self.error
+
+	def write(self, data):
+		'''Write data
+		Queue the data for the thread, waiting if the queue is full. Data that could change or go away after returning (like a memoryview slice) is copied first.
+
+		:param bytes data: the data to write
+		:returns int: the amount of bytes queued
+		'''
+
+		self._raise_error()
+		if not isinstance(data, bytes):
+			data = bytes(data)
+		if data:
+			self._queue.put(data)
+		return len(data)
+
+	def flush(self):
+		'''Flush the stream
+		Ask the thread to flush the writer, once the data queued so far is written. It doesn't wait for it.
+		'''
+
+		self._raise_error()
+		self._queue.put(_FLUSH)
+
+	def close(self):
+		'''Finish the writing
+		Wait for the thread to write and flush everything that was queued, and raise its error, if any.
+
+		:returns None: nothing
+		'''
+
+		if self._thread.is_alive():
+			self._queue.put(_STOP)
+			self._thread.join()
+		self._raise_error()
@@ -0,0 +1,98 @@
+#! python
+'''Batch execution
+Run the same target many times in a single process, once per record of a JSON Lines input, reusing the introspection and the arguments plan.
+'''
+
+from asyncio import new_event_loop
+from collections.abc import Mapping
+from contextlib import nullcontext
+from logging import getLogger
+
+from ._introspection import IS_CLASS, IS_FUNCTION, IS_INSTANCE_METHOD, compile_arguments, execute_callable, identify_callable, parameters_from_method, parent_class_parameters
+from ._output import encode_record
+from ._pool import InstancePool
+
+LOGGER = getLogger(__name__)
+
+
+def record_parameters(callable_, parameters, callable_metadata=None):
+	'''Parameters of the records
+	The parameters a batch record can provide values for: the ones of the callable and, for instance methods, the ones of the parent class (the constructor arguments of the instance).
+
+	:param callable_: the class or function to execute
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param dict? callable_metadata: the metadata of the callable, as returned by "object_metadata"
+	:returns dict: the parameters for "record_arguments"
+	'''
+
+	callable_type, parent = identify_callable(callable_)
+	if (callable_type not in (IS_CLASS, IS_FUNCTION)) and (parameters_from_method(method=callable_, method_metadata=callable_metadata)[1] == IS_INSTANCE_METHOD):
+		return parent_class_parameters(parent) | parameters
+	return parameters
+
+def record_arguments(record, parameters):
+	'''Arguments out of a record
+	Validate a batch record and map it to the parameters of the callable. Unknown names go into the variable keyword parameter, if the callable has one.
+
+	:param dict record: the mapping of parameter names and values
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable" (or "record_parameters", for instance methods)
+	:returns dict: the values for the callable parameters, usable with "execute_callable"
+	'''
+
+	if not isinstance(record, Mapping):
+		raise TypeError('A batch record should be a mapping of parameter names and values, got: {}'.format(type(record).__name__))
+
+	varkw = next((name for name, details in parameters.items() if details.get('special') == 'varkw'), None)
+	args_w_keys, extra = {}, {}
+	for name, value in record.items():
+		if (name in parameters) and (name != varkw):
+			args_w_keys[name] = value
+		elif varkw is not None:
+			extra[name] = value
+		else:
+			raise TypeError('Unknown parameter "{}"'.format(name))
+
+	if varkw is not None:
+		varkw_value = record.get(varkw, {})
+		if (varkw in record) and not isinstance(varkw_value, Mapping):
+			raise TypeError('The "{}" parameter should be a mapping'.format(varkw))
+		extra.pop(varkw, None)
+		if varkw_value or extra:
+			args_w_keys[varkw] = dict(varkw_value) | extra
+
+	return args_w_keys
+
+def run_batch(callable_, records, writer, callable_metadata, parameters, format_='auto', loop_factory=new_event_loop, instance_pool=None):
+	'''Run a batch
+	Execute the callable once per record and write one output record per input record, as soon as it's available. A failing record is logged (with its line number) and gets an empty record in the output, so input and output stay aligned. The records of instance methods can include the constructor arguments of the parent class (as in "record_parameters") and the parent instances of instance methods are reused across records, from the "instance_pool" or from one held for the whole batch.
+
+	:param callable_: the class or function to execute
+	:param Iterable records: couples of line number and record, as returned by "simplifiedapp._input.read_json_lines"
+	:param IncrementalWriter writer: the writer for the output records
+	:param dict callable_metadata: the metadata of the callable, as returned by "object_metadata"
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param str format_: the output format, as in "simplifiedapp._output.encode_record"
+	:param Callable loop_factory: the function creating event loops for asynchronous callables, as in "simplifiedapp._async.event_loop_factory"
+	:param InstancePool? instance_pool: the pool for the parent instances of instance methods (as in "simplifiedapp._pool.InstancePool"), a new one released at the end of the batch by default
+	:returns tuple: the amount of records executed and the amount of failures
+	'''
+
+	plan = compile_arguments(parameters)
+	accepted_parameters = record_parameters(callable_, parameters, callable_metadata=callable_metadata)
+	executed = failed = 0
+	with (InstancePool() if instance_pool is None else nullcontext(instance_pool)) as batch_pool:
+		for line_number, record in records:
+			executed += 1
+			try:
+				args_w_keys = record_arguments(record, accepted_parameters)
+				result = execute_callable(callable_, args_w_keys=args_w_keys, callable_metadata=callable_metadata, parameters=parameters, plan=plan, loop_factory=loop_factory, instance_pool=batch_pool)
+				output = encode_record(result, format_=format_, encoding=writer.encoding)
+			except Exception as error:
+				failed += 1
+				LOGGER.error('Batch record on line %d failed: %s', line_number, error)
+				LOGGER.debug('Batch record on line %d failed', line_number, exc_info=True)
+				output = encode_record(None, format_=format_, encoding=writer.encoding)
+			writer.write(output)
+
+	LOGGER.debug('Batch done, %d records executed and %d failed', executed, failed)
+	return executed, failed
@@ -0,0 +1,139 @@
+#! python
+'''Persistent caching
+Simple on-disk storage used to avoid repeating expensive work (like introspection) across runs.
+'''
+
+from hashlib import sha256
+from logging import getLogger
+from os import replace as os_replace, stat as os_stat
+from pathlib import Path
+from pickle import HIGHEST_PROTOCOL, PicklingError, dumps as pickle_dumps, loads as pickle_loads
+from sys import modules
+from tempfile import NamedTemporaryFile
+
+LOGGER = getLogger(__name__)
+
+CACHE_DIR_ENVIRONMENT_VARIABLE = 'SIMPLIFIEDAPP_CACHE_DIR'
+CACHE_FILE_SUFFIX = '.pickle'
+
+
+class DiskCache:
+	'''Pickled values on disk
+	Every value is stored in its own file, named after the hash of its key. Writes are atomic (a temporary file is renamed over the final one) so concurrent readers never see partial content. Any problem reading or writing the cache is logged and treated as a cache miss.
+	'''
+
+	def __init__(self, directory, namespace=''):
+		'''Magic initialization
+		Store the details, the directory will be created on the first write.
+
+		:param directory: the path to the directory holding the cache files
+		:param str? namespace: a string added to every key, used to invalidate entries created by other versions of the producer
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.directory = Path(directory)
+		self.namespace = namespace
+
+	def __repr__(self):
+		'''Magic representation
+		Simple representation of the object
+		'''
+
+		return '{}({}, namespace={})'.format(type(self).__name__, repr(str(self.directory)), repr(self.namespace))
+
+	def _path_for(self, key):
+		'''Path of the file for a key
+		The key is hashed, together with the namespace, to get a file name.
+
+		:param str key: the key to get the path for
+		:returns Path: the path of the file storing the value for the key
+		'''
+
+		digest = sha256('\0'.join((self.namespace, key)).encode('utf-8', errors='surrogateescape')).hexdigest()
+		return self.directory / (digest + CACHE_FILE_SUFFIX)
+
+	def get(self, key, default=None):
+		'''Get a value from the cache
+		Load the value stored for the key, if any.
+
+		:param str key: the key of the value
+		:param default: the value to return if the key is not found
+		:returns Any: the stored value or the default
+		'''
+
+		path = self._path_for(key)
+		try:
+			content = path.read_bytes()
+		except FileNotFoundError:
+			LOGGER.debug('Cache miss for: %s', key)
+			return default
+		except OSError as error:
+			LOGGER.warning('Unable to read cache file "%s": %s', path, error)
+			return default
+
+		try:
+			value = pickle_loads(content)
+		except Exception as error:
+			LOGGER.warning('Ignoring corrupted cache file "%s": %s', path, error)
+			return default
+
+		LOGGER.debug('Cache hit for: %s', key)
+		return value
+
+	def set(self, key, value):
+		'''Store a value in the cache
+		The value is pickled into a temporary file which is then renamed to its final name.
+
+		:param str key: the key of the value
+		:param value: the value to store, it should be picklable
+		:returns bool: True if the value was stored, False otherwise
+		'''
+
+		try:
+			content = pickle_dumps(value, protocol=HIGHEST_PROTOCOL)
+		except (AttributeError, PicklingError, TypeError) as error:
+			LOGGER.debug('Value for "%s" is not cacheable: %s', key, error)
+			return False
+
+		path, temp_path = self._path_for(key), None
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			with NamedTemporaryFile(dir=self.directory, prefix='.', suffix=CACHE_FILE_SUFFIX, delete=False) as temp_file:
+				temp_path = temp_file.name
+				temp_file.write(content)
+			os_replace(temp_path, path)
+		except OSError as error:
+			LOGGER.warning('Unable to write cache file "%s": %s', path, error)
+			if temp_path is not None:
+				Path(temp_path).unlink(missing_ok=True)
+			return False
+
+		LOGGER.debug('Cached value for: %s', key)
+		return True
+
+
+def source_cache_key(obj):
+	'''Cache key for an object based on its source
+	Builds a key out of the qualified name of the object and the details of the file that defines it (modification time and size). Any change to the file will produce a different key.
+
+	Objects defined in local scopes or without a source file (builtins, interactive sessions) don't get a key, since there's no reliable way to tell them apart.
+
+	:param obj: the object (module, class, or function) to build the key for
+	:returns str|None: the key or None if the object shouldn't be cached
+	'''
+
+	module = obj if hasattr(obj, '__file__') else modules.get(getattr(obj, '__module__', None))
+	qualname = getattr(obj, '__qualname__', getattr(obj, '__name__', None))
+	if (qualname is None) or ('<locals>' in qualname) or (module is None) or (getattr(module, '__file__', None) is None):
+		LOGGER.debug('Not a cacheable object: %s', obj)
+		return None
+
+	try:
+		file_stat = os_stat(module.__file__)
+	except OSError as error:
+		LOGGER.debug('Unable to stat source of "%s": %s', obj, error)
+		return None
+
+	return '|'.join((module.__name__, qualname, module.__file__, str(file_stat.st_mtime_ns), str(file_stat.st_size)))
@@ -0,0 +1,105 @@
+#! python
+'''Concurrent asynchronous execution
+Run an asynchronous target over many sets of arguments concurrently on a single event loop, with a bound on the calls in flight.
+'''
+
+from asyncio import FIRST_COMPLETED, ensure_future, wait
+from collections import deque
+from contextlib import nullcontext
+from inspect import isasyncgen, isawaitable
+from logging import getLogger
+
+from ._async import collect_async_iterator, run_awaitable
+from ._introspection import compile_arguments, execute_callable
+from ._output import encode_record
+from ._pool import InstancePool
+
+LOGGER = getLogger(__name__)
+
+
+async def _execute(callable_, label, arguments, prepare, callable_metadata, parameters, plan, instance_pool):
+	'''Execute one call
+	Prepare the arguments, run the callable and await its result.
+
+	:returns Any: the result of the call
+	'''
+
+	args_w_keys = arguments if prepare is None else prepare(arguments)
+	result = execute_callable(callable_, args_w_keys=args_w_keys, callable_metadata=callable_metadata, parameters=parameters, plan=plan, loop_factory=None, instance_pool=instance_pool)
+	if isasyncgen(result):
+		return await collect_async_iterator(result)
+	elif isawaitable(result):
+		return await result
+	return result
+
+async def fan_out(callable_, calls, writer, callable_metadata, parameters, concurrency, prepare=None, ordered=True, format_='auto', instance_pool=None):
+	'''Concurrent calls
+	Coroutine running the calls on the current event loop, with at most "concurrency" calls in flight. The output records are written as the calls complete: in the order of the calls if "ordered" or in completion order otherwise. Only the calls in flight exist as tasks, so the calls can come from a lazy iterator. The parent instances of instance methods are reused across calls, as in "simplifiedapp._batch.run_batch".
+
+	:param callable_: the asynchronous class method or function to execute
+	:param Iterable calls: couples of a label (like the line number) and the arguments of each call
+	:param IncrementalWriter writer: the writer for the output records
+	:param dict callable_metadata: the metadata of the callable, as returned by "object_metadata"
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param int concurrency: the maximum amount of calls in flight
+	:param Callable? prepare: a function turning the arguments of a call into the values for the callable parameters, the arguments are used as they are if not provided
+	:param bool ordered: write the records in the order of the calls, instead of the completion order
+	:param str format_: the output format, as in "simplifiedapp._output.encode_record"
+	:param InstancePool? instance_pool: the pool for the parent instances of instance methods (as in "simplifiedapp._pool.InstancePool"), a new one released at the end of the run by default
+	:returns tuple: the amount of calls executed and the amount of failures
+	'''
+
+	if concurrency < 1:
+		raise ValueError('The concurrency should be positive, got: {}'.format(concurrency))
+	plan = compile_arguments(parameters)
+	labels, executed, failed = {}, 0, 0
+
+	def emit(task):
+		nonlocal executed, failed
+		executed += 1
+		label = labels.pop(task)
+		try:
+			output = encode_record(task.result(), format_=format_, encoding=writer.encoding)
+		except Exception as error:
+			failed += 1
+			LOGGER.error('Call %s failed: %s', label, error)
+			LOGGER.debug('Call %s failed', label, exc_info=True)
+			output = encode_record(None, format_=format_, encoding=writer.encoding)
+		writer.write(output)
+
+	pending = deque() if ordered else set()
+	async def drain(until):
+		nonlocal pending
+		while len(pending) > until:
+			if ordered:
+				task = pending.popleft()
+				await wait((task,))
+				emit(task)
+			else:
+				done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+				for task in done:
+					emit(task)
+
+	with (InstancePool() if instance_pool is None else nullcontext(instance_pool)) as run_pool:
+		for label, arguments in calls:
+			await drain(concurrency - 1)
+			task = ensure_future(_execute(callable_, label, arguments, prepare, callable_metadata, parameters, plan, run_pool))
+			labels[task] = label
+			if ordered:
+				pending.append(task)
+			else:
+				pending.add(task)
+		await drain(0)
+
+	LOGGER.debug('Concurrent run done, %d calls executed and %d failed', executed, failed)
+	return executed, failed
+
+def run_concurrently(*args, loop_factory=None, **kwargs):
+	'''Concurrent calls
+	Run "fan_out" on a new event loop, with the same arguments.
+
+	:param Callable? loop_factory: the function creating the event loop, as in "simplifiedapp._async.event_loop_factory"
+	:returns tuple: the amount of calls executed and the amount of failures
+	'''
+
+	return run_awaitable(fan_out(*args, **kwargs), loop_factory=loop_factory)
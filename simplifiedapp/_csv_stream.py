@@ -0,0 +1,192 @@
+#! python
+'''CSV output
+Write record shaped results (iterables of mappings, named tuples, dataclasses, or sequences) as CSV or TSV rows, streaming them in big writes.
+'''
+
+from collections.abc import Iterable, Mapping
+from csv import QUOTE_MINIMAL, writer as csv_writer
+from logging import getLogger
+
+from ._serializers import SERIALIZERS
+
+LOGGER = getLogger(__name__)
+
+CSV_DIALECTS = {
+	'csv'	: {'delimiter' : ',', 'lineterminator' : '\r\n', 'quoting' : QUOTE_MINIMAL},
+	'tsv'	: {'delimiter' : '\t', 'lineterminator' : '\n', 'quoting' : QUOTE_MINIMAL},
+}
+CSV_WRITE_SIZE = 256 * 1024	#Characters accumulated before writing them
+
+
+def parse_columns(text):
+	'''Columns out of the command line
+	Split a comma separated list of column names.
+
+	:param str text: the comma separated names
+	:returns list: the names, without surrounding spaces
+	'''
+
+	columns = [column.strip() for column in text.split(',')]
+	if not all(columns):
+		raise ValueError('Empty column name in: {}'.format(text))
+	return columns
+
+def record_fields(item):
+	'''Normalize a record
+	Serialize the item (as in "simplifiedapp._serializers.SERIALIZERS"), so a dataclass becomes a mapping, and turn named tuples into mappings too.
+
+	:param item: the record
+	:returns Any: a mapping or the (serialized) item
+	'''
+
+	item = SERIALIZERS.serialize(item)
+	if isinstance(item, tuple) and hasattr(item, '_asdict'):
+		return item._asdict()
+	return item
+
+def csv_row(item, columns=None):
+	'''Fields of a CSV row
+	The values of a mapping (the ones for "columns", if provided, with missing ones as empty fields), the items of a list or tuple, or the item itself as the only field. The item is normalized first, as in "record_fields".
+
+	:param item: the item to turn into a row
+	:param list? columns: the names of the values to pick out of mappings
+	:returns list: the fields of the row
+	'''
+
+	item = record_fields(item)
+	if isinstance(item, Mapping):
+		return list(item.values()) if columns is None else [item.get(column, '') for column in columns]
+	elif isinstance(item, (list, tuple)):
+		return list(item)
+	return [item]
+
+
+class RowsWriter:
+	'''CSV rows writer
+	Format the rows with "csv.writer" into an in-memory buffer, which is handed over to the binary writer every CSV_WRITE_SIZE characters. The header is written before the first row: the explicit columns or, if the first row is a mapping (as in "record_fields"), its keys.
+	'''
+
+	def __init__(self, writer, format_='csv', columns=None, header=True, encoding=None):
+		'''Magic initialization
+		Set the formatter up.
+
+		:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+		:param str format_: one of CSV_DIALECTS
+		:param list? columns: the names of the columns
+		:param bool header: write the header line
+		:param str? encoding: the encoding of the output, the one of the writer by default
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.writer = writer
+		self.encoding = encoding or getattr(writer, 'encoding', None) or 'utf-8'
+		self.columns = None if columns is None else list(columns)
+		self.header = header
+		self.count = 0
+		self._parts, self._size = [], 0
+		self._rows = csv_writer(self, **CSV_DIALECTS[format_])
+
+	def __enter__(self):
+		'''Magic context entry
+		Nothing to do, returns the rows writer.
+		'''
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		'''Magic context exit
+		Write whatever is pending.
+		'''
+
+		self.flush()
+
+	def write(self, text):
+		'''Buffer text
+		Used by "csv.writer": keep the text and write the buffer once it's big enough.
+
+		:param str text: the formatted row
+		:returns None: nothing
+		'''
+
+		self._parts.append(text)
+		self._size += len(text)
+		if self._size >= CSV_WRITE_SIZE:
+			self.flush()
+
+	def flush(self):
+		'''Write the buffer
+		Encode the buffered text and write it.
+
+		:returns None: nothing
+		'''
+
+		if self._parts:
+			self.writer.write(''.join(self._parts).encode(self.encoding, errors='backslashreplace'))
+			self._parts, self._size = [], 0
+
+	def write_row(self, row):
+		'''Write a row
+		Format the row (as in "csv_row") writing the header first, if needed.
+
+		:param row: the record to write
+		:returns None: nothing
+		'''
+
+		row = record_fields(row)
+		if not self.count:
+			if (self.columns is None) and isinstance(row, Mapping):
+				self.columns = list(row)
+			if self.header and (self.columns is not None):
+				self._rows.writerow(self.columns)
+		self._rows.writerow(csv_row(row, columns=self.columns))
+		self.count += 1
+
+
+def rows_of(result):
+	'''Rows of a result
+	The result itself, if it's an iterable of records, or a single row otherwise (for strings, mappings and other non iterables).
+
+	:param result: the result
+	:returns Iterable: the rows
+	'''
+
+	result = SERIALIZERS.serialize(result)
+	if isinstance(result, (str, bytes, bytearray, Mapping)) or not isinstance(result, Iterable) or hasattr(result, '_asdict'):
+		return (result,)
+	return result
+
+def write_csv(rows, writer, format_='csv', columns=None):
+	'''Write CSV rows
+	Write every item of the iterable as a row, as in "RowsWriter", without materializing it.
+
+	:param rows: the result to write, as in "rows_of"
+	:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+	:param str format_: one of CSV_DIALECTS
+	:param list? columns: the names of the columns
+	:returns int: the amount of rows written, not counting the header
+	'''
+
+	with RowsWriter(writer, format_=format_, columns=columns) as rows_writer:
+		for row in rows_of(rows):
+			rows_writer.write_row(row)
+	LOGGER.debug('Wrote %d %s rows', rows_writer.count, format_)
+	return rows_writer.count
+
+async def write_async_csv(rows, writer, format_='csv', columns=None):
+	'''Write CSV rows asynchronously
+	Like "write_csv" for the items of an asynchronous iterable.
+
+	:param AsyncIterable rows: the rows to write
+	:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+	:param str format_: one of CSV_DIALECTS
+	:param list? columns: the names of the columns
+	:returns int: the amount of rows written, not counting the header
+	'''
+
+	with RowsWriter(writer, format_=format_, columns=columns) as rows_writer:
+		async for row in rows:
+			rows_writer.write_row(row)
+	LOGGER.debug('Wrote %d %s rows', rows_writer.count, format_)
+	return rows_writer.count
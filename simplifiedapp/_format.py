@@ -0,0 +1,274 @@
+#! python
+'''Bounded formatting
+Fast human readable formatting of results, streamed in chunks and truncated by depth, amount of items, and size, as a replacement for pprint on big results.
+'''
+
+from collections.abc import Mapping
+from itertools import islice
+from logging import getLogger
+
+from ._json_stream import CHUNK_SIZE
+
+LOGGER = getLogger(__name__)
+
+INDENT = '  '
+CONTAINER_TYPES = (list, tuple, set, frozenset, Mapping)
+BUILTIN_CONTAINERS = frozenset((dict, list, tuple, set, frozenset))
+SCALAR_TYPES = frozenset((bool, bytes, complex, float, int, str, type(None)))
+
+
+def _delimiters(value):
+	'''Opening and closing of a container
+	The strings surrounding the items of a container, like its repr.
+
+	:param value: the container
+	:returns tuple: the opening and the closing strings
+	'''
+
+	if isinstance(value, Mapping):
+		return '{', '}'
+	elif isinstance(value, list):
+		return '[', ']'
+	elif isinstance(value, tuple):
+		return '(', ')'
+	elif isinstance(value, frozenset):
+		return 'frozenset({', '})'
+	else:
+		return '{', '}'
+
+def _recursion(value):
+	'''Recursion marker
+	The text shown instead of a container found inside itself, like pprint does.
+
+	:param value: the container
+	:returns str: the marker
+	'''
+
+	return '<Recursion on {} with id={}>'.format(type(value).__name__, id(value))
+
+
+class BoundedFormatter:
+	'''Truncating pretty formatter
+	Format nested containers (lists, tuples, sets, and mappings) as indented blocks, one item per line, packing the scalars of a sequence into lines up to "width" and keeping the containers that fit in a single line. Mapping keys are kept in their order (not sorted). Any other object is formatted with "repr".
+
+	The output is bounded: containers beyond "max_depth" are replaced by an ellipsis, only the first "max_items" of every container are shown, and the output stops after "max_bytes". A summary of the elided content is added at the end, if anything was elided.
+	'''
+
+	def __init__(self, width=80, max_depth=None, max_items=None, max_bytes=None):
+		'''Magic initialization
+		Store the limits, None meaning unlimited.
+
+		:param int width: the width of the lines
+		:param int? max_depth: the maximum nesting level shown
+		:param int? max_items: the maximum amount of items shown per container
+		:param int? max_bytes: the maximum size of the output, in bytes
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		for name, limit in (('max_depth', max_depth), ('max_items', max_items), ('max_bytes', max_bytes)):
+			if (limit is not None) and (limit < 0):
+				raise ValueError('The "{}" limit should not be negative, got: {}'.format(name, limit))
+		self.width = width
+		self.max_depth = max_depth
+		self.max_items = max_items
+		self.max_bytes = max_bytes
+		self.elided_items = self.elided_containers = 0
+		self._path = set()
+
+	def _items(self, value):
+		'''Shown items of a container
+		Get the items of the container up to "max_items".
+
+		:param value: the container
+		:returns tuple: the list of items (key and value couples for mappings) and the amount of elided items
+		'''
+
+		items = value.items() if isinstance(value, Mapping) else value
+		if (self.max_items is None) or (len(value) <= self.max_items):
+			return list(items), 0
+		return list(islice(items, self.max_items)), len(value) - self.max_items
+
+	def _inline(self, value, depth, budget):
+		'''Single line version of a value
+		Build the single line repr of a value, giving up as soon as it gets longer than the budget. Containers already being formatted (the ones on the path to the value) are replaced by a recursion marker.
+
+		:param value: the value to format
+		:param int depth: the nesting level of the value
+		:param int budget: the maximum length of the line
+		:returns tuple|None: the line and the amount of elided items and containers, or None if it doesn't fit
+		'''
+
+		if not isinstance(value, CONTAINER_TYPES):
+			text = repr(value)
+			return None if len(text) > budget else (text, 0, 0)
+		if not value:
+			return repr(value) if isinstance(value, (set, frozenset)) else ''.join(_delimiters(value)), 0, 0
+
+		if id(value) in self._path:
+			text = _recursion(value)
+			return None if len(text) > budget else (text, 0, 0)
+		opening, closing = _delimiters(value)
+		if (self.max_depth is not None) and (depth >= self.max_depth):
+			return opening + '...' + closing, 0, 1
+		if min(len(value), len(value) if self.max_items is None else self.max_items) * 2 > budget:
+			return None
+		if (type(value) in BUILTIN_CONTAINERS) and ((self.max_items is None) or (len(value) <= self.max_items)) and all(type(item) in SCALAR_TYPES for item in (value.values() if isinstance(value, dict) else value)):
+			text = repr(value)	#Same output, at C speed
+			return None if len(text) > budget else (text, 0, 0)
+
+		items, elided_items = self._items(value)
+		elided_containers, parts, length = 0, [], len(opening) + len(closing)
+		self._path.add(id(value))
+		try:
+			for item in items:
+				if isinstance(value, Mapping):
+					key, item = item
+					prefix = repr(key) + ': '
+				else:
+					prefix = ''
+				inline = self._inline(item, depth + 1, budget - length - len(prefix))
+				if inline is None:
+					return None
+				text, item_elided_items, item_elided_containers = inline
+				parts.append(prefix + text)
+				length += len(parts[-1]) + 2
+				elided_items += item_elided_items
+				elided_containers += item_elided_containers
+				if length > budget:
+					return None
+		finally:
+			self._path.discard(id(value))
+		if len(items) < len(value):
+			parts.append('...')
+		if isinstance(value, tuple) and (len(parts) == 1):
+			parts[0] += ','
+		text = opening + ', '.join(parts) + closing
+		return None if len(text) > budget else (text, elided_items, elided_containers)
+
+	def iter_chunks(self, value, depth=0, indent='', offset=0):
+		'''Formatted pieces of a value
+		Lazily produce the pieces of the formatted value, without the line change at the end.
+
+		:param value: the value to format
+		:param int depth: the nesting level of the value
+		:param str indent: the indentation of the line where the value starts
+		:param int offset: the amount of characters before the value in its first line, besides the indentation (like a mapping key)
+		:returns Iterator: the pieces of the output, as strings
+		'''
+
+		inline = self._inline(value, depth, self.width - len(indent) - offset)
+		if inline is not None:
+			text, elided_items, elided_containers = inline
+			self.elided_items += elided_items
+			self.elided_containers += elided_containers
+			yield text
+			return
+
+		if not isinstance(value, CONTAINER_TYPES):
+			yield repr(value)
+			return
+		elif id(value) in self._path:
+			yield _recursion(value)
+			return
+
+		self._path.add(id(value))
+		try:
+			yield from self._iter_container_chunks(value, depth, indent)
+		finally:
+			self._path.discard(id(value))
+
+	def _iter_container_chunks(self, value, depth, indent):
+		'''Formatted pieces of a container
+		The block version of a container, one item per line, as in "iter_chunks".
+
+		:param value: the container to format
+		:param int depth: the nesting level of the container
+		:param str indent: the indentation of the line where the container starts
+		:returns Iterator: the pieces of the output, as strings
+		'''
+
+		opening, closing = _delimiters(value)
+		items, elided = self._items(value)
+		self.elided_items += elided
+		inner_indent = indent + INDENT
+		yield opening
+		if not isinstance(value, Mapping) and not any(isinstance(item, CONTAINER_TYPES) for item in items):
+			line = ''
+			for item in items:
+				part = repr(item) + ','
+				if line and (len(inner_indent) + len(line) + 1 + len(part) > self.width):
+					yield '\n' + inner_indent + line
+					line = ''
+				line = (line + ' ' + part) if line else part
+			if line:
+				yield '\n' + inner_indent + line
+		elif isinstance(value, Mapping):
+			for key, item in items:
+				key = repr(key)
+				yield '\n' + inner_indent + key + ': '
+				yield from self.iter_chunks(item, depth + 1, inner_indent, offset=len(key) + 2)
+				yield ','
+		else:
+			for item in items:
+				yield '\n' + inner_indent
+				yield from self.iter_chunks(item, depth + 1, inner_indent)
+				yield ','
+		if elided:
+			yield '\n' + inner_indent + '... ({} more)'.format(elided)
+		yield '\n' + indent + closing
+
+	def summary(self, truncated=False):
+		'''Elided content summary
+		Describe what was left out of the output.
+
+		:param bool truncated: if the output was cut by "max_bytes"
+		:returns str: the summary or an empty string if nothing was elided
+		'''
+
+		details = []
+		if self.elided_items:
+			details.append('{} items beyond {} per container'.format(self.elided_items, self.max_items))
+		if self.elided_containers:
+			details.append('{} containers beyond depth {}'.format(self.elided_containers, self.max_depth))
+		if truncated:
+			details.append('output truncated at {} bytes'.format(self.max_bytes))
+		return '' if not details else '# elided: {}\n'.format('; '.join(details))
+
+	def write(self, value, writer, encoding=None):
+		'''Write a formatted value
+		Format the value (followed by a line change) into the writer, in chunks, and then the summary of the elided content.
+
+		:param value: the value to write
+		:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+		:param str? encoding: the encoding of the output, the one of the writer by default
+		:returns int: the amount of bytes written, not counting the summary
+		'''
+
+		encoding = encoding or getattr(writer, 'encoding', None) or 'utf-8'
+		self.elided_items = self.elided_containers = 0
+		self._path.clear()
+		buffer, written, truncated = bytearray(), 0, False
+		chunks = self.iter_chunks(value)
+		for piece in chunks:
+			buffer += piece.encode(encoding, errors='backslashreplace')
+			if (self.max_bytes is not None) and (written + len(buffer) > self.max_bytes):
+				del buffer[self.max_bytes - written:]
+				buffer = bytearray(bytes(buffer).decode(encoding, errors='ignore').encode(encoding))
+				truncated = True
+				chunks.close()
+				break
+			if len(buffer) >= CHUNK_SIZE:
+				writer.write(bytes(buffer))
+				written += len(buffer)
+				buffer.clear()
+		buffer += b'\n'
+		writer.write(bytes(buffer))
+		written += len(buffer)
+
+		summary = self.summary(truncated=truncated)
+		if summary:
+			LOGGER.debug('Elided content: %s', summary.strip())
+			writer.write(summary.encode(encoding))
+		return written
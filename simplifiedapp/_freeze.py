@@ -0,0 +1,268 @@
+#! python
+'''Frozen CLI generation
+Build a plain python module out of a target, with the argparse construction and the call to the target already resolved. The generated module doesn't import simplifiedapp (or any of its dependencies) and doesn't do any introspection at runtime.
+'''
+
+from argparse import SUPPRESS
+from logging import getLogger
+from math import isfinite
+from pprint import pformat
+import builtins
+
+from ._introspection import IS_CLASS, IS_FUNCTION, IS_INSTANCE_METHOD, get_target, identify_callable, introspect_callable, parameters_from_method
+
+LOGGER = getLogger(__name__)
+
+FROZEN_BUILTIN_OPTIONS = ('--log-level', '--log-to-syslog')
+FROZEN_MODULE_TEMPLATE = """#! python
+'''Frozen CLI for {target_spec}
+Generated by simplifiedapp {version}, do not edit. Regenerate it after any change to the signature or the docstring of the target.
+'''
+
+from argparse import SUPPRESS, ArgumentDefaultsHelpFormatter, ArgumentParser, RawDescriptionHelpFormatter
+from asyncio import run as asyncio_run
+from importlib import import_module
+from inspect import isasyncgen, isawaitable
+from logging import basicConfig as logging_basicConfig
+from logging.handlers import SysLogHandler
+from pprint import pprint as pretty_print
+import sys
+
+{target_import}
+
+class VarKWParameter(dict):
+	'''Key=value parameter
+	Single entry dict out of a "key=value" string.
+	'''
+
+	def __init__(self, input_string, /):
+		key, value = input_string.split('=', maxsplit=1)
+		super().__init__({{key : value}})
+
+
+class LocalFormatterClass(ArgumentDefaultsHelpFormatter, RawDescriptionHelpFormatter):
+	pass
+
+
+LOG_PARAMETERS = {log_parameters}
+PPRINT_WIDTH = {pprint_width}
+PARSER_ARGS = {parser_args}
+BUILTIN_OPTIONS = {builtin_options}
+TARGET_OPTIONS = {target_options}
+TARGET_PARAMETERS = {target_parameters}
+PARENT_PARAMETERS = {parent_parameters}
+
+
+def build_parser():
+	'''Build the parser
+	The equivalent of the introspected parser, already resolved.
+	'''
+
+	parser = ArgumentParser(formatter_class=LocalFormatterClass, **PARSER_ARGS)
+	for parameter_name, kwargs in BUILTIN_OPTIONS + TARGET_OPTIONS:
+		parser.add_argument(parameter_name, **kwargs)
+	return parser
+
+async def resolve_async(result):
+	'''Await the result
+	Gather the items of an asynchronous generator or await anything else.
+	'''
+
+	if isasyncgen(result):
+		return [item async for item in result]
+	return await result
+
+def bind_arguments(parameters, values):
+	'''Arguments for a call
+	Pick the positional and keyword arguments out of the parsed values.
+	'''
+
+	args, kwargs = [], {{}}
+	for dest, name, positional, special, default in parameters:
+		value = values.get(dest, default)
+		if special == 'varargs':
+			args += value
+		elif special == 'varkw':
+			for entry in value:
+				kwargs.update(entry)
+		elif positional:
+			args.append(value)
+		else:
+			kwargs[name] = value
+	return args, kwargs
+
+def main(sys_argv=None):
+	'''Run the target
+	Parse the arguments, call the target and print the result.
+	'''
+
+	if sys_argv is None:
+		sys_argv = sys.argv[1:]
+
+	values = vars(build_parser().parse_args(sys_argv))
+
+	log_parameters = LOG_PARAMETERS.copy()
+	log_parameters['level'] = values.pop('log_level').upper()
+	if values.pop('log_to_syslog'):
+		log_parameters['handlers'] = [SysLogHandler(address = '/dev/log')]
+	logging_basicConfig(**log_parameters)
+
+	args, kwargs = bind_arguments(TARGET_PARAMETERS, values)
+	if PARENT_PARAMETERS is None:
+		target = TARGET
+	else:
+		parent_args, parent_kwargs = bind_arguments(PARENT_PARAMETERS, values)
+		target = getattr(PARENT(*parent_args, **parent_kwargs), TARGET.__name__)
+
+	result = target(*args, **kwargs)
+	if isasyncgen(result) or isawaitable(result):
+		result = asyncio_run(resolve_async(result))
+
+	if isinstance(result, str):
+		print(result, end='')
+	else:
+		pretty_print(result, width = PPRINT_WIDTH)
+
+
+if __name__ == '__main__':
+	main()
+"""
+
+
+class _SourceExpression(str):
+	'''Literal python expression
+	A string that is rendered "as is" in the generated source, instead of its representation.
+	'''
+
+	def __repr__(self):
+		return str(self)
+
+
+def _render_value(value):
+	'''Render a value as python source
+	Only the values that can be recreated from source are supported: literals, containers of literals, classes that can be imported, and the argparse SUPPRESS marker.
+
+	:param value: the value to render
+	:returns _SourceExpression: the python expression that evaluates to an equal value
+	'''
+
+	if value is SUPPRESS:
+		return _SourceExpression('SUPPRESS')
+	elif (value is None) or isinstance(value, (bool, int, str, bytes)):
+		return _SourceExpression(repr(value))
+	elif isinstance(value, float):
+		return _SourceExpression(repr(value) if isfinite(value) else "float('{}')".format(value))
+	elif isinstance(value, complex):
+		return _SourceExpression('complex({}, {})'.format(_render_value(value.real), _render_value(value.imag)))
+	elif isinstance(value, list):
+		return _SourceExpression('[{}]'.format(', '.join(_render_value(item) for item in value)))
+	elif isinstance(value, tuple):
+		return _SourceExpression('({}{})'.format(', '.join(_render_value(item) for item in value), ',' if len(value) == 1 else ''))
+	elif isinstance(value, (set, frozenset)):
+		return _SourceExpression('{}([{}])'.format(type(value).__name__, ', '.join(_render_value(item) for item in value)))
+	elif isinstance(value, dict):
+		return _SourceExpression('{{{}}}'.format(', '.join('{} : {}'.format(_render_value(key), _render_value(item)) for key, item in value.items())))
+	elif isinstance(value, type):
+		if value.__name__ == 'VarKWParameter':
+			return _SourceExpression('VarKWParameter')
+		elif (value.__module__ == 'builtins') and (getattr(builtins, value.__name__, None) is value):
+			return _SourceExpression(value.__name__)
+		elif ('<locals>' not in value.__qualname__) and (value.__module__ != '__main__'):
+			return _SourceExpression('import_module({}).{}'.format(repr(value.__module__), value.__qualname__))
+
+	raise ValueError('Unable to freeze value: {}'.format(repr(value)))
+
+def _render_options(options):
+	'''Render argparse options
+	Turns a mapping of argument names and "add_argument" keyword arguments into python source.
+
+	:param dict options: the argparse options, like the ones returned by "IntrospectedArgumentParser._prepare_parameters"
+	:returns str: python source for a tuple of name and kwargs couples
+	'''
+
+	rendered = ['\t({}, {}),'.format(repr(name), _render_value(kwargs)) for name, kwargs in options.items()]
+	return '(\n{}\n)'.format('\n'.join(rendered)) if rendered else '()'
+
+def _render_parameters(parameters):
+	'''Render the parameters of a call
+	Turns the details of the parameters into python source.
+
+	:param list? parameters: tuples of destination, name, positional flag, special kind, and default, as in "_frozen_parameters"
+	:returns str: python source for a tuple of those tuples, or None
+	'''
+
+	if parameters is None:
+		return 'None'
+	return '(\n{}\n)'.format('\n'.join('\t{},'.format(_render_value(parameter)) for parameter in parameters)) if parameters else '()'
+
+def _frozen_parameters(metadata, raw_parameters, with_version=True):
+	'''Options and parameters of a callable
+	Build the argparse options of the callable and the details needed to bind the parsed values back to its parameters.
+
+	:param dict metadata: the metadata of the callable, as returned by "object_metadata"
+	:param dict raw_parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param bool? with_version: add the version option, if there's a version in the metadata
+	:returns tuple: the argparse options (as in "IntrospectedArgumentParser._prepare_parameters") and a list of destination, name, positional flag, special kind, and default tuples
+	'''
+
+	from . import IntrospectedArgumentParser
+
+	if with_version and ('version' in metadata):
+		raw_parameters = raw_parameters | {'version' : {'version': metadata['version'], 'positional': False}}
+	options = IntrospectedArgumentParser._prepare_parameters(raw_parameters=raw_parameters, container_name=metadata['name'])
+
+	parameters = []
+	for (parameter, details), option_name in zip(raw_parameters.items(), options.keys()):
+		if parameter == 'version':
+			continue
+		dest = option_name if details['positional'] else option_name.lstrip('-').replace('-', '_')
+		default = details.get('default', None)
+		if details.get('special') == 'varkw':
+			default = [{key : value} for key, value in default.items()]
+		parameters.append((dest, parameter, details['positional'], details.get('special'), default))
+	return options, parameters
+
+def freeze_target(target):
+	'''Generate the frozen module source
+	Introspect the target once and render the parser construction and the call into a standalone python module. For instance methods the options of the parent class are added too (before the ones of the method) and the generated module creates the parent instance with them before calling the method.
+
+	:param target: the target (a class or a callable) or its "package.module:qualified.name" string
+	:returns str: the source code of the frozen module
+	'''
+
+	from . import DEFAULT_LOG_PARAMETERS, PPRINT_WIDTH, IntrospectedArgumentParser, __version__
+
+	target, target_type = get_target(target=target)
+	if target_type not in (IS_CLASS, IS_FUNCTION):
+		raise ValueError('Only classes and callables can be frozen, got: {}'.format(target))
+	if ('<locals>' in target.__qualname__) or (target.__module__ == '__main__'):
+		raise ValueError('The target should be importable from a module: {}'.format(target))
+	LOGGER.debug('Freezing target: %s', target)
+
+	target_metadata, raw_parameters = introspect_callable(target)
+	target_options, target_parameters = _frozen_parameters(target_metadata, raw_parameters)
+
+	root_name, _, attribute_path = target.__qualname__.partition('.')
+	target_import = 'from {} import {}\nTARGET = {}'.format(target.__module__, root_name, '.'.join((root_name, attribute_path)) if attribute_path else root_name)
+	parent_parameters = None
+	callable_type, parent = identify_callable(target)
+	if (callable_type not in (IS_CLASS, IS_FUNCTION)) and (parameters_from_method(target)[1] == IS_INSTANCE_METHOD):
+		LOGGER.debug('Freezing instance method, with parent: %s', parent)
+		parent_metadata, parent_raw_parameters = introspect_callable(parent)
+		parent_options, parent_parameters = _frozen_parameters(parent_metadata, parent_raw_parameters, with_version=False)
+		target_options = parent_options | target_options
+		target_import += '\nPARENT = {}'.format(target.__qualname__.rpartition('.')[0])
+	parser_args = {key : target_metadata[value] for key, value in (('prog', 'name'), ('description', 'description'), ('epilog', 'long_description')) if value in target_metadata}
+
+	return FROZEN_MODULE_TEMPLATE.format(
+		target_spec='{}:{}'.format(target.__module__, target.__qualname__),
+		version=__version__,
+		target_import=target_import,
+		log_parameters=pformat(DEFAULT_LOG_PARAMETERS),
+		pprint_width=PPRINT_WIDTH,
+		parser_args=_render_value(parser_args),
+		builtin_options=_render_options({name : IntrospectedArgumentParser.BUILTIN_OPTIONS[name] for name in FROZEN_BUILTIN_OPTIONS}),
+		target_options=_render_options(target_options),
+		target_parameters=_render_parameters(target_parameters),
+		parent_parameters=_render_parameters(parent_parameters),
+	)
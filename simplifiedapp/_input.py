@@ -0,0 +1,217 @@
+#! python
+'''Input files
+Read the data fed to the targets from files (or the standard input) instead of the command line.
+'''
+
+from collections.abc import Mapping
+from configparser import ConfigParser, Error as ConfigParserError
+from contextlib import contextmanager
+from json import JSONDecodeError, JSONDecoder, load as json_load, loads as json_loads
+from logging import getLogger
+from os import stat as os_stat
+from pathlib import Path
+import sys
+
+LOGGER = getLogger(__name__)
+
+STDIN_PATH = '-'
+INPUT_FILE_FORMATS = ('json', 'ini')
+READ_CHUNK_SIZE = 64 * 1024	#Characters read at a time by "read_json_values"
+WHITESPACE = ' \t\n\r'
+NUMBER_CHARACTERS = '+-.0123456789Ee'
+
+
+@contextmanager
+def open_input(path, mode='r'):
+	'''Open an input file
+	Open the file, or get the standard input for the special "-" path (which is not closed afterwards).
+
+	:param str path: the path to the file or "-"
+	:param str mode: "r" for text or "rb" for binary
+	:returns Iterator: the context manager yielding the file object
+	'''
+
+	if path == STDIN_PATH:
+		yield sys.stdin if 'b' not in mode else sys.stdin.buffer
+	else:
+		with open(path, mode, **({} if 'b' in mode else {'encoding' : 'utf-8'})) as file_:
+			yield file_
+
+def read_json_lines(path):
+	'''Read JSON Lines
+	Lazily parse a JSON Lines file, one document per line. Blank lines are skipped.
+
+	:param str path: the path to the file or "-" for the standard input
+	:returns Iterator: couples of line number and parsed document
+	'''
+
+	with open_input(path) as file_:
+		for line_number, line in enumerate(file_, start=1):
+			if not line.strip():
+				continue
+			try:
+				yield line_number, json_loads(line)
+			except JSONDecodeError as error:
+				raise ValueError('Invalid JSON on line {} of "{}": {}'.format(line_number, path, error))
+
+def read_json_values(path, chunk_size=READ_CHUNK_SIZE):
+	'''Read JSON values incrementally
+	Lazily parse the elements of a JSON array, or the documents of a JSON Lines file (any whitespace separated JSON documents, really), reading the file in chunks. Only the chunk being parsed is kept in memory, so the elements can be used while the rest of the file (or the standard input) is still arriving.
+
+	:param str path: the path to the file or "-" for the standard input
+	:param int chunk_size: the amount of characters to read at a time
+	:returns Iterator: the parsed values
+	'''
+
+	decoder = JSONDecoder()
+	with open_input(path) as file_:
+		buffer, position, offset, eof = '', 0, 0, False
+		is_array = separator_needed = None
+		while True:
+			while (position < len(buffer)) and (buffer[position] in WHITESPACE):
+				position += 1
+			if position == len(buffer):
+				if eof:
+					break
+				offset += position
+				buffer, position = file_.read(chunk_size), 0
+				eof = not buffer
+				continue
+
+			if is_array is None:
+				is_array = buffer[position] == '['
+				if is_array:
+					position += 1
+				LOGGER.debug('Reading the values of %s as a JSON %s', path, 'array' if is_array else 'Lines file')
+				continue
+			elif is_array and (buffer[position] == ']'):
+				is_array, position = False, position + 1
+				while (position < len(buffer)) and (buffer[position] in WHITESPACE):
+					position += 1
+				if (position < len(buffer)) or (file_.read(chunk_size).strip()):
+					raise ValueError('Extra data after the JSON array in "{}", at character {}'.format(path, offset + position))
+				break
+			elif is_array and separator_needed:
+				if buffer[position] != ',':
+					raise ValueError('Expected "," or "]" in "{}", at character {}'.format(path, offset + position))
+				position, separator_needed = position + 1, False
+				continue
+
+			try:
+				value, end = decoder.raw_decode(buffer, position)
+			except JSONDecodeError as error:
+				if eof:
+					raise ValueError('Invalid JSON in "{}", at character {}: {}'.format(path, offset + position, error.msg))
+				end = None
+			if (end is None) or (not eof and ((end == len(buffer)) or (isinstance(value, (int, float)) and not buffer[end:].strip(NUMBER_CHARACTERS)))):	#The value could be incomplete, like a number cut by the chunk
+				more = file_.read(chunk_size)
+				eof = not more
+				buffer, offset, position = buffer[position:] + more, offset + position, 0
+				continue
+
+			yield value
+			position, separator_needed = end, True
+
+		if is_array:
+			raise ValueError('Unterminated JSON array in "{}"'.format(path))
+
+def parse_json_file(file_):
+	'''Parse a JSON input file
+	The root of the document should be an object, which becomes the values.
+
+	:param file_: the text file object
+	:returns dict: the values in the file
+	'''
+
+	LOGGER.debug('Loading JSON data')
+	values = json_load(file_)
+	if not isinstance(values, Mapping):
+		raise ValueError('The root of a JSON input file should be an object, got: {}'.format(type(values).__name__))
+	return dict(values)
+
+def parse_ini_file(file_):
+	'''Parse an INI input file
+	Read the file with "configparser" (keeping the case of the keys). The values in the DEFAULT section become values on their own and every other section becomes a dict under its name.
+
+	:param file_: the text file object
+	:returns dict: the values in the file
+	'''
+
+	LOGGER.debug('Loading config (ini) data')
+	config = ConfigParser()
+	config.optionxform = str
+	try:
+		config.read_file(file_)
+	except ConfigParserError as error:
+		raise ValueError('Invalid INI input file: {}'.format(error))
+	values = {}
+	for section, content in config.items():
+		if section == config.default_section:
+			LOGGER.debug('Adding settings from default section')
+			values.update(content)
+		else:
+			LOGGER.debug('Adding settings from section %s', section)
+			values[section] = dict(content)
+	return values
+
+INPUT_FILE_PARSERS = {
+	'ini'	: parse_ini_file,
+	'json'	: parse_json_file,
+}
+
+def input_file_key(path, format_):
+	'''Cache key for an input file
+	Build a key out of the format, the absolute path of the file and its details (modification time and size), so any change to the file produces a different key.
+
+	:param str path: the path to the file
+	:param str format_: one of INPUT_FILE_FORMATS
+	:returns str|None: the key, or None for the standard input
+	'''
+
+	if path == STDIN_PATH:
+		return None
+	path = Path(path).resolve()
+	file_stat = os_stat(path)
+	return '|'.join(('input_file', format_, str(path), str(file_stat.st_mtime_ns), str(file_stat.st_size)))
+
+def load_input_file(path, format_, cache=None):
+	'''Load an input file
+	Parse the file in the format (as in INPUT_FILE_PARSERS). With a cache, the parsed values are stored and reused as long as the file doesn't change (as in "input_file_key"); the standard input is never cached.
+
+	:param str path: the path to the file or "-" for the standard input
+	:param str format_: one of INPUT_FILE_FORMATS, case insensitive
+	:param DiskCache? cache: the cache for the parsed values
+	:returns dict: the values in the file
+	'''
+
+	format_ = format_.lower()
+	if format_ not in INPUT_FILE_PARSERS:
+		raise ValueError('Input file format not supported: {}'.format(format_))
+
+	key = None if cache is None else input_file_key(path, format_)
+	if key is not None:
+		values = cache.get(key)
+		if values is not None:
+			return values
+
+	LOGGER.debug('Processing input %s', path)
+	with open_input(path) as file_:
+		values = INPUT_FILE_PARSERS[format_](file_)
+	if key is not None:
+		cache.set(key, values)
+	return values
+
+def load_input_files(input_files, cache=None):
+	'''Load several input files
+	Load every file (as in "load_input_file") and merge their values, the later files overriding the earlier ones.
+
+	:param Iterable input_files: couples of path and format
+	:param DiskCache? cache: the cache for the parsed values
+	:returns dict: the merged values
+	'''
+
+	values = {}
+	for path, format_ in input_files:
+		LOGGER.debug('Merging values from %s', path)
+		values.update(load_input_file(path, format_, cache=cache))
+	return values
@@ -6,18 +6,36 @@ ToDo:
 - Everything
 '''
 
+from asyncio import new_event_loop
+from collections import OrderedDict
 from importlib import import_module
-from inspect import getfullargspec, getmembers, getmodule, isclass, ismodule, stack as inspect_stack
+from inspect import currentframe, getfullargspec, getmembers, getmodule, isclass, ismodule, isroutine
 from logging import getLogger
 from sys import modules
+from threading import Lock
+from weakref import WeakKeyDictionary
 
 from docstring_parser import parse as docstring_parse
 from introspection import Signature
 
+from ._async import is_async_result, resolve_async_result
+from ._cache import source_cache_key
+from ._timings import timer_phase
+
 LOGGER = getLogger(__name__)
 
 IS_CLASS, IS_FUNCTION, IS_METHOD, IS_MODULE = 'CLASS', 'FUNCTION', 'METHOD', 'MODULE'
 IS_CLASS_METHOD, IS_INSTANCE_METHOD, IS_STATIC_METHOD = 'CLASS_METHOD', 'INSTANCE_METHOD', 'STATIC_METHOD'
+ARGUMENT_POSITIONAL, ARGUMENT_VARARGS, ARGUMENT_KEYWORD, ARGUMENT_VARKW = 'POSITIONAL', 'VARARGS', 'KEYWORD', 'VARKW'
+NO_DEFAULT = object()
+LITERAL_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+METADATA_ID_CACHE_SIZE = 256	#Objects that can't be weakly referenced with memoized metadata, the least recently used ones are dropped first
+
+_METADATA_CACHE = WeakKeyDictionary()
+_METADATA_ID_CACHE = OrderedDict()	#For objects that can't be weakly referenced (or hashed). The entries keep a reference to the object so the id doesn't get reused.
+_METADATA_ID_LOCK = Lock()
+_PARENT_PARAMETERS_CACHE = WeakKeyDictionary()
 
 def enumerate_object_callables(obj):
 	'''Enumerate object functions and classes
@@ -36,9 +54,30 @@ def enumerate_object_callables(obj):
 				functions.append(attr)
 	return functions, classes
 	
-def execute_callable(callable_, args_w_keys={}, parameters=None, callable_metadata=None):
+def index_module_callables(module):
+	'''Cheap index of a module's callables
+	Lists the public functions and classes in the module without any introspection of them. If the module defines "__all__" only the names in it are listed, otherwise the ones which name doesn't start with an underscore and that were defined in the module itself (so imported names are left out).
+
+	:param module: the module to index
+	:returns dict: a mapping of names and callables, in definition order
+	'''
+
+	members = vars(module)
+	if '__all__' in members:
+		candidates = {name : members[name] for name in members['__all__'] if name in members}
+	else:
+		candidates = {name : member for name, member in members.items() if (name[0] != '_') and (getattr(member, '__module__', None) == module.__name__)}
+	return {name : member for name, member in candidates.items() if isclass(member) or isroutine(member)}
+
+def execute_callable(callable_, args_w_keys={}, parameters=None, callable_metadata=None, plan=None, loop_factory=new_event_loop, instance_pool=None):
 	'''Execute a callable
 	"Call" the provided callable with the applicable parameters found in "args_w_keys". The parameters are provided as needed (positionals or as keywords) based on the callable signature.
+
+	The arguments plan (from "compile_arguments") can be provided when the same callable is executed repeatedly, to skip compiling it on every call. It only applies to the callable itself, not to the parent of an instance method.
+
+	The parent instance of an instance method is taken from the "instance_pool", if provided (as in "simplifiedapp._pool.InstancePool"), instead of creating a new one on every call. The parameters of the parent class are introspected once (as in "parent_class_parameters").
+
+	Asynchronous callables (coroutine functions and asynchronous generators) are driven on an event loop created with "loop_factory", the coroutine result is returned and the items of an asynchronous generator are gathered in a list. The raw coroutine or asynchronous generator is returned if "loop_factory" is None. Note that "loop_factory" defaults to "asyncio.new_event_loop", so asynchronous callables are resolved unless None is passed explicitly.
 	'''
 	
 	callable_type, parent = identify_callable(callable_)
@@ -48,20 +87,25 @@ def execute_callable(callable_, args_w_keys={}, parameters=None, callable_metada
 	if callable_type == IS_CLASS:
 		if parameters is None:
 			parameters = parameters_from_class(callable_)
-		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys)
+		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys, plan=plan)
 		LOGGER.debug('Instantiating class "%s" with: %s & %s', callable_metadata['name'], args, kwargs)
 		result = callable_(*args, **kwargs)
 	elif callable_type == IS_FUNCTION:
 		if parameters is None:
 			parameters = parameters_from_function(callable_, function_metadata=callable_metadata)
-		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys)
+		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys, plan=plan)
 		LOGGER.debug('Running function "%s" with: %s & %s', callable_metadata['name'], args, kwargs)
 		result = callable_(*args, **kwargs)
 	else:
 		parameters, method_type = parameters_from_method(method=callable_, method_metadata=callable_metadata)
-		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys)
+		args, kwargs = prepare_arguments(parameters=parameters, args_w_keys=args_w_keys, plan=plan)
 		if method_type == IS_INSTANCE_METHOD:
-			parent_instance = execute_callable(parent, args_w_keys=args_w_keys)
+			parent_parameters = parent_class_parameters(parent)
+			if instance_pool is None:
+				parent_instance = execute_callable(parent, args_w_keys=args_w_keys, parameters=parent_parameters)
+			else:
+				parent_args, parent_kwargs = prepare_arguments(parameters=parent_parameters, args_w_keys=args_w_keys)
+				parent_instance = instance_pool.get(parent, parent_args, parent_kwargs)
 			instance_method = getattr(parent_instance, callable_metadata['name'])
 			LOGGER.debug('Running instance method "%s" with: %s & %s', instance_method.__qualname__, args, kwargs)
 			result = instance_method(*args, **kwargs)
@@ -69,21 +113,45 @@ def execute_callable(callable_, args_w_keys={}, parameters=None, callable_metada
 			LOGGER.debug('Running %s "%s" with: %s & %s', method_type, callable_metadata['name'], args, kwargs)
 			result = callable_(*args, **kwargs)
 	
+	if (loop_factory is not None) and is_async_result(result):
+		result = resolve_async_result(result, loop_factory=loop_factory)
+
 	return result
 
+def get_caller_module(depth=1):
+	'''Find the module of a caller
+	Walk the frames up the stack to find the module of a caller. Only the frame objects are visited, no source context is loaded (unlike "inspect.stack") so it's cheap even with very deep stacks.
+
+	:param int depth: how many frames to go up from the caller of this function, 0 being the caller itself
+	:returns module|None: the module where the code of that frame was defined or None if the stack is not that deep
+	'''
+
+	frame = currentframe()
+	for _ in range(depth + 1):
+		if frame is None:
+			return None
+		frame = frame.f_back
+	if frame is None:
+		return None
+
+	module = modules.get(frame.f_globals.get('__name__'))
+	if module is None:
+		module = getmodule(frame)
+	return module
+
 def get_target(target=None):
 	'''Figure out the target and its type
 	Use introspection to find the caller. It wouldn't be the caller to this function but the caller to this function's caller or whatever is passed as parameter. It also figures out if it's a module, a class, or a function
 
+	A string target can also use the "package.module:qualified.name" notation to point to a member of a module.
+
 	:param target: Optionally pass the target (just passthrough) or a string to resolve
 	:returns tuple: the target and the corresponding IS_FUNCTION, IS_CLASS, or IS_MODULE
 	'''
 
-	caller = inspect_stack()
-	if len(caller) < 2:
-		caller = None
-	else:
-		caller = getmodule(caller[2][0])
+	caller = None
+	if (target is None) or (isinstance(target, str) and (':' not in target) and (target not in modules)):
+		caller = get_caller_module(depth=2)
 		LOGGER.debug('Got caller: %s', caller)
 
 	if target is None:
@@ -94,7 +162,16 @@ def get_target(target=None):
 			target = caller
 	elif isinstance(target, str):
 		LOGGER.debug('Identifying string defined target: %s', target)
-		if target in modules:
+		if ':' in target:
+			module_name, member_name = target.split(':', maxsplit=1)
+			try:
+				target = import_module(module_name)
+				for attribute in member_name.split('.'):
+					target = getattr(target, attribute)
+			except (AttributeError, ModuleNotFoundError):
+				raise ValueError('Target "{}:{}" could not be identified'.format(module_name, member_name))
+			LOGGER.debug('Target is a module member: %s', target)
+		elif target in modules:
 			LOGGER.debug('Target is a loaded module: %s', target)
 			target = modules[target]
 		elif hasattr(caller, target):
@@ -133,7 +210,8 @@ def identify_callable(callable_):
 		raise ValueError('The argument provided "{}" is not a callable'.format(callable_))
 	
 	genealogy = callable_.__qualname__.split('.')
-	if len(genealogy) == 1:
+	#AFAIK there's no way to resolve the local context of a function short of evaluating/running it.
+	if (len(genealogy) == 1) or ('<locals>' in genealogy):
 		parent = None
 	elif len(genealogy) > 1:
 		module = import_module(callable_.__module__)
@@ -153,10 +231,116 @@ def identify_callable(callable_):
 	
 	return callable_type, parent
 
+def introspect_callable(callable_, cache=None, timer=None):
+	'''Introspect a callable
+	Get the metadata and the parameters details for the callable. If a cache is provided it will be used to store the results and to retrieve them on later runs, skipping the introspection altogether. The results are only stored if every default is a plain literal (see "is_plain_literal"), since other objects (like sentinels) wouldn't be the same ones after a round trip through the cache.
+
+	:param callable_: the callable to introspect
+	:param DiskCache? cache: the cache to use, as in "simplifiedapp._cache.DiskCache"
+	:param PhaseTimer? timer: the timer recording the "introspection cache", "metadata", and "parameters" phases, as in "simplifiedapp._timings.PhaseTimer"
+	:returns tuple: the metadata (as returned by "object_metadata") and the parameters (as returned by "parameters_from_callable")
+	'''
+
+	cache_key = None if cache is None else source_cache_key(callable_)
+	if cache_key is not None:
+		with timer_phase(timer, 'introspection cache'):
+			cached = cache.get(cache_key)
+		if cached is not None:
+			LOGGER.debug('Using cached introspection for: %s', callable_)
+			return cached
+
+	with timer_phase(timer, 'metadata'):
+		callable_metadata = object_metadata(callable_)
+	with timer_phase(timer, 'parameters'):
+		parameters = parameters_from_callable(callable_, callable_metadata=callable_metadata)
+
+	if cache_key is not None:
+		if all(is_plain_literal(details.get('default')) for details in parameters.values()):
+			with timer_phase(timer, 'introspection cache'):
+				cache.set(cache_key, (callable_metadata, parameters))
+		else:
+			LOGGER.debug('Not caching the introspection of "%s", some defaults are not plain literals', callable_)
+
+	return callable_metadata, parameters
+
+def is_plain_literal(value):
+	'''Plain literal check
+	Tells if the value is made only of literals (None, booleans, numbers, strings, and bytes) and builtin containers (tuples, lists, sets, and dicts) of them, which are equivalent after being pickled and unpickled.
+
+	:param value: the value to check
+	:returns bool: True if the value is a plain literal
+	'''
+
+	if type(value) in LITERAL_TYPES:
+		return True
+	elif type(value) in (tuple, list, set, frozenset):
+		return all(is_plain_literal(item) for item in value)
+	elif type(value) is dict:
+		return all(is_plain_literal(key) and is_plain_literal(item) for key, item in value.items())
+	return False
+
+def clear_metadata_cache(obj=None):
+	'''Invalidate the memoized metadata
+	Drop the metadata memoized by "object_metadata" (and the parameters memoized by "parent_class_parameters") for the provided object or for every object.
+
+	:param obj: the object to forget about, every object if None
+	:returns None: nothing
+	'''
+
+	if obj is None:
+		_METADATA_CACHE.clear()
+		with _METADATA_ID_LOCK:
+			_METADATA_ID_CACHE.clear()
+		_PARENT_PARAMETERS_CACHE.clear()
+		return
+
+	try:
+		_METADATA_CACHE.pop(obj, None)
+		_PARENT_PARAMETERS_CACHE.pop(obj, None)
+	except TypeError:
+		with _METADATA_ID_LOCK:
+			_METADATA_ID_CACHE.pop(id(obj), None)
+
 def object_metadata(obj):
 	'''Gets metadata from an object
 	It tries to get some meta information from the provided object by leveraging the object's details (name and version) and whatever can be learned from the docstring.
 
+	The result is memoized per object (weakly, when the object supports it, otherwise for the METADATA_ID_CACHE_SIZE most recently used objects) so each docstring gets parsed at most once per process. The memoized value is discarded if the docstring or the version of the object change; use "clear_metadata_cache" for any other invalidation. The returned dict is shared, it should be treated as read only.
+
+	:param obj: The object to build the metadata for
+	:returns dict: dictionary containing metadata details
+	'''
+
+	docstring, version = getattr(obj, '__doc__', None), getattr(obj, '__version__', None)
+	try:
+		cached = _METADATA_CACHE.get(obj)
+	except TypeError:
+		with _METADATA_ID_LOCK:
+			cached = _METADATA_ID_CACHE.get(id(obj))
+			if cached is not None:
+				_METADATA_ID_CACHE.move_to_end(id(obj))
+		weakly_cached = False
+	else:
+		weakly_cached = True
+
+	if (cached is not None) and (cached[1] == docstring) and (cached[2] == version):
+		return cached[3]
+
+	metadata = _object_metadata(obj)
+	if weakly_cached:
+		_METADATA_CACHE[obj] = (None, docstring, version, metadata)
+	else:
+		with _METADATA_ID_LOCK:
+			_METADATA_ID_CACHE[id(obj)] = (obj, docstring, version, metadata)
+			_METADATA_ID_CACHE.move_to_end(id(obj))
+			while len(_METADATA_ID_CACHE) > METADATA_ID_CACHE_SIZE:
+				_METADATA_ID_CACHE.popitem(last=False)
+	return metadata
+
+def _object_metadata(obj):
+	'''Gets metadata from an object
+	The actual (not memoized) implementation of "object_metadata".
+
 	:param obj: The object to build the metadata for
 	:returns dict: dictionary containing metadata details
 	'''
@@ -257,6 +441,23 @@ def parameters_from_class(class_):
 		
 	return parameters | kw_parameters
 
+def parent_class_parameters(class_):
+	'''Memoized class parameters
+	The parameters of the class (as returned by "parameters_from_class") memoized weakly per class, for the parents of instance methods which get instantiated on every call. The memoized value is discarded if "__new__" or "__init__" change. The returned dict is shared, it should be treated as read only.
+
+	:param type class_: the class to get the parameters for
+	:returns dict: a mapping of parameters and details
+	'''
+
+	constructors = (class_.__new__, class_.__init__)
+	cached = _PARENT_PARAMETERS_CACHE.get(class_)
+	if (cached is not None) and (cached[0] == constructors):
+		return cached[1]
+
+	parameters = parameters_from_class(class_)
+	_PARENT_PARAMETERS_CACHE[class_] = (constructors, parameters)
+	return parameters
+
 def parameters_from_function(function_, function_metadata=None, from_class=False):
 	'''Function parameters details
 	Uses introspection to extract the parameters required/allowed by a function and as much details as possible from them.
@@ -328,36 +529,57 @@ def parameters_from_method(method, method_metadata=None):
 
 	return parameters, method_type
 
-def prepare_arguments(parameters, args_w_keys={}):
+def compile_arguments(parameters):
+	'''Compile the parameters into an arguments plan
+	Walk the parameters details once and turn them into a flat tuple that "prepare_arguments" can apply repeatedly without looking into the details again.
+
+	:param dict parameters: A mapping of parameters and details, as returned from "parameters_from_callable"
+	:returns tuple: a tuple of (argument kind, parameter name, default value) tuples, with NO_DEFAULT for required parameters
+	'''
+
+	plan = []
+	for parameter, details in parameters.items():
+		special = details.get('special')
+		if details.get('positional', False):
+			kind = ARGUMENT_VARARGS if special == 'varargs' else ARGUMENT_POSITIONAL
+		else:
+			kind = ARGUMENT_VARKW if special == 'varkw' else ARGUMENT_KEYWORD
+		plan.append((kind, parameter, details.get('default', NO_DEFAULT)))
+
+	return tuple(plan)
+
+def prepare_arguments(parameters, args_w_keys={}, plan=None):
 	'''Prepare arguments for callable
 	Create the list of "args" and the mapping of "kwargs" to be used with a callable.
 
 	:param dict parameters: A mapping of parameters and details, as returned from "parameters_from_callable"
 	:param dict args_w_keys: A mapping of parameters and values to be added to args and kwargs
+	:param tuple? plan: the result of "compile_arguments" for the parameters, compiled on the fly if not provided
 	:returns tuple: positional arguments "args" and keyword arguments "kwargs"
 	'''
-	
+
+	if plan is None:
+		plan = compile_arguments(parameters)
+
 	args, kwargs = [], {}
-	for parameter, details in parameters.items():
-		if ('positional' in details) and details['positional']:
-			if ('special' in details) and (details['special'] == 'varargs'):
-				if parameter in args_w_keys:
-					args += args_w_keys[parameter]
-			elif parameter in args_w_keys:
-				args.append(args_w_keys[parameter])
-			elif 'default' in details:
-				args.append(details['default'])
-			else:
-				raise ValueError('Missing value for parameter "{}"'.format(parameter))
-		elif ('special' in details) and (details['special'] == 'varkw'):
-			if parameter in args_w_keys:
-				kwargs |= args_w_keys[parameter]
-		elif parameter in args_w_keys:
-			kwargs[parameter] = args_w_keys[parameter]
-		elif 'default' in details:
-			kwargs[parameter] = details['default']
-		else:
+	for kind, parameter, default in plan:
+		if parameter in args_w_keys:
+			value = args_w_keys[parameter]
+		elif kind in (ARGUMENT_VARARGS, ARGUMENT_VARKW):
+			continue
+		elif default is NO_DEFAULT:
 			raise ValueError('Missing value for parameter "{}"'.format(parameter))
+		else:
+			value = default
+
+		if kind == ARGUMENT_POSITIONAL:
+			args.append(value)
+		elif kind == ARGUMENT_VARARGS:
+			args += value
+		elif kind == ARGUMENT_KEYWORD:
+			kwargs[parameter] = value
+		else:
+			kwargs |= value
 
 	return args, kwargs
 
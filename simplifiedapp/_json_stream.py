@@ -0,0 +1,169 @@
+#! python
+'''Streaming JSON
+Encode results as a single JSON document, writing it in chunks as it's produced so huge results (or iterators) never get serialized into one big string.
+'''
+
+from collections.abc import Iterator, Mapping
+from json import JSONEncoder
+from logging import getLogger
+
+from ._serializers import SERIALIZERS
+
+LOGGER = getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024	#Bytes accumulated before writing a chunk
+STREAM_THRESHOLD = 256	#Containers with more items than this (counting the ones of the nested containers) are walked item by item, smaller ones are encoded in one go
+
+_ENCODER = JSONEncoder(default=SERIALIZERS.default, ensure_ascii=False, check_circular=False, separators=(',', ':'))
+
+
+def fast_json_encoder(prefer_orjson=True):
+	'''Best available JSON encoder
+	Get a function encoding a (small) value into JSON bytes: orjson, if it's installed (falling back to the standard library for the values it doesn't support, like big integers or non string keys), or the standard library encoder otherwise. The value and its content are serialized first (as in "SerializerRegistry.serialize_nested" of "simplifiedapp._serializers.SERIALIZERS"), so registered serializers apply to subclasses of the builtin containers (like named tuples) too, and the rest of the non JSON serializable values are converted with "str". The output doesn't depend on the encoder.
+
+	:param bool? prefer_orjson: use orjson if it's installed, the standard library encoder is always used otherwise
+	:returns Callable: a function taking a value and returning the JSON bytes
+	'''
+
+	def encode_stdlib(value):
+		return _ENCODER.encode(SERIALIZERS.serialize_nested(value)).encode('utf-8', errors='backslashreplace')
+
+	if not prefer_orjson:
+		return encode_stdlib
+	try:
+		import orjson
+	except ImportError:
+		LOGGER.debug('The orjson package is not installed, using the standard library JSON encoder')
+		return encode_stdlib
+
+	options = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+	def encode_orjson(value):
+		value = SERIALIZERS.serialize_nested(value)
+		try:
+			return orjson.dumps(value, default=SERIALIZERS.default, option=options)
+		except TypeError:
+			return _ENCODER.encode(value).encode('utf-8', errors='backslashreplace')
+
+	return encode_orjson
+
+def encode_key(key):
+	'''Encode a mapping key
+	Keys are converted to strings the way the standard library does it (numbers, booleans and None), anything else is converted with "str".
+
+	:param key: the key to encode
+	:returns bytes: the JSON string for the key
+	'''
+
+	if not isinstance(key, str):
+		if (key is None) or isinstance(key, (bool, int, float)):
+			key = _ENCODER.encode(key)
+		else:
+			key = str(key)
+	return _ENCODER.encode(key).encode('utf-8', errors='backslashreplace')
+
+def estimated_size(value, limit=STREAM_THRESHOLD):
+	'''Estimated size of a value
+	Count the items of the value and of its nested lists, tuples, and mappings, stopping as soon as the count goes over the limit. Iterators count as over the limit, since they can't be measured without consuming them.
+
+	:param value: the value to measure
+	:param int limit: the count after which the counting stops
+	:returns int: the amount of items, anything over the limit means "more than the limit"
+	'''
+
+	if isinstance(value, Iterator):
+		return limit + 1
+	elif isinstance(value, Mapping):
+		items = value.values()
+	elif isinstance(value, (list, tuple)):
+		items = value
+	else:
+		return 1
+
+	size = len(items)
+	for item in items:
+		if size > limit:
+			break
+		if isinstance(item, (Iterator, Mapping, list, tuple)):
+			size += estimated_size(item, limit - size)
+	return size
+
+def iter_json_chunks(value, encode=None):
+	'''JSON pieces of a value
+	Lazily produce the pieces of the JSON document for the value. Values with a serializer (as in "simplifiedapp._serializers.SERIALIZERS") are serialized first. Iterators become arrays and are consumed item by item; lists, tuples and mappings are walked item by item too when they're big (including what they contain, as in "estimated_size"), while everything else is encoded in one go with "encode".
+
+	:param value: the value to encode
+	:param Callable? encode: the encoder for the small values, as returned by "fast_json_encoder"
+	:returns Iterator: the pieces of the document, as bytes
+	'''
+
+	if encode is None:
+		encode = fast_json_encoder()
+
+	value = SERIALIZERS.serialize(value)
+	if isinstance(value, (Iterator, list, tuple, Mapping)):
+		walk = estimated_size(value) > STREAM_THRESHOLD
+	else:
+		walk = False
+
+	if not walk:
+		yield encode(value)
+	elif isinstance(value, Mapping):
+		separator = b'{'
+		for key, item in value.items():
+			yield separator + encode_key(key) + b':'
+			yield from iter_json_chunks(item, encode)
+			separator = b','
+		yield b'{}' if separator == b'{' else b'}'
+	else:
+		separator = b'['
+		for item in value:
+			yield separator
+			yield from iter_json_chunks(item, encode)
+			separator = b','
+		yield b'[]' if separator == b'[' else b']'
+
+def write_json(value, writer, chunk_size=CHUNK_SIZE):
+	'''Write a JSON document
+	Write the value as JSON (followed by a line change), in chunks of about "chunk_size" bytes, so only a chunk and the value being encoded are kept in memory.
+
+	:param value: the value to write
+	:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+	:param int chunk_size: the amount of bytes accumulated before writing
+	:returns int: the amount of bytes written
+	'''
+
+	buffer, written = bytearray(), 0
+	for piece in iter_json_chunks(value):
+		buffer += piece
+		if len(buffer) >= chunk_size:
+			writer.write(bytes(buffer))
+			written += len(buffer)
+			buffer.clear()
+	buffer += b'\n'
+	writer.write(bytes(buffer))
+	return written + len(buffer)
+
+async def write_async_json(items, writer, chunk_size=CHUNK_SIZE):
+	'''Write an asynchronous iterable as a JSON array
+	Like "write_json" for the items of an asynchronous iterable, which are written as the items of an array.
+
+	:param AsyncIterable items: the items to write
+	:param writer: the binary writer, like "simplifiedapp._output.IncrementalWriter"
+	:param int chunk_size: the amount of bytes accumulated before writing
+	:returns int: the amount of bytes written
+	'''
+
+	encode = fast_json_encoder()
+	buffer, written, separator = bytearray(), 0, b'['
+	async for item in items:
+		buffer += separator
+		for piece in iter_json_chunks(item, encode):
+			buffer += piece
+		separator = b','
+		if len(buffer) >= chunk_size:
+			writer.write(bytes(buffer))
+			written += len(buffer)
+			buffer.clear()
+	buffer += b'[]\n' if separator == b'[' else b']\n'
+	writer.write(bytes(buffer))
+	return written + len(buffer)
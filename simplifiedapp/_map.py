@@ -0,0 +1,179 @@
+#! python
+'''Parallel map
+Fan a target out over the elements of one of its iterable parameters, running the calls concurrently on a thread or process pool.
+'''
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from logging import getLogger
+from os import cpu_count
+
+from ._async import event_loop_factory
+from ._introspection import compile_arguments, execute_callable, introspect_callable
+from ._output import encode_record
+from ._pool import InstancePool
+
+LOGGER = getLogger(__name__)
+
+EXECUTORS = ('thread', 'process')
+WINDOW_PER_WORKER = 2	#Calls in flight per worker. Keeps the workers busy while bounding the memory used by pending results.
+
+_PROCESS_WORKER = None
+
+
+class MapWorker:
+	'''Callable executor
+	Introspects the target once and then executes it for every set of arguments, returning the encoded output record. The parent instances of instance methods are reused across calls (via "instance_pool"). In process pools each process builds its own instance (via "initialize_process_worker").
+	'''
+
+	def __init__(self, callable_, format_='auto', encoding='utf-8', event_loop='asyncio', introspection_cache=None):
+		'''Magic initialization
+		Introspect the callable and compile its arguments plan.
+
+		:param callable_: the class or function to execute
+		:param str format_: the output format, as in "simplifiedapp._output.encode_record"
+		:param str encoding: the encoding of the output records
+		:param str event_loop: the event loop for asynchronous callables, as in "simplifiedapp._async.event_loop_factory"
+		:param DiskCache? introspection_cache: the cache used for the introspection
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.callable_ = callable_
+		self.format_ = format_
+		self.encoding = encoding
+		self.loop_factory = event_loop_factory(event_loop)
+		self.callable_metadata, self.parameters = introspect_callable(callable_, cache=introspection_cache)
+		self.plan = compile_arguments(self.parameters)
+		self.instance_pool = InstancePool()
+
+	def __call__(self, args_w_keys):
+		'''Execute the callable
+		Run the callable with the arguments and encode the result. Failures are logged and get an empty record.
+
+		:param dict args_w_keys: the values for the callable parameters
+		:returns tuple: a flag signaling success and the encoded output record
+		'''
+
+		try:
+			result = execute_callable(self.callable_, args_w_keys=args_w_keys, callable_metadata=self.callable_metadata, parameters=self.parameters, plan=self.plan, loop_factory=self.loop_factory, instance_pool=self.instance_pool)
+			return True, encode_record(result, format_=self.format_, encoding=self.encoding)
+		except Exception as error:
+			LOGGER.error('Execution with %s failed: %s', args_w_keys, error)
+			LOGGER.debug('Execution with %s failed', args_w_keys, exc_info=True)
+			return False, encode_record(None, format_=self.format_, encoding=self.encoding)
+
+
+def initialize_process_worker(args, kwargs):
+	'''Process pool initializer
+	Build the worker of the process.
+
+	:param tuple args: the positional arguments for "MapWorker"
+	:param dict kwargs: the keyword arguments for "MapWorker"
+	:returns None: nothing
+	'''
+
+	global _PROCESS_WORKER
+	_PROCESS_WORKER = MapWorker(*args, **kwargs)
+
+def run_in_process_worker(args_w_keys):
+	'''Process pool task
+	Run the worker of the process, built by "initialize_process_worker".
+	'''
+
+	return _PROCESS_WORKER(args_w_keys)
+
+def map_arguments(args_w_keys, parameter, parameters):
+	'''Arguments for every call
+	Lazily build the arguments for every call, replacing the values of the mapped parameter with each one of its elements (wrapped in a list, since the parameter expects an iterable).
+
+	:param dict args_w_keys: the values for the callable parameters
+	:param str parameter: the name of the mapped parameter
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:returns Iterator: the values for the callable parameters on every call
+	'''
+
+	if parameter not in parameters:
+		raise ValueError('Unknown parameter to map: {}'.format(parameter))
+	values = args_w_keys.get(parameter, parameters[parameter].get('default'))
+	if isinstance(values, (str, bytes, Mapping)) or not isinstance(values, Iterable):
+		raise ValueError('The mapped parameter "{}" should be a variable positional parameter or a list, got: {}'.format(parameter, type(values).__name__))
+
+	return (args_w_keys | {parameter : [value]} for value in values)
+
+def run_map(callable_, args_w_keys, parameter, parameters, writer, workers=None, executor='thread', ordered=True, format_='auto', event_loop='asyncio', introspection_cache=None):
+	'''Run the parallel map
+	Execute the callable for every element of the mapped parameter on a pool and write one output record per element, as soon as it's available (in the order of the elements if "ordered"). Only a bounded window of calls is in flight at any time, so the elements can come from a lazy iterator.
+
+	:param callable_: the class or function to execute
+	:param dict args_w_keys: the values for the callable parameters
+	:param str parameter: the name of the mapped parameter
+	:param dict parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param IncrementalWriter writer: the writer for the output records
+	:param int? workers: the size of the pool, the amount of CPUs by default
+	:param str executor: one of EXECUTORS
+	:param bool ordered: write the records in the order of the elements, instead of the completion order
+	:param str format_: the output format, as in "simplifiedapp._output.encode_record"
+	:param str event_loop: the event loop for asynchronous callables, as in "simplifiedapp._async.event_loop_factory"
+	:param DiskCache? introspection_cache: the cache used for the introspection in the workers
+	:returns tuple: the amount of calls executed and the amount of failures
+	'''
+
+	workers = workers or cpu_count() or 1
+	if workers < 1:
+		raise ValueError('The amount of workers should be positive, got: {}'.format(workers))
+	calls_args_w_keys = map_arguments(args_w_keys, parameter, parameters)
+
+	worker_args = (callable_,)
+	worker_kwargs = {'format_' : format_, 'encoding' : writer.encoding, 'event_loop' : event_loop, 'introspection_cache' : introspection_cache}
+	worker = None
+	if executor == 'thread':
+		worker = MapWorker(*worker_args, **worker_kwargs)
+		pool, task = ThreadPoolExecutor(max_workers=workers), worker
+	elif executor == 'process':
+		pool, task = ProcessPoolExecutor(max_workers=workers, initializer=initialize_process_worker, initargs=(worker_args, worker_kwargs)), run_in_process_worker
+	else:
+		raise ValueError('Unknown executor: {}'.format(executor))
+	LOGGER.debug('Mapping "%s" over %d %s workers', parameter, workers, executor)
+
+	executed = failed = 0
+	def emit(future):
+		nonlocal executed, failed
+		executed += 1
+		try:
+			success, output = future.result()
+		except Exception as error:
+			LOGGER.error('Execution failed: %s', error)
+			success, output = False, encode_record(None, format_=format_, encoding=writer.encoding)
+		failed += not success
+		writer.write(output)
+
+	window = workers * WINDOW_PER_WORKER
+	with pool:
+		if ordered:
+			pending = deque()
+			for call_args_w_keys in calls_args_w_keys:
+				if len(pending) >= window:
+					emit(pending.popleft())
+				pending.append(pool.submit(task, call_args_w_keys))
+			while pending:
+				emit(pending.popleft())
+		else:
+			pending = set()
+			for call_args_w_keys in calls_args_w_keys:
+				if len(pending) >= window:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					for future in done:
+						emit(future)
+				pending.add(pool.submit(task, call_args_w_keys))
+			while pending:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					emit(future)
+	if worker is not None:
+		worker.instance_pool.clear()
+
+	LOGGER.debug('Map done, %d calls executed and %d failed', executed, failed)
+	return executed, failed
@@ -0,0 +1,313 @@
+#! python
+'''Result memoization
+Persist the results of pure targets on disk, so repeated runs with the same arguments (even from different processes) skip the execution.
+'''
+
+from asyncio import new_event_loop
+from contextlib import contextmanager
+from hashlib import sha256
+from inspect import isclass, ismethod, unwrap
+from logging import getLogger
+from marshal import dumps as marshal_dumps
+from os import stat as os_stat, utime
+from pickle import PicklingError, dumps as pickle_dumps
+from time import time
+
+from ._cache import CACHE_FILE_SUFFIX, DiskCache, source_cache_key
+from ._introspection import IS_CLASS, IS_FUNCTION, compile_arguments, execute_callable, identify_callable, introspect_callable, prepare_arguments
+
+try:
+	from fcntl import LOCK_EX, LOCK_SH, LOCK_UN, flock
+except ImportError:
+	flock = None
+
+LOGGER = getLogger(__name__)
+
+MEMOIZE_ATTRIBUTE = '__simplifiedapp_memoize__'
+RESULTS_CACHE_SIZE = 64 * 1024 * 1024	#Bytes of results kept on disk before evicting the least recently used ones
+LOCK_FILE_NAME = '.lock'
+PICKLE_PROTOCOL = 4	#Fixed, so the digest of pickled arguments doesn't change with the Python version
+
+_MISSING = object()
+
+
+def memoize(callable_=None, *, ttl=None):
+	'''Opt-in for result memoization
+	Decorator flagging a target as pure, so its results are stored (when a cache directory is configured) and reused for the same arguments. It can be used bare or with arguments. Only functions and classes are memoized: the result of a method depends on its instance (or class), which is not part of the key. Setting the attribute named in MEMOIZE_ATTRIBUTE to True (or to a dict of these options) has the same effect.
+
+	:param callable_: the target to flag
+	:param float? ttl: the amount of seconds a result stays valid, forever if None
+	:returns Callable: the same target if provided, otherwise the decorator
+	'''
+
+	def decorator(callable_):
+		setattr(callable_, MEMOIZE_ATTRIBUTE, {'ttl' : ttl})
+		return callable_
+
+	return decorator if callable_ is None else decorator(callable_)
+
+def memoize_options(callable_):
+	'''Memoization options of a target
+	Get the options set with "memoize" (or via the attribute) for the target.
+
+	:param callable_: the target
+	:returns dict|None: the options or None if the target didn't opt in
+	'''
+
+	options = getattr(getattr(callable_, '__func__', callable_), MEMOIZE_ATTRIBUTE, None)
+	if options is True:
+		return {'ttl' : None}
+	elif not options:
+		return None
+	return {'ttl' : None} | dict(options)
+
+def _update_digest(digest, value):
+	'''Feed a value to a digest
+	Recursively feed a stable representation of the value: the type is always included, mapping items and set elements are sorted by their own digest so the order of insertion doesn't matter, and any other object is pickled.
+	'''
+
+	digest.update(type(value).__qualname__.encode('utf-8') + b':')
+	if (value is None) or isinstance(value, (bool, int, float, complex, str, bytes)):
+		digest.update(repr(value).encode('utf-8', errors='surrogateescape'))
+	elif isinstance(value, dict):
+		for item_digest in sorted(stable_digest(item) for item in value.items()):
+			digest.update(item_digest.encode('ascii'))
+	elif isinstance(value, (set, frozenset)):
+		for item_digest in sorted(stable_digest(item) for item in value):
+			digest.update(item_digest.encode('ascii'))
+	elif isinstance(value, (list, tuple)):
+		digest.update(str(len(value)).encode('ascii'))
+		for item in value:
+			_update_digest(digest, item)
+	else:
+		try:
+			digest.update(pickle_dumps(value, protocol=PICKLE_PROTOCOL))
+		except (AttributeError, PicklingError) as error:
+			raise TypeError('Unable to hash value of type "{}": {}'.format(type(value).__qualname__, error))
+	digest.update(b';')
+
+def stable_digest(value):
+	'''Stable hash of a value
+	Like the legacy "HashableInstance", it turns arbitrary argument structures into a key. Unlike "hash" it's stable across processes (it doesn't depend on the hash seed) so it can be used in a persistent cache.
+
+	:param value: the value to hash
+	:returns str: the hexadecimal digest of the value
+	:raises TypeError: if the value (or something in it) can't be hashed
+	'''
+
+	digest = sha256()
+	_update_digest(digest, value)
+	return digest.hexdigest()
+
+def code_hash(callable_):
+	'''Hash of the code of a target
+	Hash the compiled code of a function (or, for a class, of every function defined in it and its bases) so any change to it invalidates the memoized results. Objects without code (like builtins) are identified by their source file details instead.
+
+	:param callable_: the target
+	:returns str: the hexadecimal digest of the code
+	:raises TypeError: if there's no way to identify the code of the target
+	'''
+
+	functions = []
+	if isclass(callable_):
+		for class_ in callable_.__mro__[:-1]:
+			for name, member in sorted(vars(class_).items()):
+				member = getattr(member, '__func__', getattr(member, 'fget', member))
+				if hasattr(member, '__code__'):
+					functions.append((class_.__qualname__, name, member))
+	else:
+		function = getattr(callable_, '__func__', callable_)
+		try:
+			function = unwrap(function)
+		except ValueError:
+			pass
+		if hasattr(function, '__code__'):
+			functions.append(('', '', function))
+
+	digest = sha256()
+	if functions:
+		for class_name, name, function in functions:
+			digest.update('{}.{}:'.format(class_name, name).encode('utf-8'))
+			digest.update(marshal_dumps(function.__code__))
+	else:
+		source_key = source_cache_key(callable_)
+		if source_key is None:
+			raise TypeError('Unable to identify the code of: {}'.format(callable_))
+		digest.update(source_key.encode('utf-8', errors='surrogateescape'))
+	return digest.hexdigest()
+
+def result_key(callable_, args, kwargs):
+	'''Memoization key
+	Build the key of a call out of the qualified name of the target, the hash of its code, and the digest of its bound arguments.
+
+	:param callable_: the target
+	:param list args: the positional arguments of the call
+	:param dict kwargs: the keyword arguments of the call
+	:returns str: the key
+	:raises TypeError: if the target or the arguments can't be hashed
+	'''
+
+	name = '{}.{}'.format(getattr(callable_, '__module__', None), getattr(callable_, '__qualname__', getattr(callable_, '__name__', None)))
+	return '|'.join((name, code_hash(callable_), stable_digest((tuple(args), kwargs))))
+
+
+class ResultCache(DiskCache):
+	'''Memoized results on disk
+	A "DiskCache" storing results with an expiration time, evicting the least recently used results (by the modification time of their files, refreshed on every hit) once the total size goes beyond "max_size". Access is serialized across processes with a lock file, where file locking is available.
+	'''
+
+	def __init__(self, directory, namespace='', max_size=RESULTS_CACHE_SIZE):
+		'''Magic initialization
+		Store the details, the directory will be created on the first write.
+
+		:param directory: the path to the directory holding the cache files
+		:param str? namespace: a string added to every key, as in "DiskCache"
+		:param int max_size: the maximum amount of bytes of stored results
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__(directory, namespace=namespace)
+
+		self.max_size = max_size
+
+	@contextmanager
+	def lock(self, shared=False):
+		'''Lock the cache
+		Context manager holding the lock file of the cache directory, shared or exclusive. It's a no-op if file locking is not available or the lock can't be taken.
+
+		:param bool shared: take a shared lock (for reading) instead of an exclusive one
+		'''
+
+		if flock is None:
+			yield
+			return
+
+		try:
+			self.directory.mkdir(parents=True, exist_ok=True)
+			lock_file = open(self.directory / LOCK_FILE_NAME, 'ab')
+		except OSError as error:
+			LOGGER.warning('Unable to lock the cache "%s": %s', self.directory, error)
+			yield
+			return
+
+		with lock_file:
+			flock(lock_file, LOCK_SH if shared else LOCK_EX)
+			try:
+				yield
+			finally:
+				flock(lock_file, LOCK_UN)
+
+	def get(self, key, default=None):
+		'''Get a result from the cache
+		Load the result stored for the key, if it didn't expire, and mark it as recently used.
+
+		:param str key: the key of the result
+		:param default: the value to return if there's no valid result
+		:returns Any: the stored result or the default
+		'''
+
+		path = self._path_for(key)
+		with self.lock(shared=True):
+			entry = super().get(key, _MISSING)
+			if entry is _MISSING:
+				return default
+			expires_at, result = entry
+			if (expires_at is not None) and (expires_at <= time()):
+				LOGGER.debug('Expired result for: %s', key)
+				return default
+			try:
+				utime(path)
+			except OSError as error:
+				LOGGER.debug('Unable to refresh cache file "%s": %s', path, error)
+		return result
+
+	def set(self, key, value, ttl=None):
+		'''Store a result in the cache
+		Store the result with its expiration time and evict old results if the cache is too big.
+
+		:param str key: the key of the result
+		:param value: the result to store, it should be picklable
+		:param float? ttl: the amount of seconds the result stays valid, forever if None
+		:returns bool: True if the result was stored, False otherwise
+		'''
+
+		with self.lock():
+			stored = super().set(key, (None if ttl is None else time() + ttl, value))
+			if stored:
+				self.evict()
+		return stored
+
+	def evict(self):
+		'''Enforce the size limit
+		Remove the least recently used results until the total size is within "max_size". It should be called with the exclusive lock held.
+
+		:returns int: the amount of results removed
+		'''
+
+		entries, total_size = [], 0
+		for path in self.directory.glob('[!.]*' + CACHE_FILE_SUFFIX):
+			try:
+				file_stat = os_stat(path)
+			except OSError:
+				continue
+			entries.append((file_stat.st_mtime_ns, file_stat.st_size, path))
+			total_size += file_stat.st_size
+
+		removed = 0
+		for _, size, path in sorted(entries):
+			if total_size <= self.max_size:
+				break
+			path.unlink(missing_ok=True)
+			total_size -= size
+			removed += 1
+		if removed:
+			LOGGER.debug('Evicted %d results from "%s"', removed, self.directory)
+		return removed
+
+
+def execute_memoized(cache, callable_, args_w_keys={}, callable_metadata=None, parameters=None, plan=None, loop_factory=None, resolve_loop_factory=None, instance_pool=None):
+	'''Execute a callable, memoized
+	Like "execute_callable" but, if the callable opted in (see "memoize") and a cache is provided, the result is taken from the cache when available, or stored in it otherwise. The key is built from the bound arguments (as returned by "prepare_arguments"). Results that can't be pickled (like generators) are not stored.
+
+	Methods (bound or not) are never memoized, even if they opted in, since the key doesn't cover the state of their instance or the arguments of its constructor.
+
+	Asynchronous results are always resolved for memoized callables (on a loop from "resolve_loop_factory" if "loop_factory" is None) since coroutines can't be stored.
+
+	:param ResultCache? cache: the cache of the results, no memoization if None
+	:param callable_: the callable to execute
+	:param dict args_w_keys: the values for the callable parameters
+	:param dict? callable_metadata: the metadata of the callable, as returned by "object_metadata"
+	:param dict? parameters: the parameters of the callable, as returned by "parameters_from_callable"
+	:param tuple? plan: the result of "compile_arguments" for the parameters
+	:param Callable? loop_factory: the function creating the event loop, as in "execute_callable"
+	:param Callable? resolve_loop_factory: the function creating the event loop for the asynchronous results of memoized callables, a regular asyncio loop by default
+	:param InstancePool? instance_pool: the pool for the parent instances of instance methods, as in "execute_callable"
+	:returns Any: the result of the callable
+	'''
+
+	options = None if cache is None else memoize_options(callable_)
+	if (options is not None) and (ismethod(callable_) or (identify_callable(callable_)[0] not in (IS_CLASS, IS_FUNCTION))):
+		LOGGER.warning('Not memoizing "%s": only functions and classes can be memoized', getattr(callable_, '__qualname__', callable_))
+		options = None
+	if options is None:
+		return execute_callable(callable_, args_w_keys=args_w_keys, callable_metadata=callable_metadata, parameters=parameters, plan=plan, loop_factory=loop_factory, instance_pool=instance_pool)
+
+	if parameters is None:
+		callable_metadata, parameters = introspect_callable(callable_)
+	if plan is None:
+		plan = compile_arguments(parameters)
+	try:
+		key = result_key(callable_, *prepare_arguments(parameters, args_w_keys, plan=plan))
+	except TypeError as error:
+		LOGGER.debug('Not memoizing call to %s: %s', callable_, error)
+		key = None
+
+	if key is not None:
+		result = cache.get(key, _MISSING)
+		if result is not _MISSING:
+			return result
+
+	result = execute_callable(callable_, args_w_keys=args_w_keys, callable_metadata=callable_metadata, parameters=parameters, plan=plan, loop_factory=loop_factory or resolve_loop_factory or new_event_loop, instance_pool=instance_pool)
+	if key is not None:
+		cache.set(key, result, ttl=options['ttl'])
+	return result
@@ -0,0 +1,369 @@
+#! python
+'''Result output
+Write the results of the targets to the output stream. Iterators (sync or async) are streamed, item by item, as they're produced instead of being materialized first.
+'''
+
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from io import BytesIO
+from json import dumps as json_dumps
+from logging import getLogger
+from pickle import HIGHEST_PROTOCOL, dump as pickle_dump, dumps as pickle_dumps
+from time import perf_counter
+
+from ._async import collect_async_iterator, run_awaitable
+from ._background import BackgroundWriter
+from ._csv_stream import CSV_DIALECTS, RowsWriter, write_async_csv, write_csv
+from ._format import BoundedFormatter
+from ._json_stream import write_async_json, write_json
+from ._serializers import SERIALIZERS
+
+LOGGER = getLogger(__name__)
+
+OUTPUT_FORMATS = ('auto', 'lines', 'jsonl', 'json', 'csv', 'tsv', 'pickle', 'raw')
+FLUSH_INTERVAL = 0.05	#Seconds between flushes while streaming. The first item is always flushed right away.
+BUFFER_SLICE_SIZE = 1024 * 1024	#Bytes per write for buffer protocol results
+BUILTIN_CONTAINER_TYPES = (list, tuple, set, frozenset, dict)	#Formatted as they are by the "auto" format, without looking for a serializer
+
+
+class TextStreamAdapter:
+	'''Binary writes into a text stream
+	Decode the data and write it to the underlying text stream, for streams without a binary "buffer" (like io.StringIO).
+	'''
+
+	def __init__(self, stream, encoding='utf-8'):
+		'''Magic initialization
+		Store the details.
+
+		:param stream: the text stream to write into
+		:param str? encoding: the encoding of the data written
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.stream = stream
+		self.encoding = encoding
+
+	def write(self, data):
+		'''Write data
+		Decode the data and write it to the text stream.
+
+		:param bytes data: the data to write
+		:returns int: the amount of bytes written
+		'''
+
+		self.stream.write(bytes(data).decode(self.encoding, errors='backslashreplace'))
+		return len(data)
+
+	def flush(self):
+		'''Flush the stream
+		Forward the flush to the text stream.
+		'''
+
+		self.stream.flush()
+
+
+class IncrementalWriter:
+	'''Periodically flushed writer
+	Write encoded data into a binary stream, flushing it at most every FLUSH_INTERVAL seconds (and on the first write) so the output shows up promptly without paying a flush on every item.
+	'''
+
+	def __init__(self, stream, flush_interval=FLUSH_INTERVAL):
+		'''Magic initialization
+		Get the binary side of the stream.
+
+		:param stream: the (text) stream to write into, usually sys.stdout
+		:param float? flush_interval: the amount of seconds between flushes
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.encoding = getattr(stream, 'encoding', None) or 'utf-8'
+		buffer = getattr(stream, 'buffer', None)
+		if buffer is None:
+			self.stream = TextStreamAdapter(stream, encoding=self.encoding)
+		else:
+			stream.flush()
+			self.stream = buffer
+		self.flush_interval = flush_interval
+		self._last_flush = None
+
+	def __enter__(self):
+		'''Magic context entry
+		Nothing to do, returns the writer.
+		'''
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		'''Magic context exit
+		Flush whatever is pending.
+		'''
+
+		self.flush()
+
+	def write(self, data):
+		'''Write data
+		Write the data and flush if it's time to.
+
+		:param bytes data: the data to write
+		:returns None: nothing
+		'''
+
+		self.stream.write(data)
+		now = perf_counter()
+		if (self._last_flush is None) or ((now - self._last_flush) >= self.flush_interval):
+			self.stream.flush()
+			self._last_flush = now
+
+	def flush(self):
+		'''Flush the stream
+		Flush the underlying binary stream.
+		'''
+
+		self.stream.flush()
+		self._last_flush = perf_counter()
+
+
+@contextmanager
+def open_writer(stream, queue_depth=None):
+	'''Open a writer
+	Context manager yielding an "IncrementalWriter" for the stream or, if a queue depth is provided, a "simplifiedapp._background.BackgroundWriter" writing into it from a thread.
+
+	:param stream: the (text) stream to write into, usually sys.stdout
+	:param int? queue_depth: the size of the queue of the writer thread, no thread if not provided
+	'''
+
+	with IncrementalWriter(stream) as writer:
+		if queue_depth is None:
+			yield writer
+		else:
+			with BackgroundWriter(writer, queue_depth=queue_depth) as background_writer:
+				yield background_writer
+
+def raw_bytes(item, encoding='utf-8'):
+	'''Raw content of an item
+	Bytes-like items are used as they are, strings are encoded, and anything else is converted with "str" first.
+
+	:param item: the item to convert
+	:param str encoding: the encoding to use for text
+	:returns bytes: the content
+	'''
+
+	if isinstance(item, (bytes, bytearray, memoryview)):
+		return bytes(item)
+	return (item if isinstance(item, str) else str(item)).encode(encoding, errors='backslashreplace')
+
+def encode_item(item, format_='lines', encoding='utf-8'):
+	'''Encode a streamed item
+	Turn an item into a line: as a string for "lines" (bytes are written as they are), as a JSON document for "jsonl" (and "json"), or as a row for "csv" and "tsv" (as in "simplifiedapp._csv_stream.csv_row", without a header). Non JSON serializable values are converted with their serializer (as in "simplifiedapp._serializers.SERIALIZERS") or "str". The "pickle" and "raw" formats aren't line based: the item is pickled, or written as in "raw_bytes".
+
+	:param item: the item to encode
+	:param str format_: one of OUTPUT_FORMATS, except "auto"
+	:param str encoding: the encoding to use
+	:returns bytes: the encoded item, including the line ending for the line based formats
+	'''
+
+	if format_ in ('jsonl', 'json'):
+		line = json_dumps(SERIALIZERS.serialize_nested(item), default=SERIALIZERS.default)
+	elif format_ in CSV_DIALECTS:
+		output = BytesIO()
+		with RowsWriter(output, format_=format_, header=False, encoding=encoding) as rows:
+			rows.write_row(item)
+		return output.getvalue()
+	elif format_ == 'pickle':
+		return pickle_dumps(item, protocol=HIGHEST_PROTOCOL)
+	elif format_ == 'raw':
+		return raw_bytes(item, encoding=encoding)
+	elif isinstance(item, (bytes, bytearray)):
+		return bytes(item) + b'\n'
+	else:
+		line = item if isinstance(item, str) else str(item)
+	return (line + '\n').encode(encoding, errors='backslashreplace')
+
+def encode_record(result, format_='auto', encoding='utf-8'):
+	'''Encode a whole result as a line
+	Like "encode_item" but for a full result, which is used as a single record: iterators are materialized into a list and None becomes an empty line ("null" for "jsonl", nothing for "raw"). The "auto" format is encoded as "lines".
+
+	:param result: the result to encode
+	:param str format_: one of OUTPUT_FORMATS
+	:param str encoding: the encoding to use
+	:returns bytes: the encoded line, including the line ending
+	'''
+
+	line_format = 'lines' if format_ == 'auto' else format_
+	if isinstance(result, Iterator):
+		result = list(result)
+	if (result is None) and (line_format == 'lines'):
+		return b'\n'
+	elif (result is None) and (line_format == 'raw'):
+		return b''
+	return encode_item(result, format_=line_format, encoding=encoding)
+
+def stream_items(items, writer, format_='lines'):
+	'''Stream the items of an iterable
+	Write every item, as a line, as soon as it's produced.
+
+	:param Iterable items: the items to write
+	:param IncrementalWriter writer: the writer to use
+	:param str format_: either "lines" or "jsonl"
+	:returns int: the amount of items written
+	'''
+
+	count, encoding = 0, writer.encoding
+	for item in items:
+		writer.write(encode_item(item, format_=format_, encoding=encoding))
+		count += 1
+	LOGGER.debug('Streamed %d items', count)
+	return count
+
+async def stream_async_items(items, writer, format_='lines'):
+	'''Stream the items of an asynchronous iterable
+	Write every item, as a line, as soon as it's produced.
+
+	:param AsyncIterable items: the items to write
+	:param IncrementalWriter writer: the writer to use
+	:param str format_: either "lines" or "jsonl"
+	:returns int: the amount of items written
+	'''
+
+	count, encoding = 0, writer.encoding
+	async for item in items:
+		writer.write(encode_item(item, format_=format_, encoding=encoding))
+		count += 1
+	LOGGER.debug('Streamed %d items', count)
+	return count
+
+def is_buffer(result):
+	'''Buffer protocol detection
+	Check if the result exposes its content as raw bytes, like bytes, bytearray, memoryview, array.array, or mmap objects.
+
+	:param result: the result to check
+	:returns bool: True if a memoryview can be taken on the result
+	'''
+
+	try:
+		memoryview(result).release()
+	except TypeError:
+		return False
+	return True
+
+def write_buffer(result, writer, slice_size=BUFFER_SLICE_SIZE):
+	'''Write a buffer protocol object
+	Write the raw content of the object in slices of a memoryview, without copying or encoding it. Non contiguous buffers are copied into a contiguous one first.
+
+	:param result: the buffer protocol object
+	:param IncrementalWriter writer: the writer to use
+	:param int slice_size: the amount of bytes per write
+	:returns int: the amount of bytes written
+	'''
+
+	with memoryview(result) as view:
+		if not view.c_contiguous:
+			LOGGER.debug('Non contiguous buffer, copying it first')
+			view = memoryview(view.tobytes())
+		with view.cast('B') as data:
+			for offset in range(0, data.nbytes, slice_size):
+				with data[offset:offset + slice_size] as chunk:
+					writer.write(chunk)
+			LOGGER.debug('Wrote a buffer of %d bytes', data.nbytes)
+			return data.nbytes
+
+def is_streamable(result, format_='auto'):
+	'''Should the result be streamed
+	Iterators (sync or async) are always streamed. With an explicit line based format, any other iterable (except strings, bytes and mappings) is streamed too. Nothing is streamed as lines with the "json" format, the whole result is a single document.
+
+	:param result: the result to check
+	:param str format_: one of OUTPUT_FORMATS
+	:returns bool: True if the result should be written item by item
+	'''
+
+	if format_ == 'json':
+		return False
+	if isinstance(result, (Iterator, AsyncIterator)):
+		return True
+	if format_ == 'auto':
+		return False
+	return isinstance(result, Iterable) and not isinstance(result, (str, bytes, bytearray, Mapping))
+
+def write_result(result, stream, format_='auto', loop_factory=None, width=80, max_depth=None, max_items=None, max_bytes=None, columns=None, queue_depth=None):
+	'''Write the result of a target
+	Awaitables are awaited first (on a loop from "loop_factory"). With the "json" format the result is written as a single JSON document, in chunks (iterators, sync or async, become arrays). With the "pickle" format the result is pickled as a whole (iterators are materialized into lists) and with "csv" or "tsv" it's written as rows (as in "simplifiedapp._csv_stream.write_csv"), streaming iterators. Buffer protocol results (as in "is_buffer") are written as they are with the "auto" and "raw" formats, without copies (as in "write_buffer"). Streamable results (as in "is_streamable") are written item by item. With the "auto" format objects with a serializer (as in "simplifiedapp._serializers.SERIALIZERS") are serialized first, then strings are written as they are and everything else is formatted with "simplifiedapp._format.BoundedFormatter", within the limits; the line based formats write the result as a single line.
+
+	:param result: the result to write
+	:param stream: the text stream to write into, usually sys.stdout
+	:param str format_: one of OUTPUT_FORMATS
+	:param Callable? loop_factory: the function creating event loops, as in "simplifiedapp._async.event_loop_factory"
+	:param int width: the width of the lines for the "auto" format
+	:param int? max_depth: the maximum nesting level shown by the "auto" format
+	:param int? max_items: the maximum amount of items per container shown by the "auto" format
+	:param int? max_bytes: the maximum size of the output of the "auto" format, in bytes
+	:param list? columns: the columns for the "csv" and "tsv" formats, inferred from the first row if not provided
+	:param int? queue_depth: write from a thread with a queue of this size, as in "open_writer"
+	:returns None: nothing
+	'''
+
+	if format_ not in OUTPUT_FORMATS:
+		raise ValueError('Unknown output format: {}'.format(format_))
+	line_format = 'lines' if format_ == 'auto' else format_
+
+	if format_ == 'json':
+		LOGGER.debug('Writing the result as a JSON document.')
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			if isinstance(result, AsyncIterator):
+				run_awaitable(write_async_json(result, writer), loop_factory=loop_factory)
+			else:
+				if hasattr(result, '__await__'):
+					result = run_awaitable(result, loop_factory=loop_factory)
+				write_json(result, writer)
+		return
+	elif isinstance(result, AsyncIterator):
+		if format_ in CSV_DIALECTS:
+			LOGGER.debug('The result is an asynchronous iterator. Streaming it as %s rows.', format_)
+			with open_writer(stream, queue_depth=queue_depth) as writer:
+				run_awaitable(write_async_csv(result, writer, format_=format_, columns=columns), loop_factory=loop_factory)
+			return
+		elif format_ == 'pickle':
+			LOGGER.debug('The result is an asynchronous iterator. Gathering it.')
+			result = run_awaitable(collect_async_iterator(result), loop_factory=loop_factory)
+		else:
+			LOGGER.debug('The result is an asynchronous iterator. Streaming it as %s.', line_format)
+			with open_writer(stream, queue_depth=queue_depth) as writer:
+				run_awaitable(stream_async_items(result, writer, format_=line_format), loop_factory=loop_factory)
+			return
+	elif hasattr(result, '__await__'):
+		LOGGER.debug('The result is an awaitable. Running it.')
+		result = run_awaitable(result, loop_factory=loop_factory)
+
+	if (format_ == 'auto') and (type(result) not in BUILTIN_CONTAINER_TYPES):	#Subclasses (like named tuples) could have a serializer
+		result = SERIALIZERS.serialize(result)
+
+	if (format_ in ('auto', 'raw')) and is_buffer(result):
+		LOGGER.debug('The result is a buffer. Writing it as is.')
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			write_buffer(result, writer)
+	elif format_ == 'pickle':
+		LOGGER.debug('Pickling the result.')
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			pickle_dump(list(result) if isinstance(result, Iterator) else result, writer, protocol=HIGHEST_PROTOCOL)
+	elif format_ in CSV_DIALECTS:
+		LOGGER.debug('Writing the result as %s rows.', format_)
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			write_csv(result, writer, format_=format_, columns=columns)
+	elif is_streamable(result, format_=format_):
+		LOGGER.debug('The result is iterable. Streaming it as %s.', line_format)
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			stream_items(result, writer, format_=line_format)
+	elif format_ != 'auto':
+		LOGGER.debug('Writing the result as a single %s item.', line_format)
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			writer.write(encode_item(result, format_=line_format, encoding=writer.encoding))
+	elif isinstance(result, str):
+		LOGGER.debug('The result is a string. Printing it as is.')
+		stream.write(result)
+	else:
+		LOGGER.debug('The result is an object. Formatting it.')
+		with open_writer(stream, queue_depth=queue_depth) as writer:
+			BoundedFormatter(width=width, max_depth=max_depth, max_items=max_items, max_bytes=max_bytes).write(result, writer)
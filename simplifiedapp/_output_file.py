@@ -0,0 +1,136 @@
+#! python
+'''Output files
+Write the output into a file atomically: the content goes into a temporary file, in the same directory, which is renamed to its final name only once it's complete. Compression is picked by the extension of the file.
+'''
+
+from bz2 import open as bz2_open
+from contextlib import contextmanager, nullcontext
+from gzip import open as gzip_open
+from io import BufferedWriter, RawIOBase, TextIOWrapper
+from logging import getLogger
+from lzma import open as lzma_open
+from os import O_CREAT, O_EXCL, O_WRONLY, open as os_open, replace as os_replace
+from pathlib import Path
+from secrets import token_hex
+import sys
+
+LOGGER = getLogger(__name__)
+
+BUFFER_SIZE = 1024 * 1024	#Bytes buffered before handing the data to the compressor or the file
+COMPRESSORS = {
+	'.bz2'	: bz2_open,
+	'.gz'	: gzip_open,
+	'.xz'	: lzma_open,
+}
+TEMPORARY_FILE_MODE = 0o666	#Before the umask, like any regular file
+
+
+class AtomicFile(RawIOBase):
+	'''Atomically written file
+	Raw binary stream writing into a temporary file (through a compressor, if the extension asks for one) which replaces the final file on "commit" or is removed on "discard". Flushing is a no-op: partial content is never handed to the compressor or the file before it's needed.
+	'''
+
+	def __init__(self, path):
+		'''Magic initialization
+		Create the temporary file and the compressor.
+
+		:param path: the path of the final file
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.path = Path(path)
+		self.temporary_path = self.path.with_name('.{}.{}.part'.format(self.path.name, token_hex(4)))
+		self._file = open(os_open(self.temporary_path, O_WRONLY | O_CREAT | O_EXCL, TEMPORARY_FILE_MODE), 'wb', buffering=0)
+		compressor = COMPRESSORS.get(self.path.suffix.lower())
+		self._stream = self._file if compressor is None else compressor(self._file, mode='wb')
+		LOGGER.debug('Writing "%s" through "%s"', self.path, self.temporary_path)
+
+	def writable(self):
+		'''Writable stream
+		Always.
+		'''
+
+		return True
+
+	def write(self, data):
+		'''Write data
+		Write the data into the compressor or the temporary file.
+
+		:param bytes data: the data to write
+		:returns int: the amount of bytes written
+		'''
+
+		return self._stream.write(data)
+
+	def flush(self):
+		'''Flush the stream
+		Nothing to do, the data is flushed on "commit".
+		'''
+
+		pass
+
+	def commit(self):
+		'''Complete the file
+		Finish the compression, close the temporary file and rename it to the final name.
+
+		:returns None: nothing
+		'''
+
+		if self._stream is not self._file:
+			self._stream.close()
+		self._file.close()
+		os_replace(self.temporary_path, self.path)
+		LOGGER.debug('Wrote "%s"', self.path)
+		super().close()
+
+	def discard(self):
+		'''Drop the file
+		Close and remove the temporary file, leaving any existing final file untouched.
+
+		:returns None: nothing
+		'''
+
+		try:
+			if self._stream is not self._file:
+				self._stream.close()
+		finally:
+			self._file.close()
+			self.temporary_path.unlink(missing_ok=True)
+			LOGGER.debug('Discarded "%s"', self.temporary_path)
+			super().close()
+
+
+@contextmanager
+def open_output_file(path, encoding='utf-8', buffer_size=BUFFER_SIZE):
+	'''Open an output file
+	Context manager yielding a text stream (with a binary "buffer", like sys.stdout) writing into an "AtomicFile". The file shows up, complete, when the context exits cleanly and it's discarded if there's an exception.
+
+	:param path: the path of the file, compressed if it ends in ".gz", ".bz2", or ".xz"
+	:param str encoding: the encoding of the text written
+	:param int buffer_size: the amount of bytes buffered before writing into the file
+	'''
+
+	raw = AtomicFile(path)
+	stream = TextIOWrapper(BufferedWriter(raw, buffer_size=buffer_size), encoding=encoding, errors='backslashreplace')
+	try:
+		yield stream
+		stream.detach().detach()	#Flushes the text and buffered layers, so they don't try to write into the closed file later
+	except BaseException:
+		raw.discard()
+		raise
+	raw.commit()
+
+def open_output(path=None, stream=None):
+	'''Open the output
+	Get a context manager for the output stream: the file at the path, as in "open_output_file", or the provided stream (sys.stdout by default), left open, if there's no path.
+
+	:param path: the path of the output file, if any
+	:param stream: the text stream to use if there's no path
+	:returns ContextManager: the context manager yielding the text stream
+	'''
+
+	if path is None:
+		return nullcontext(sys.stdout if stream is None else stream)
+	return open_output_file(path)
@@ -0,0 +1,151 @@
+#! python
+'''Instance pool
+Reuse the parent instances of instance methods across calls, instead of running an expensive "__init__" every time.
+'''
+
+from collections import OrderedDict
+from collections.abc import Mapping, Set
+from logging import getLogger
+from threading import RLock
+
+LOGGER = getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+
+
+def hashable_key(value):
+	'''Hashable version of a value
+	Turn a value (usually the arguments of a call) into an equivalent hashable one: mappings, sets, lists, and tuples are converted recursively. The type is always part of the key so, for example, a list and a tuple with the same items (or 1 and True) don't collide.
+
+	:param value: the value to convert
+	:returns Hashable: the key for the value
+	:raises TypeError: if the value (or something in it) can't be made hashable
+	'''
+
+	if isinstance(value, Mapping):
+		return type(value).__qualname__, frozenset((hashable_key(key), hashable_key(item)) for key, item in value.items())
+	elif isinstance(value, (Set, frozenset)):
+		return type(value).__qualname__, frozenset(hashable_key(item) for item in value)
+	elif isinstance(value, (list, tuple)):
+		return type(value).__qualname__, tuple(hashable_key(item) for item in value)
+
+	hash(value)
+	return type(value).__qualname__, value
+
+def close_instance(instance):
+	'''Release an instance
+	Call the "close" method of the instance or, if it doesn't have one, its "__exit__" (as a context manager leaving without errors). Errors are logged and ignored.
+
+	:param instance: the instance to release
+	:returns None: nothing
+	'''
+
+	try:
+		if callable(getattr(instance, 'close', None)):
+			instance.close()
+		elif callable(getattr(instance, '__exit__', None)):
+			instance.__exit__(None, None, None)
+	except Exception as error:
+		LOGGER.warning('Unable to close instance %s: %s', instance, error)
+
+
+class InstancePool:
+	'''LRU of class instances
+	Instances are keyed by their class and their constructor arguments (as in "hashable_key"). The least recently used instance is released (as in "close_instance") when the pool is full. Instances with arguments that can't be made hashable are not pooled.
+
+	The pool can be used as a context manager, releasing every instance on exit.
+	'''
+
+	def __init__(self, max_size=DEFAULT_POOL_SIZE):
+		'''Magic initialization
+		Create the empty pool.
+
+		:param int? max_size: the maximum amount of instances kept
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		if max_size < 1:
+			raise ValueError('The pool size should be positive, got: {}'.format(max_size))
+		self.max_size = max_size
+		self._instances = OrderedDict()
+		self._lock = RLock()
+
+	def __enter__(self):
+		'''Magic context entry
+		Nothing to do, returns the pool.
+		'''
+
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		'''Magic context exit
+		Release every instance.
+		'''
+
+		self.clear()
+
+	def __len__(self):
+		'''Magic length
+		The amount of pooled instances.
+		'''
+
+		return len(self._instances)
+
+	def __repr__(self):
+		'''Magic representation
+		Simple representation of the object
+		'''
+
+		return '{}(max_size={}) with {} instances'.format(type(self).__name__, self.max_size, len(self))
+
+	def clear(self):
+		'''Empty the pool
+		Release and forget every instance.
+
+		:returns None: nothing
+		'''
+
+		with self._lock:
+			instances, self._instances = list(self._instances.values()), OrderedDict()
+		for instance in instances:
+			close_instance(instance)
+
+	def get(self, class_, args=(), kwargs={}):
+		'''Get an instance
+		Return the pooled instance for the class and the arguments, or create (and pool) a new one.
+
+		:param type class_: the class to instantiate
+		:param tuple args: the positional arguments for the constructor
+		:param dict kwargs: the keyword arguments for the constructor
+		:returns Any: the instance
+		'''
+
+		try:
+			key = class_, hashable_key(tuple(args)), hashable_key(dict(kwargs))
+		except TypeError as error:
+			LOGGER.debug('Not pooling instance of %s: %s', class_, error)
+			return class_(*args, **kwargs)
+
+		with self._lock:
+			if key in self._instances:
+				self._instances.move_to_end(key)
+				return self._instances[key]
+
+		instance = class_(*args, **kwargs)
+		evicted = []
+		with self._lock:
+			if key in self._instances:
+				evicted.append(instance)
+				instance = self._instances[key]
+				self._instances.move_to_end(key)
+			else:
+				self._instances[key] = instance
+				while len(self._instances) > self.max_size:
+					evicted.append(self._instances.popitem(last=False)[1])
+		for evicted_instance in evicted:
+			LOGGER.debug('Releasing pooled instance: %s', evicted_instance)
+			close_instance(evicted_instance)
+
+		return instance
@@ -0,0 +1,146 @@
+#! python
+'''Result serializers
+Registry of functions turning the objects of a type into plain values (strings, numbers, lists, and dicts) for the output, with the choice cached per type.
+'''
+
+from dataclasses import fields, is_dataclass
+from datetime import date, time
+from decimal import Decimal
+from enum import Enum
+from logging import getLogger
+from pathlib import PurePath
+from uuid import UUID
+
+LOGGER = getLogger(__name__)
+
+
+def serialize_dataclass(value):
+	'''Dataclass serializer
+	A dict with the fields of the dataclass instance. Unlike "dataclasses.asdict" it's shallow: the values are serialized on their own.
+
+	:param value: the dataclass instance
+	:returns dict: the fields and their values
+	'''
+
+	return {field.name : getattr(value, field.name) for field in fields(value)}
+
+def serialize_isoformat(value):
+	'''Date and time serializer
+	The ISO 8601 representation of the value.
+
+	:param value: the date, datetime, or time
+	:returns str: the ISO 8601 string
+	'''
+
+	return value.isoformat()
+
+
+class SerializerRegistry:
+	'''Serializers per type
+	Map types to the functions serializing their instances. The serializer of a type is the one registered for the closest class in its MRO (dataclasses without one get "serialize_dataclass") and the result of that search is cached, so picking the serializer of an object is a dict lookup. Registering a serializer clears the cache.
+	'''
+
+	def __init__(self):
+		'''Magic initialization
+		Start empty.
+
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self._serializers = {}
+		self._dispatch_cache = {}
+
+	def __contains__(self, type_):
+		'''Magic membership
+		Check if there's a serializer for the type.
+		'''
+
+		return self.lookup(type_) is not None
+
+	def register(self, type_, serializer=None):
+		'''Register a serializer
+		Set the serializer for the instances of the type (and its subclasses). Can be used as a decorator if the serializer is not provided.
+
+		:param type type_: the type to register the serializer for
+		:param Callable? serializer: a function taking an instance and returning a plain value
+		:returns Callable: the serializer
+		'''
+
+		if serializer is None:
+			return lambda serializer: self.register(type_, serializer)
+
+		LOGGER.debug('Registering serializer for "%s": %s', type_, serializer)
+		self._serializers[type_] = serializer
+		self._dispatch_cache.clear()
+		return serializer
+
+	def lookup(self, type_):
+		'''Serializer for a type
+		Get the serializer for the type, as explained in the class.
+
+		:param type type_: the type to get the serializer for
+		:returns Callable|None: the serializer or None if there's none
+		'''
+
+		try:
+			return self._dispatch_cache[type_]
+		except KeyError:
+			pass
+
+		serializer = next((self._serializers[class_] for class_ in type_.__mro__ if class_ in self._serializers), None)
+		if (serializer is None) and is_dataclass(type_):
+			serializer = serialize_dataclass
+		self._dispatch_cache[type_] = serializer
+		return serializer
+
+	def serialize(self, value):
+		'''Serialize a value
+		Apply the serializer of the type of the value, if any.
+
+		:param value: the value to serialize
+		:returns Any: the serialized value, or the value itself if there's no serializer for it
+		'''
+
+		serializer = self.lookup(type(value))
+		return value if serializer is None else serializer(value)
+
+	def serialize_nested(self, value):
+		'''Serialize a value and its content
+		Like "serialize", but applied to the items of the (serialized) lists, tuples, and dicts too. Their subclasses without a serializer (like named tuples) become plain lists and dicts, so every JSON encoder produces the same document. Meant for small values, the containers are rebuilt.
+
+		:param value: the value to serialize
+		:returns Any: the serialized value
+		'''
+
+		value = self.serialize(value)
+		if isinstance(value, dict):
+			return {key : self.serialize_nested(item) for key, item in value.items()}
+		elif isinstance(value, (list, tuple)):
+			return [self.serialize_nested(item) for item in value]
+		return value
+
+	def default(self, value):
+		'''JSON default hook
+		Like "serialize" but converting the values without a serializer with "str", to be used as the "default" of the JSON encoders.
+
+		:param value: the value the encoder doesn't know about
+		:returns Any: the serialized value
+		'''
+
+		serializer = self.lookup(type(value))
+		return str(value) if serializer is None else serializer(value)
+
+
+SERIALIZERS = SerializerRegistry()
+SERIALIZERS.register(date, serialize_isoformat)
+SERIALIZERS.register(time, serialize_isoformat)
+SERIALIZERS.register(Decimal, str)
+SERIALIZERS.register(Enum, lambda value: value.value)
+SERIALIZERS.register(frozenset, list)
+SERIALIZERS.register(PurePath, str)
+SERIALIZERS.register(set, list)
+SERIALIZERS.register(UUID, str)
+
+register_serializer = SERIALIZERS.register
@@ -0,0 +1,338 @@
+#! python
+'''Warm daemon
+Serve the runs of a target over a Unix domain socket, from a process that already imported and introspected the target and built its parser. A tiny client forwards the arguments, the environment, and the working directory, and streams back the output and the exit code.
+
+The protocol is simple: the client sends a length prefixed JSON request and the server answers with a sequence of frames (a channel byte, the length of the payload, and the payload) for the stdout and stderr data, ending with the exit frame. The standard input is not forwarded.
+'''
+
+from io import BufferedWriter, RawIOBase, TextIOWrapper
+from json import dumps as json_dumps, loads as json_loads
+from logging import getLogger, root as root_logger
+from os import _exit as os_exit, chdir, environ, fork, getcwd, kill, umask, wait as os_wait
+from pathlib import Path
+from signal import SIGTERM, signal
+from socket import AF_UNIX, SOCK_STREAM, socket
+from struct import Struct
+from traceback import print_exc
+import sys
+
+from ._pool import InstancePool
+
+LOGGER = getLogger(__name__)
+
+REQUEST_HEADER = Struct('>I')
+RESPONSE_FRAME = Struct('>cI')
+EXIT_CODE = Struct('>i')
+CHANNEL_STDOUT, CHANNEL_STDERR, CHANNEL_EXIT = b'o', b'e', b'x'
+SOCKET_MODE = 0o600	#Only the owner of the daemon can run the target through it
+REQUEST_FIELDS = {'argv' : list, 'env' : dict, 'cwd' : str}
+LISTEN_BACKLOG = 64
+
+
+class ChannelWriter(RawIOBase):
+	'''Socket channel
+	Raw binary stream sending every write as a response frame for the channel.
+	'''
+
+	def __init__(self, connection, channel):
+		'''Magic initialization
+		Store the details.
+
+		:param socket connection: the client connection
+		:param bytes channel: the channel of the frames
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.connection = connection
+		self.channel = channel
+
+	def writable(self):
+		'''Writable stream
+		Always.
+		'''
+
+		return True
+
+	def write(self, data):
+		'''Write data
+		Send the data as a frame.
+
+		:param bytes data: the data to send
+		:returns int: the amount of bytes written
+		'''
+
+		data = bytes(data)
+		if data:
+			self.connection.sendall(RESPONSE_FRAME.pack(self.channel, len(data)) + data)
+		return len(data)
+
+
+def receive_exactly(connection, size):
+	'''Receive from the socket
+	Read exactly "size" bytes from the connection.
+
+	:param socket connection: the connection to read from
+	:param int size: the amount of bytes to read
+	:returns bytes: the data
+	'''
+
+	chunks, remaining = [], size
+	while remaining:
+		chunk = connection.recv(remaining)
+		if not chunk:
+			raise ConnectionError('Connection closed with {} bytes pending'.format(remaining))
+		chunks.append(chunk)
+		remaining -= len(chunk)
+	return b''.join(chunks)
+
+def channel_stream(connection, channel):
+	'''Text stream for a channel
+	Build a text stream (with a binary "buffer", like sys.stdout) sending its content to the client.
+
+	:param socket connection: the client connection
+	:param bytes channel: the channel of the frames
+	:returns TextIOWrapper: the stream
+	'''
+
+	return TextIOWrapper(BufferedWriter(ChannelWriter(connection, channel)), encoding='utf-8', errors='backslashreplace', line_buffering=(channel == CHANNEL_STDERR))
+
+def reset_logging(handlers=(), level=None):
+	'''Replace the logging handlers
+	Drop the handlers of the root logger so the next run configures logging again, with its own stderr, or restore the provided ones.
+
+	:param Iterable handlers: the handlers to add to the root logger
+	:param int? level: the level of the root logger, unchanged if None
+	:returns None: nothing
+	'''
+
+	for handler in root_logger.handlers[:]:
+		root_logger.removeHandler(handler)
+	for handler in handlers:
+		root_logger.addHandler(handler)
+	if level is not None:
+		root_logger.setLevel(level)
+
+def check_request(request):
+	'''Validate a request
+	Check that the request has the expected fields, with the expected types.
+
+	:param request: the decoded request
+	:returns None: nothing, it raises ValueError if the request is invalid
+	'''
+
+	if not isinstance(request, dict):
+		raise ValueError('The request should be a mapping, got: {}'.format(type(request).__name__))
+	for field, type_ in REQUEST_FIELDS.items():
+		if not isinstance(request.get(field), type_):
+			raise ValueError('The "{}" field of the request should be a {}'.format(field, type_.__name__))
+	if not all(isinstance(value, str) for value in request['argv']):
+		raise ValueError('The arguments of the request should be strings')
+	if not all(isinstance(key, str) and isinstance(value, str) for key, value in request['env'].items()):
+		raise ValueError('The environment of the request should map strings to strings')
+
+def split_client_argv(argv):
+	'''Split the client arguments
+	Take the options of the client itself ("--socket") out of the beginning of the arguments and leave the rest, verbatim, for the target. The first argument that is not a client option (or a "--" separator, which is dropped) starts the arguments of the target, so options like "--help" are forwarded too.
+
+	:param list argv: the arguments after the "client" command
+	:returns tuple: the path of the socket and the arguments for the target
+	'''
+
+	socket_path, argv = None, list(argv)
+	while argv:
+		if argv[0] == '--socket':
+			if len(argv) < 2:
+				raise ValueError('"--socket" requires the path of the daemon socket')
+			socket_path, argv = argv[1], argv[2:]
+		elif argv[0].startswith('--socket='):
+			socket_path, argv = argv[0].partition('=')[2], argv[1:]
+		elif argv[0] == '--':
+			argv = argv[1:]
+			break
+		else:
+			break
+	if socket_path is None:
+		raise ValueError('the path of the daemon socket is required, as "--socket PATH" before the arguments of the target')
+	return socket_path, argv
+
+def handle_connection(connection, target, parser_cache, instance_pool=None):
+	'''Serve a request
+	Run "simplifiedapp.main" for the request, with the environment, working directory, and standard streams of the client, and send the exit code. The state of the process is restored afterwards. An invalid request (or one that can't be set up, like with a missing working directory) is reported to the client with exit code 2.
+
+	:param socket connection: the client connection
+	:param target: the target of the daemon, as returned by "get_target"
+	:param dict parser_cache: the parsers reused across the requests
+	:param InstancePool? instance_pool: the parent instances of instance methods reused across the requests
+	:returns int: the exit code of the run
+	'''
+
+	from . import main
+
+	request = json_loads(receive_exactly(connection, REQUEST_HEADER.unpack(receive_exactly(connection, REQUEST_HEADER.size))[0]))
+
+	stdout, stderr = channel_stream(connection, CHANNEL_STDOUT), channel_stream(connection, CHANNEL_STDERR)
+	saved_streams, saved_environment, saved_cwd = (sys.stdout, sys.stderr), environ.copy(), getcwd()
+	saved_logging = root_logger.handlers[:], root_logger.level
+	reset_logging()
+	try:
+		try:
+			check_request(request)
+			LOGGER.debug('Serving request: %s', request['argv'])
+			environ.clear()
+			environ.update(request['env'])
+			chdir(request['cwd'])
+		except (OSError, ValueError) as error:
+			LOGGER.warning('Rejecting request: %s', error)
+			print('Unable to serve the request: {}'.format(error), file=stderr)
+			exit_code = 2
+		else:
+			sys.stdout, sys.stderr = stdout, stderr
+			try:
+				main(target, list(request['argv']), parser_cache=parser_cache, instance_pool=instance_pool)
+				exit_code = 0
+			except SystemExit as exit_:
+				if (exit_.code is None) or isinstance(exit_.code, int):
+					exit_code = exit_.code or 0
+				else:
+					print(exit_.code, file=stderr)
+					exit_code = 1
+			except Exception:
+				print_exc(file=stderr)
+				exit_code = 1
+		finally:
+			stdout.flush()
+			stderr.flush()
+	finally:
+		sys.stdout, sys.stderr = saved_streams
+		environ.clear()
+		environ.update(saved_environment)
+		chdir(saved_cwd)
+		reset_logging(*saved_logging)
+
+	connection.sendall(RESPONSE_FRAME.pack(CHANNEL_EXIT, EXIT_CODE.size) + EXIT_CODE.pack(exit_code))
+	return exit_code
+
+def warm_up(target):
+	'''Prepare the target
+	Import and introspect the target and build its parser (as "main" would without input files), including every subcommand of a module.
+
+	:param target: the target or its name, as supported by "get_target"
+	:returns tuple: the target and the parser cache
+	'''
+
+	from . import IntrospectedArgumentParser, build_target_parser
+	from ._introspection import get_target
+
+	target, target_type = get_target(target=target)
+	base_parser = IntrospectedArgumentParser.new_base_parser()
+	parser_cache = {}
+	parser, _, _ = build_target_parser(target, target_type, base_parser, parser_cache=parser_cache)
+	if parser._subparsers is not None:
+		for subparsers in parser._subparsers._group_actions:
+			for name in subparsers.choices:
+				subparsers.choices[name]
+	LOGGER.debug('Warmed up target: %s', target)
+	return target, parser_cache
+
+def serve(target, socket_path, workers=0):
+	'''Run the daemon
+	Warm the target up and serve requests on the socket until terminated. The parent instances of instance methods are pooled for the whole life of the daemon. Without workers the requests are served one by one in the daemon process. With workers, that many processes are preforked from the warm daemon, each serving a single request (isolating it) and being replaced afterwards.
+
+	:param target: the target or its name, as supported by "get_target"
+	:param str socket_path: the path of the Unix domain socket, a stale one will be replaced
+	:param int workers: the amount of preforked workers, 0 to serve in the daemon process
+	:returns None: nothing
+	'''
+
+	target, parser_cache = warm_up(target)
+	instance_pool = InstancePool()
+
+	socket_path = Path(socket_path)
+	if socket_path.is_socket():
+		socket_path.unlink()
+	listener = socket(AF_UNIX, SOCK_STREAM)
+	previous_umask = umask(0o777 & ~SOCKET_MODE)	#The socket is created with the final permissions, there's no window with broader ones
+	try:
+		listener.bind(str(socket_path))
+	finally:
+		umask(previous_umask)
+	listener.listen(LISTEN_BACKLOG)
+	LOGGER.info('Serving %s on %s', target, socket_path)
+
+	children = set()
+	def terminate(signal_number, frame):
+		raise SystemExit(0)
+	signal(SIGTERM, terminate)
+
+	def serve_one():
+		connection, _ = listener.accept()
+		with connection:
+			try:
+				handle_connection(connection, target, parser_cache, instance_pool)
+			except (KeyError, OSError, ValueError) as error:
+				LOGGER.warning('Dropping request: %s', error)
+
+	def spawn():
+		pid = fork()
+		if pid:
+			children.add(pid)
+			return
+		exit_code = 0
+		try:
+			signal(SIGTERM, lambda signal_number, frame: os_exit(0))
+			serve_one()
+		except BaseException:
+			exit_code = 1
+		finally:
+			os_exit(exit_code)
+
+	try:
+		if workers:
+			for _ in range(workers):
+				spawn()
+			while True:
+				pid, _ = os_wait()
+				children.discard(pid)
+				spawn()
+		else:
+			while True:
+				serve_one()
+	finally:
+		for pid in children:
+			try:
+				kill(pid, SIGTERM)
+			except ProcessLookupError:
+				pass
+		listener.close()
+		if socket_path.is_socket():
+			socket_path.unlink()
+		instance_pool.clear()
+
+def run_client(socket_path, argv, stdout=None, stderr=None):
+	'''Run through the daemon
+	Send the arguments, the environment, and the working directory to the daemon and stream its output back.
+
+	:param str socket_path: the path of the daemon socket
+	:param list argv: the arguments for the target
+	:param stdout: the binary stream for the standard output, sys.stdout.buffer by default
+	:param stderr: the binary stream for the standard error, sys.stderr.buffer by default
+	:returns int: the exit code of the run
+	'''
+
+	stdout = sys.stdout.buffer if stdout is None else stdout
+	stderr = sys.stderr.buffer if stderr is None else stderr
+	request = json_dumps({'argv' : list(argv), 'env' : dict(environ), 'cwd' : getcwd()}).encode('utf-8')
+
+	with socket(AF_UNIX, SOCK_STREAM) as connection:
+		connection.connect(str(socket_path))
+		connection.sendall(REQUEST_HEADER.pack(len(request)) + request)
+		while True:
+			channel, size = RESPONSE_FRAME.unpack(receive_exactly(connection, RESPONSE_FRAME.size))
+			payload = receive_exactly(connection, size)
+			if channel == CHANNEL_EXIT:
+				return EXIT_CODE.unpack(payload)[0]
+			stream = stdout if channel == CHANNEL_STDOUT else stderr
+			stream.write(payload)
+			stream.flush()
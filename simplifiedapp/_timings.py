@@ -0,0 +1,105 @@
+#! python
+'''Phase timings
+Measure how long each phase of a run takes, to find out where the startup time goes without attaching a profiler.
+'''
+
+from contextlib import contextmanager, nullcontext
+from json import dumps as json_dumps
+from logging import getLogger
+from time import perf_counter
+
+LOGGER = getLogger(__name__)
+
+TIMINGS_FORMATS = ('text', 'json')
+
+
+class PhaseTimer:
+	'''Wall clock time per phase
+	Accumulates the time spent on named phases, in the order they are first entered. A phase entered more than once accumulates the time of every run. Phases entered inside another one (like the introspection of a subcommand done while parsing the arguments) are not counted in the outer one, so the phases add up to (at most) the total.
+	'''
+
+	def __init__(self):
+		'''Magic initialization
+		Start the clock for the total.
+
+		:returns None: init shouldn't return anything
+		'''
+
+		super().__init__()
+
+		self.phases = {}
+		self.started = perf_counter()
+		self._nested = []
+
+	def __repr__(self):
+		'''Magic representation
+		Simple representation of the object
+		'''
+
+		return '{}({})'.format(type(self).__name__, ', '.join(self.phases))
+
+	@contextmanager
+	def phase(self, name):
+		'''Time a phase
+		Context manager that adds the time spent in its body (minus the one of the phases entered inside it) to the named phase, even if the body raises.
+
+		:param str name: the name of the phase
+		:returns Iterator: the context manager
+		'''
+
+		self.phases.setdefault(name, 0.0)
+		start = perf_counter()
+		self._nested.append(0.0)
+		try:
+			yield
+		finally:
+			elapsed = perf_counter() - start
+			self.phases[name] += elapsed - self._nested.pop()
+			if self._nested:
+				self._nested[-1] += elapsed
+
+	def record(self):
+		'''Timings record
+		The phases and the total (since the timer creation) in milliseconds.
+
+		:returns dict: a mapping with the "phases" mapping and the "total"
+		'''
+
+		return {
+			'phases' : {name : round(elapsed * 1000, 3) for name, elapsed in self.phases.items()},
+			'total' : round((perf_counter() - self.started) * 1000, 3),
+		}
+
+	def report(self, stream, format_='text'):
+		'''Write the report
+		Write the timings to the stream, as aligned text lines or as a single line JSON record.
+
+		:param stream: a text stream to write the report into (usually stderr)
+		:param str format_: one of TIMINGS_FORMATS
+		:returns None: nothing
+		'''
+
+		record = self.record()
+		if format_ == 'json':
+			stream.write(json_dumps(record) + '\n')
+		elif format_ == 'text':
+			width = max((len(name) for name in record['phases']), default=0)
+			width = max(width, len('total'))
+			for name, elapsed in record['phases'].items():
+				stream.write('{:<{width}} {:>10.3f} ms\n'.format(name, elapsed, width=width))
+			stream.write('{:<{width}} {:>10.3f} ms\n'.format('total', record['total'], width=width))
+		else:
+			raise ValueError('Unknown timings format: {}'.format(format_))
+		stream.flush()
+
+
+def timer_phase(timer, name):
+	'''Optional phase
+	Helper for code that might run with or without a timer.
+
+	:param PhaseTimer? timer: the timer, if any
+	:param str name: the name of the phase
+	:returns ContextManager: the timer phase or a no-op context manager
+	'''
+
+	return nullcontext() if timer is None else timer.phase(name)
@@ -6,59 +6,22 @@ ToDo:
 - Everything
 '''
 
+from collections import OrderedDict
 from enum import Enum
 from importlib import import_module
 from inspect import isclass, ismethod
 from logging import getLogger
+from threading import Lock
 from types import FunctionType, MethodType
+from weakref import WeakValueDictionary
 
-from docstring_parser import parse as docstring_parse
 from introspection import Signature
 from introspection.parameter import ParameterKind
 
-LOGGER = getLogger(__name__)
-
-def object_metadata(obj):
-	'''Gets metadata from an object
-	It tries to get some meta information from the provided object by leveraging the object's details (name and version) and whatever can be learned from the docstring.
-
-	:param obj: The object to build the metadata for
-	:returns dict: dictionary containing metadata details
-	'''
-
-	DOCSTRING_PARAM_ATTRS = ('default', 'description', 'is_optional', 'type_name')
-	DOCSTRING_RETURN_ATTRS = ('description', 'is_generator', 'return_name', 'type_name')
-
-	metadata = {'name' : obj.__name__}
+from ._async import is_async_callable, resolve_async_result
+from ._introspection import object_metadata
 
-	if hasattr(obj, '__version__'):
-		metadata['version'] = obj.__version__
-
-	if hasattr(obj, '__doc__') and (obj.__doc__ is not None) and len(obj.__doc__):
-		docstring = (docstring_parse(obj.__doc__))
-		if docstring.short_description:
-			metadata['description'] = docstring.short_description
-		if docstring.long_description:
-			metadata['long_description'] = docstring.long_description
-		if len(docstring.params):
-			docstring_params = {}
-			for param in docstring.params:
-				docstring_param = {}
-				for param_attr in DOCSTRING_PARAM_ATTRS:
-					docstring_param_attr = getattr(param, param_attr)
-					if docstring_param_attr is not None:
-						docstring_param[param_attr] = docstring_param_attr
-				docstring_params[param.arg_name] = docstring_param
-			metadata['parameters'] = docstring_params
-		if docstring.returns:
-			docstring_return = {}
-			for return_attr in DOCSTRING_RETURN_ATTRS:
-				docstring_return_attr = getattr(docstring.returns, return_attr)
-				if docstring_return_attr is not None:
-					docstring_return[return_attr] = docstring_return_attr
-			metadata['returns'] = docstring_return
-
-	return metadata
+LOGGER = getLogger(__name__)
 
 Signature._replace_original = Signature.replace
 def signature_replace(self, *args, **kwargs):
@@ -102,6 +65,9 @@ def signature_without_first_parameter(self):
 Signature.without_first_parameter = signature_without_first_parameter
 
 
+BIND_REQUIRED_POSITIONAL, BIND_OPTIONAL_POSITIONAL, BIND_VAR_POSITIONAL, BIND_REQUIRED_KEYWORD, BIND_OPTIONAL_KEYWORD, BIND_VAR_KEYWORD = range(6)
+
+
 class CallableType(Enum):
 	'''Callable types
 	List of callable types identified by the module so far
@@ -120,9 +86,44 @@ class CallableType(Enum):
 class Callable:
 	'''Describe a callable
 	This is mostly about "executing"/"running" the callable. It requires a lot of processing based on all the possible "things" that are callables.
+	
+	Instances are interned (flyweight): creating a Callable for the same underlying callable returns the same instance, so the costly attributes (signature, type, metadata, etc.) are computed only once. The registry keeps strong references to the "REGISTRY_SIZE" most recently requested instances and weak references to the rest.
 	'''
 	
 	FORWARD_METADATA = ('name', 'version', 'description', 'long_description')
+	REGISTRY_SIZE = 256
+	
+	_registry_lock = Lock()
+	_live_instances = WeakValueDictionary()
+	_recent_instances = OrderedDict()
+	
+	def __new__(cls, callable_):
+		'''Magic creation
+		Return the existing instance for the callable, if any. A new one is created (and registered) otherwise. Unhashable callables are not interned.
+		
+		:param callable_: The callable that will be handled by the class
+		:returns Callable: the instance for the callable
+		'''
+		
+		key = (cls, callable_)
+		try:
+			hash(key)
+		except TypeError:
+			return super().__new__(cls)
+		if not callable(callable_):
+			return super().__new__(cls)
+		
+		with cls._registry_lock:
+			instance = cls._live_instances.get(key)
+			if instance is None:
+				instance = super().__new__(cls)
+				cls._live_instances[key] = instance
+			cls._recent_instances[key] = instance
+			cls._recent_instances.move_to_end(key)
+			while len(cls._recent_instances) > cls.REGISTRY_SIZE:
+				cls._recent_instances.popitem(last=False)
+		
+		return instance
 	
 	def __init__(self, callable_):
 		'''Magic initialization
@@ -139,13 +140,26 @@ class Callable:
 		
 		self._callable_ = callable_
 	
-	def __call__(self, *multiple_args_w_keys, **args_w_keys):
+	@classmethod
+	def clear_registry(cls):
+		'''Forget the interned instances
+		The next instantiation for any callable will create a new instance (recomputing everything).
+		
+		:returns None: nothing
+		'''
+		
+		with cls._registry_lock:
+			cls._live_instances.clear()
+			cls._recent_instances.clear()
+	
+	def __call__(self, *multiple_args_w_keys, instance_pool=None, **args_w_keys):
 		'''Execute the callable
 		"Call" this callable with the applicable parameters found in "args_w_keys". The parameters are provided as needed (positionals or as keywords) based on the callable signature.
 		
 		:param multiple_args_w_keys: a couple (just 2) positional arguments that should be dicts used only when the callable is an instance method; the first one will be used to instantiate the parent class and the second will be used to execute the actual method
+		:param InstancePool? instance_pool: a pool (as in "simplifiedapp._pool.InstancePool") to reuse the parent instances of instance methods, instead of creating a new one on every call
 		:param args_w_keys: The arguments to execute the callable with. For instance methods it can be used for shared arguments; it will be used for the class and the method updated by the dicts in multiple_args_w_keys if provided.
-		:returns Any: the result of "running" this callable with the provided parameters
+		:returns Any: the result of "running" this callable with the provided parameters, asynchronous callables are driven on a new event loop (as in "simplifiedapp._async.resolve_async_result")
 		'''
 		
 		if self.type == CallableType['INSTANCE_METHOD']:
@@ -159,17 +173,20 @@ class Callable:
 				raise TypeError('Invalid arguments for instance method')
 			
 			parent_args, parent_kwargs = type(self)(self.parent).bind(**parent_args_w_keys)
-			parent_instance = self.parent(*parent_args, **parent_kwargs)
+			if instance_pool is None:
+				parent_instance = self.parent(*parent_args, **parent_kwargs)
+			else:
+				parent_instance = instance_pool.get(self.parent, parent_args, parent_kwargs)
 			
 			callable_args, callable_kwargs = self.bind(**callable_args_w_keys)
 			callable_method = getattr(parent_instance, self.name)
-			return callable_method(*callable_args, **callable_kwargs)
+			return resolve_async_result(callable_method(*callable_args, **callable_kwargs))
 		
 		elif multiple_args_w_keys:
 			LOGGER.warning('Ignoring positional arguments provided for callable that is not an instance method: %s', multiple_args_w_keys)
 		
 		args, kwargs = self.bind(**args_w_keys)
-		return self._callable_(*args, **kwargs)
+		return resolve_async_result(self._callable_(*args, **kwargs))
 	
 	def __getattr__(self, item):
 		'''Lazy instantiation
@@ -208,6 +225,10 @@ class Callable:
 				value = self.parents[0]
 			else:
 				value = None
+		elif item == 'binding_plan':
+			value = self._compile_binding_plan()
+		elif item == 'is_async':
+			value = is_async_callable(self._callable_)
 		elif item in ('signature', 'type'):
 			signature, type_ = self._get_signature_detect_type()
 			if item == 'signature':
@@ -309,50 +330,85 @@ class Callable:
 		
 		return Signature(parameters=pos_params+varargs+kw_params+varkw, forward_ref_context=class_.__module__)
 	
+	def _compile_binding_plan(self):
+		'''Compile the signature into a binding plan
+		Walk the signature once and turn it into a flat tuple of operations, one per parameter, so "bind" doesn't need to inspect the signature again.
+		
+		:returns tuple: two items tuple, with the tuple of operations (operation code, parameter name, default value, missing value error message) in the first position and a flag signaling the presence of a variable positional parameter in the second
+		'''
+		
+		operations, has_var_positional = [], False
+		for parameter_name, parameter in self.signature.parameters.items():
+			required = parameter.default == parameter.empty
+			if parameter.kind in (ParameterKind.POSITIONAL_ONLY, ParameterKind.POSITIONAL_OR_KEYWORD):
+				operation = BIND_REQUIRED_POSITIONAL if required else BIND_OPTIONAL_POSITIONAL
+				error_message = 'Missing required {} parameter "{}"'.format(parameter.kind, parameter_name)
+			elif parameter.kind == ParameterKind.VAR_POSITIONAL:
+				operation, error_message, has_var_positional = BIND_VAR_POSITIONAL, None, True
+			elif parameter.kind == ParameterKind.KEYWORD_ONLY:
+				operation = BIND_REQUIRED_KEYWORD if required else BIND_OPTIONAL_KEYWORD
+				error_message = 'Missing required keyword only parameter "{}"'.format(parameter_name)
+			else:
+				operation, error_message = BIND_VAR_KEYWORD, None
+			operations.append((operation, parameter_name, parameter.default, error_message))
+		
+		return tuple(operations), has_var_positional
+	
 	def bind(self, *args, **kwargs):
 		'''Get the "args" list and the "kwargs" dict for the callable signature
 		Another implementation of bind, sadly, neither "introspection.Signature.bind" nor "inspect.Signature.bind" methods are very helpful for this use case. The "BoundArguments" versions are not completely there either. Instead, wrote the "goal" of all those into this method and called it a day.
 		
-		For parameters that could be passed as positional or keyword this method will always use the positional option, makes things simpler. Missing required parameters will raise a TypeError. Unused arguments will yield logging warnings.
+		For parameters that could be passed as positional or keyword this method will always use the positional option, makes things simpler. Optional positional parameters that are not provided are left out, unless a later positional parameter is provided (or there's a variable positional parameter) in which case their default is used to keep the positions. Missing required parameters will raise a TypeError. Unused arguments will yield logging warnings.
+		
+		The signature is compiled into a binding plan (once per callable) which is then applied to the provided arguments.
 		
 		:param args: The positional arguments to be used to bind to the signature
 		:param kwargs: The keyword arguments to be used to bind to the signature
 		:returns Any: the value of such attribute
 		'''
 		
-		fixed_args, fixed_kwargs = [], {}
-		for parameter_name, parameter in self.signature.parameters.items():
-			if parameter.kind in (ParameterKind.POSITIONAL_ONLY, ParameterKind.POSITIONAL_OR_KEYWORD):
-				if len(args):
-					fixed_args.append(args.pop(0))
+		operations, has_var_positional = self.binding_plan
+		fixed_args, fixed_kwargs, pending_defaults, position = [], {}, [], 0
+		for operation, parameter_name, default, error_message in operations:
+			if operation <= BIND_OPTIONAL_POSITIONAL:
+				if position < len(args):
+					value = args[position]
+					position += 1
 				elif parameter_name in kwargs:
-					fixed_args.append(kwargs.pop(parameter_name))
-				elif parameter.default == parameter.empty:
-					raise TypeError('Missing required {} parameter "{}"'.format(parameter.kind, parameter_name))
-				elif self.signature.variable_positional_parameter is not None:
-					fixed_args.append(parameter.default)
-			elif parameter.kind == ParameterKind.VAR_POSITIONAL:
+					value = kwargs.pop(parameter_name)
+				elif operation == BIND_REQUIRED_POSITIONAL:
+					raise TypeError(error_message)
+				elif has_var_positional:
+					fixed_args.append(default)
+					continue
+				else:
+					pending_defaults.append(default)
+					continue
+				if pending_defaults:
+					fixed_args += pending_defaults
+					pending_defaults = []
+				fixed_args.append(value)
+			elif operation == BIND_VAR_POSITIONAL:
 				if parameter_name in kwargs:
 					fixed_args += kwargs.pop(parameter_name)
-				if args:
-					fixed_args += args
-					args = []
-			elif parameter.kind == ParameterKind.KEYWORD_ONLY:
+				if position < len(args):
+					fixed_args += args[position:]
+					position = len(args)
+			elif operation <= BIND_OPTIONAL_KEYWORD:
 				if parameter_name in kwargs:
 					fixed_kwargs[parameter_name] = kwargs.pop(parameter_name)
-				elif parameter.default == parameter.empty:
-					raise TypeError('Missing required keyword only parameter "{}"'.format(parameter_name))
-			elif parameter.kind == ParameterKind.VAR_KEYWORD:
+				elif operation == BIND_REQUIRED_KEYWORD:
+					raise TypeError(error_message)
+			else:
 				if parameter_name in kwargs:
 					fixed_kwargs |= kwargs.pop(parameter_name)
 				if kwargs:
 					fixed_kwargs |= kwargs
 					kwargs = {}
 		
-		if args:
-			LOGGER.warning('Ignoring unused args: %s', args)
+		if position < len(args):
+			LOGGER.warning('Ignoring unused args: %s', args[position:])
 		if kwargs:
 			LOGGER.warning('Ignoring unused kwargs: %s', kwargs)
 		
 		return tuple(fixed_args), fixed_kwargs
-	
\ No newline at end of file
@@ -0,0 +1,59 @@
+#python
+'''
+Testing the _async.resolve_async_result function
+'''
+
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._async import event_loop_factory, is_async_callable, resolve_async_result
+
+class TestResolveAsyncResult(TestCase):
+	'''
+	Tests for the resolve_async_result function
+	'''
+	
+	def test_coroutine(self):
+		'''
+		Test "resolve_async_result" with a coroutine
+		'''
+		
+		self.assertEqual('a|bee', resolve_async_result(fixture_async_function('a')))
+	
+	def test_async_generator(self):
+		'''
+		Test "resolve_async_result" with an asynchronous generator
+		'''
+		
+		self.assertEqual([0, 1, 2], resolve_async_result(fixture_async_generator()))
+	
+	def test_sync_result(self):
+		'''
+		Test "resolve_async_result" with a regular value
+		'''
+		
+		value = object()
+		self.assertIs(value, resolve_async_result(value))
+	
+	def test_is_async_callable(self):
+		'''
+		Test "is_async_callable" with several callables
+		'''
+		
+		self.assertTrue(is_async_callable(fixture_async_function))
+		self.assertTrue(is_async_callable(fixture_async_generator))
+		self.assertFalse(is_async_callable(fixture_function_w_result))
+	
+	def test_auto_event_loop(self):
+		'''
+		Test the "auto" event loop with a coroutine
+		'''
+		
+		self.assertEqual('a|b', resolve_async_result(fixture_async_function('a', 'b'), loop_factory=event_loop_factory('auto')))
+	
+	def test_unknown_event_loop(self):
+		'''
+		Test "event_loop_factory" with an unknown loop
+		'''
+		
+		self.assertRaises(ValueError, event_loop_factory, 'trio')
@@ -0,0 +1,120 @@
+#python
+'''
+Testing the _background.BackgroundWriter class
+'''
+
+from threading import Event
+from unittest import TestCase
+
+from simplifiedapp._background import BackgroundWriter
+
+class RecordingWriter:
+	'''
+	Binary writer keeping every write, optionally waiting for an event on the first one
+	'''
+	
+	encoding = 'latin-1'
+	
+	def __init__(self, gate=None, error=None):
+		self.gate, self.error = gate, error
+		self.writes, self.flushes = [], 0
+	
+	def write(self, data):
+		if self.gate is not None:
+			self.gate.wait()
+		if self.error is not None:
+			raise self.error
+		self.writes.append(bytes(data))
+	
+	def flush(self):
+		self.flushes += 1
+
+class TestBackgroundWriter(TestCase):
+	'''
+	Tests for the BackgroundWriter class
+	'''
+	
+	def test_write(self):
+		'''
+		Test that everything gets written and flushed on exit
+		'''
+		
+		writer = RecordingWriter()
+		with BackgroundWriter(writer) as background:
+			self.assertEqual('latin-1', background.encoding)
+			for number in range(100):
+				background.write('{}\n'.format(number).encode())
+		self.assertEqual(''.join('{}\n'.format(number) for number in range(100)).encode(), b''.join(writer.writes))
+		self.assertGreaterEqual(writer.flushes, 1)
+	
+	def test_batching(self):
+		'''
+		Test that the writes waiting in the queue are joined
+		'''
+		
+		gate = Event()
+		writer = RecordingWriter(gate=gate)
+		with BackgroundWriter(writer, queue_depth=10) as background:
+			background.write(b'first')
+			for letter in 'abcde':
+				background.write(letter.encode())
+			gate.set()
+		self.assertEqual(b'firstabcde', b''.join(writer.writes))
+		self.assertLess(len(writer.writes), 6)
+	
+	def test_batch_size(self):
+		'''
+		Test that the joined writes stay within the batch size
+		'''
+		
+		gate = Event()
+		writer = RecordingWriter(gate=gate)
+		with BackgroundWriter(writer, queue_depth=10, batch_size=4) as background:
+			for letter in 'abcdefgh':
+				background.write(letter.encode() * 2)
+			gate.set()
+		self.assertEqual(b'aabbccddeeffgghh', b''.join(writer.writes))
+		self.assertTrue(all(len(data) <= 4 for data in writer.writes[1:]))
+	
+	def test_memoryview(self):
+		'''
+		Test that memoryviews are copied before the producer releases them
+		'''
+		
+		writer = RecordingWriter()
+		data = bytearray(b'abc')
+		with BackgroundWriter(writer) as background:
+			with memoryview(data) as view:
+				background.write(view)
+			data[0:1] = b'x'
+		self.assertEqual([b'abc'], writer.writes)
+	
+	def test_error(self):
+		'''
+		Test that an error in the writer thread is raised in the producer
+		'''
+		
+		writer = RecordingWriter(error=BrokenPipeError('closed'))
+		with self.assertRaises(BrokenPipeError):
+			with BackgroundWriter(writer, queue_depth=1) as background:
+				for number in range(1000):
+					background.write(b'data')
+	
+	def test_producer_error(self):
+		'''
+		Test that the data written before an error of the producer gets written
+		'''
+		
+		writer = RecordingWriter()
+		with self.assertRaises(RuntimeError):
+			with BackgroundWriter(writer) as background:
+				background.write(b'partial')
+				raise RuntimeError('producer failed')
+		self.assertEqual(b'partial', b''.join(writer.writes))
+	
+	def test_invalid_depth(self):
+		'''
+		Test that the queue depth should be positive
+		'''
+		
+		self.assertRaises(ValueError, BackgroundWriter, RecordingWriter(), queue_depth=0)
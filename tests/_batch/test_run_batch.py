@@ -0,0 +1,80 @@
+#python
+'''
+Testing the _batch.run_batch function
+'''
+
+from io import StringIO
+from unittest import TestCase
+
+from fixtures.classes import FixtureCountedClass
+from fixtures.functions import *
+from simplifiedapp._batch import record_arguments, run_batch
+from simplifiedapp._introspection import introspect_callable
+from simplifiedapp._output import IncrementalWriter
+
+class TestRunBatch(TestCase):
+	'''
+	Tests for the run_batch function
+	'''
+	
+	def _run(self, callable_, records, format_='auto'):
+		metadata, parameters = introspect_callable(callable_)
+		stream = StringIO()
+		with self.assertLogs('simplifiedapp._batch', level='DEBUG'), IncrementalWriter(stream) as writer:
+			counts = run_batch(callable_, enumerate(records, start=1), writer, callable_metadata=metadata, parameters=parameters, format_=format_)
+		return counts, stream.getvalue()
+	
+	def test_records(self):
+		'''
+		Test "run_batch" with several records
+		'''
+		
+		records = [{'a' : 1}, {'a' : 2, 'b' : 'x', 'c' : True}]
+		expected_result = (2, 0), "1|bee|()|False|4|[]\n2|x|()|True|4|[]\n"
+		self.assertEqual(expected_result, self._run(fixture_function_w_result, records))
+	
+	def test_failed_record(self):
+		'''
+		Test "run_batch" with a record missing a required parameter
+		'''
+		
+		records = [{'b' : 'x'}, {'a' : 'ok'}]
+		expected_result = (2, 1), 'null\n"ok|bee"\n'
+		self.assertEqual(expected_result, self._run(fixture_async_function, records, format_='jsonl'))
+	
+	def test_generator_record(self):
+		'''
+		Test "run_batch" with a generator result, as a single record
+		'''
+		
+		expected_result = (1, 0), '[{"number": 0}, {"number": 1}]\n'
+		self.assertEqual(expected_result, self._run(fixture_generator, [{'count' : 2}], format_='jsonl'))
+	
+	def test_record_arguments_varkw(self):
+		'''
+		Test "record_arguments" with unknown names going into the variable keyword parameter
+		'''
+		
+		_, parameters = introspect_callable(fixture_function_w_result)
+		expected_result = {'a' : 1, 'kwargs' : {'x' : 2, 'y' : 3}}
+		self.assertEqual(expected_result, record_arguments({'a' : 1, 'x' : 2, 'kwargs' : {'y' : 3}}, parameters))
+	
+	def test_record_arguments_unknown(self):
+		'''
+		Test "record_arguments" with an unknown name and no variable keyword parameter
+		'''
+		
+		_, parameters = introspect_callable(fixture_async_function)
+		self.assertRaises(TypeError, record_arguments, {'z' : 1}, parameters)
+		self.assertRaises(TypeError, record_arguments, ['a'], parameters)
+	
+	def test_pooled_instances(self):
+		'''
+		Test "run_batch" with an instance method, creating the parent instance once per set of constructor arguments
+		'''
+		
+		FixtureCountedClass.initializations = 0
+		records = [{'init_arg' : 'foo', 'pos_arg' : 1}, {'init_arg' : 'foo', 'pos_arg' : 2}, {'init_arg' : 'bar', 'pos_arg' : 3}, {'init_arg' : 'foo', 'pos_arg' : 4}]
+		expected_result = (4, 0), 'foo-1\nfoo-2\nbar-3\nfoo-4\n'
+		self.assertEqual(expected_result, self._run(FixtureCountedClass.bound_method, records))
+		self.assertEqual(2, FixtureCountedClass.initializations)
@@ -0,0 +1,64 @@
+#python
+'''
+Testing the _cache.DiskCache class
+'''
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from simplifiedapp._cache import DiskCache
+
+class TestDiskCache(TestCase):
+	'''
+	Tests for the DiskCache class
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.cache = DiskCache(self.temp_dir.name, namespace='1.0')
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def test_missing_key(self):
+		'''
+		Test "DiskCache.get" with a key that was never stored
+		'''
+		
+		self.assertIsNone(self.cache.get('missing'))
+		expected_result = 'fallback'
+		self.assertEqual(expected_result, self.cache.get('missing', default=expected_result))
+	
+	def test_roundtrip(self):
+		'''
+		Test "DiskCache.set" and "DiskCache.get" with a picklable value
+		'''
+		
+		expected_result = {'a' : [1, 2, 3], 'b' : {'positional' : True}}
+		self.assertTrue(self.cache.set('key', expected_result))
+		self.assertEqual(expected_result, self.cache.get('key'))
+	
+	def test_namespace(self):
+		'''
+		Test "DiskCache.get" with a value stored under a different namespace
+		'''
+		
+		self.cache.set('key', 'value')
+		self.assertIsNone(DiskCache(self.temp_dir.name, namespace='2.0').get('key'))
+	
+	def test_unpicklable_value(self):
+		'''
+		Test "DiskCache.set" with a value that can't be pickled
+		'''
+		
+		self.assertFalse(self.cache.set('key', lambda: None))
+		self.assertIsNone(self.cache.get('key'))
+	
+	def test_corrupted_file(self):
+		'''
+		Test "DiskCache.get" with a corrupted cache file
+		'''
+		
+		self.cache.set('key', 'value')
+		self.cache._path_for('key').write_bytes(b'not a pickle')
+		self.assertIsNone(self.cache.get('key'))
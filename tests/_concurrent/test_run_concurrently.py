@@ -0,0 +1,74 @@
+#python
+'''
+Testing the _concurrent.run_concurrently function
+'''
+
+from io import StringIO
+from time import perf_counter
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._batch import record_arguments
+from simplifiedapp._concurrent import run_concurrently
+from simplifiedapp._introspection import introspect_callable
+from simplifiedapp._output import IncrementalWriter
+
+class TestRunConcurrently(TestCase):
+	'''
+	Tests for the run_concurrently function
+	'''
+	
+	def _run(self, callable_, calls, **kwargs):
+		metadata, parameters = introspect_callable(callable_)
+		stream = StringIO()
+		with IncrementalWriter(stream) as writer:
+			counts = run_concurrently(callable_, enumerate(calls, start=1), writer, callable_metadata=metadata, parameters=parameters, **kwargs)
+		return counts, stream.getvalue()
+	
+	def test_pipelined(self):
+		'''
+		Test that the calls run concurrently
+		'''
+		
+		calls = [{'delay' : 0.1, 'value' : number} for number in range(10)]
+		start = perf_counter()
+		counts, output = self._run(fixture_async_function_w_delay, calls, concurrency=10)
+		self.assertLess(perf_counter() - start, 0.5)
+		self.assertEqual((10, 0), counts)
+		self.assertEqual(''.join('{}\n'.format(number) for number in range(10)), output)
+	
+	def test_unordered(self):
+		'''
+		Test that unordered records are written in completion order
+		'''
+		
+		calls = [{'delay' : 0.2, 'value' : 'slow'}, {'delay' : 0, 'value' : 'fast'}]
+		self.assertEqual(((2, 0), 'fast\nslow\n'), self._run(fixture_async_function_w_delay, calls, concurrency=2, ordered=False))
+	
+	def test_concurrency_bound(self):
+		'''
+		Test that the concurrency bounds the calls in flight
+		'''
+		
+		calls = [{'delay' : 0.1} for _ in range(4)]
+		start = perf_counter()
+		self._run(fixture_async_function_w_delay, calls, concurrency=2)
+		self.assertGreaterEqual(perf_counter() - start, 0.2)
+	
+	def test_prepare_and_failure(self):
+		'''
+		Test the calls with a prepare function and a failing call
+		'''
+		
+		_, parameters = introspect_callable(fixture_async_function)
+		prepare = lambda record: record_arguments(record, parameters)
+		with self.assertLogs('simplifiedapp._concurrent', level='ERROR'):
+			result = self._run(fixture_async_function, [{'a' : 'x'}, {'z' : 1}], concurrency=2, prepare=prepare, format_='jsonl')
+		self.assertEqual(((2, 1), '"x|bee"\nnull\n'), result)
+	
+	def test_async_generator(self):
+		'''
+		Test the calls with an asynchronous generator function
+		'''
+		
+		self.assertEqual(((1, 0), '[0, 1]\n'), self._run(fixture_async_generator, [{'count' : 2}], concurrency=1))
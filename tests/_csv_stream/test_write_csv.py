@@ -0,0 +1,91 @@
+#python
+'''
+Testing the _csv_stream.write_csv function
+'''
+
+from asyncio import run
+from collections import namedtuple
+from dataclasses import dataclass
+from io import BytesIO
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._csv_stream import parse_columns, write_async_csv, write_csv
+
+Pair = namedtuple('Pair', ('name', 'value'))
+
+@dataclass
+class Point:
+	x : int
+	y : int
+
+class TestWriteCsv(TestCase):
+	'''
+	Tests for the write_csv function
+	'''
+	
+	def _write(self, rows, **kwargs):
+		output = BytesIO()
+		count = write_csv(rows, output, **kwargs)
+		return output.getvalue().decode(), count
+	
+	def test_mappings(self):
+		'''
+		Test "write_csv" with mappings, inferring the header from the first one
+		'''
+		
+		self.assertEqual(('a,b\r\n1,x\r\n2,\r\n', 2), self._write([{'a' : 1, 'b' : 'x'}, {'a' : 2}]))
+	
+	def test_tsv(self):
+		'''
+		Test "write_csv" with the tsv dialect
+		'''
+		
+		self.assertEqual(('a\tb\n1\tx y\n', 1), self._write([{'a' : 1, 'b' : 'x y'}], format_='tsv'))
+	
+	def test_columns(self):
+		'''
+		Test "write_csv" with explicit columns, picking and reordering the values
+		'''
+		
+		self.assertEqual(('c,a\r\n,1\r\n3,2\r\n', 2), self._write([{'a' : 1, 'b' : 'x'}, {'a' : 2, 'c' : 3}], columns=['c', 'a']))
+	
+	def test_records(self):
+		'''
+		Test "write_csv" with named tuples and dataclasses
+		'''
+		
+		self.assertEqual('name,value\r\na,1\r\n', self._write([Pair('a', 1)])[0])
+		self.assertEqual('x,y\r\n1,2\r\n', self._write(iter([Point(1, 2)]))[0])
+	
+	def test_sequences(self):
+		'''
+		Test "write_csv" with sequences and scalars, without a header
+		'''
+		
+		self.assertEqual(('1,"a,b"\r\n3\r\n', 2), self._write([(1, 'a,b'), 3]))
+		self.assertEqual(('x\r\n', 1), self._write('x'))
+	
+	def test_generator(self):
+		'''
+		Test "write_csv" with a generator
+		'''
+		
+		self.assertEqual(('number\r\n0\r\n1\r\n', 2), self._write(fixture_generator(2)))
+	
+	def test_async(self):
+		'''
+		Test "write_async_csv" with an asynchronous generator
+		'''
+		
+		output = BytesIO()
+		self.assertEqual(2, run(write_async_csv(fixture_async_generator(2), output, format_='tsv')))
+		self.assertEqual(b'0\n1\n', output.getvalue())
+	
+	def test_parse_columns(self):
+		'''
+		Test parsing the columns from the command line
+		'''
+		
+		self.assertEqual(['a', 'b'], parse_columns('a, b'))
+		self.assertRaises(ValueError, parse_columns, 'a,,b')
@@ -0,0 +1,85 @@
+#python
+'''
+Testing the _format.BoundedFormatter class
+'''
+
+from io import BytesIO
+from unittest import TestCase
+
+from simplifiedapp._format import BoundedFormatter
+
+class TestBoundedFormatter(TestCase):
+	'''
+	Tests for the BoundedFormatter class
+	'''
+	
+	def _write(self, value, **kwargs):
+		stream = BytesIO()
+		BoundedFormatter(**kwargs).write(value, stream)
+		return stream.getvalue().decode('utf-8')
+	
+	def test_inline(self):
+		'''
+		Test that values fitting in a line are formatted like their repr
+		'''
+		
+		value = {'b' : [1, (2,)], 'a' : {'c' : None}, 'd' : set()}
+		self.assertEqual(repr(value) + '\n', self._write(value))
+	
+	def test_blocks(self):
+		'''
+		Test that values not fitting in a line are formatted as indented blocks
+		'''
+		
+		expected = "{\n  'a': [\n    0, 1, 2, 3, 4,\n    5, 6, 7, 8, 9,\n  ],\n  'b': 'bee',\n}\n"
+		self.assertEqual(expected, self._write({'a' : list(range(10)), 'b' : 'bee'}, width=20))
+	
+	def test_max_items(self):
+		'''
+		Test that the items beyond "max_items" are elided and summarized
+		'''
+		
+		expected = "[0, 1, ...]\n# elided: 8 items beyond 2 per container\n"
+		self.assertEqual(expected, self._write(list(range(10)), max_items=2))
+	
+	def test_max_depth(self):
+		'''
+		Test that the containers beyond "max_depth" are elided and summarized
+		'''
+		
+		expected = "{'a': [...], 'b': 1}\n# elided: 1 containers beyond depth 1\n"
+		self.assertEqual(expected, self._write({'a' : [[1]], 'b' : 1}, max_depth=1))
+	
+	def test_max_bytes(self):
+		'''
+		Test that the output is cut after "max_bytes"
+		'''
+		
+		output = self._write(list(range(1000)), max_bytes=30)
+		body, summary = output.split('\n# ')
+		self.assertEqual(30, len(body.encode('utf-8')))
+		self.assertEqual('elided: output truncated at 30 bytes\n', summary)
+	
+	def test_recursion(self):
+		'''
+		Test that containers found inside themselves get a recursion marker, like pprint
+		'''
+		
+		from pprint import pformat
+		
+		value = [1, 2]
+		value.append(value)
+		self.assertEqual(pformat(value) + '\n', self._write(value, width=200))
+		mapping = {'list' : value}
+		mapping['self'] = mapping
+		expected_result = "{{\n  'list': [\n    1,\n    2,\n    <Recursion on list with id={0}>,\n  ],\n  'self': <Recursion on dict with id={1}>,\n}}\n".format(id(value), id(mapping))
+		self.assertEqual(expected_result, self._write(mapping, width=40))
+		shared = [1]
+		self.assertEqual('[[1], [1]]\n', self._write([shared, shared]))
+	
+	def test_negative_limit(self):
+		'''
+		Test that negative limits are rejected
+		'''
+		
+		self.assertRaises(ValueError, BoundedFormatter, max_items=-1)
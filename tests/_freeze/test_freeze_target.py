@@ -0,0 +1,91 @@
+#python
+'''
+Testing the _freeze.freeze_target function
+'''
+
+from pathlib import Path
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._freeze import freeze_target
+
+TESTS_DIR = Path(__file__).parent.parent
+
+class TestFreezeTarget(TestCase):
+	'''
+	Tests for the freeze_target function
+	'''
+	
+	def _run_frozen(self, source, *sys_argv):
+		with TemporaryDirectory() as temp_dir:
+			frozen_module = Path(temp_dir) / 'cli_frozen.py'
+			frozen_module.write_text(source)
+			code = 'import sys, runpy; runpy.run_path({}, run_name="__main__"); print(sorted({{"docstring_parser", "introspection", "simplifiedapp"}} & set(sys.modules)), end="")'.format(repr(str(frozen_module)))
+			return run([executable, '-c', code, *sys_argv], capture_output=True, cwd=TESTS_DIR, env={'PYTHONPATH' : str(TESTS_DIR)}, text=True)
+	
+	def test_function(self):
+		'''
+		Test "freeze_target" with a function taking every kind of parameter
+		'''
+		
+		result = self._run_frozen(freeze_target(fixture_function_w_result), '1', '2', '3', '--fixture-function-w-result-c', '--fixture-function-w-result-kwargs', 'x=1')
+		self.assertEqual('', result.stderr)
+		expected_result = "1|2|('3',)|True|4|[('x', '1')][]"
+		self.assertEqual(expected_result, result.stdout)
+	
+	def test_coroutine_function(self):
+		'''
+		Test "freeze_target" with a coroutine function
+		'''
+		
+		result = self._run_frozen(freeze_target(fixture_async_function), 'x')
+		self.assertEqual('', result.stderr)
+		self.assertEqual('x|bee[]', result.stdout)
+	
+	def test_function_as_string(self):
+		'''
+		Test "freeze_target" with a "module:callable" string target
+		'''
+		
+		self.assertEqual(freeze_target(fixture_function_w_result), freeze_target('fixtures.functions:fixture_function_w_result'))
+	
+	def test_class(self):
+		'''
+		Test "freeze_target" with a class
+		'''
+		
+		result = self._run_frozen(freeze_target('fixtures.classes:FixtureClassWNewAndInit'), 'r', 's', '--FixtureClassWNewAndInit-new-kw', '6', '--FixtureClassWNewAndInit-init-kw', '7')
+		self.assertEqual('', result.stderr)
+		expected_result = "{'new_pos': 'r', 'new_kw': '6', 'init_pos': 'r', 'init_kw': '7'}\n[]"
+		self.assertEqual(expected_result, result.stdout)
+	
+	def test_instance_method(self):
+		'''
+		Test "freeze_target" with an instance method, building the parent from its own options
+		'''
+		
+		result = self._run_frozen(freeze_target('fixtures.classes:FixtureClassWMethods.bound_method'), 'foo', 'bar')
+		self.assertEqual('', result.stderr)
+		self.assertEqual('ultra-foo-bound-bar[]', result.stdout)
+	
+	def test_class_method(self):
+		'''
+		Test "freeze_target" with a class method
+		'''
+		
+		result = self._run_frozen(freeze_target('fixtures.classes:FixtureClassWMethods.class_method'), 'bar')
+		self.assertEqual('', result.stderr)
+		self.assertEqual('ultra-class-bar[]', result.stdout)
+	
+	def test_local_function(self):
+		'''
+		Test "freeze_target" with a function that can't be imported
+		'''
+		
+		def fixture_local_function():
+			pass
+		
+		self.assertRaises(ValueError, freeze_target, fixture_local_function)
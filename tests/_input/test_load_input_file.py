@@ -0,0 +1,106 @@
+#python
+'''
+Testing the _input.load_input_file function
+'''
+
+from io import StringIO
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from simplifiedapp._cache import DiskCache
+from simplifiedapp._input import load_input_file, load_input_files
+
+class TestLoadInputFile(TestCase):
+	'''
+	Tests for the load_input_file function
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.directory = Path(self.temp_dir.name)
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def test_json(self):
+		'''
+		Test "load_input_file" with a JSON file
+		'''
+		
+		path = self.directory / 'config.json'
+		path.write_text('{"a": 1, "b": [2]}')
+		self.assertEqual({'a' : 1, 'b' : [2]}, load_input_file(str(path), 'JSON'))
+	
+	def test_json_not_object(self):
+		'''
+		Test "load_input_file" with a JSON file without an object as the root
+		'''
+		
+		path = self.directory / 'config.json'
+		path.write_text('[1]')
+		self.assertRaises(ValueError, load_input_file, str(path), 'json')
+	
+	def test_ini(self):
+		'''
+		Test "load_input_file" with an INI file, with default values and sections
+		'''
+		
+		path = self.directory / 'config.ini'
+		path.write_text('[DEFAULT]\nKey = value\n\n[section]\nother = 2\n')
+		self.assertEqual({'Key' : 'value', 'section' : {'Key' : 'value', 'other' : '2'}}, load_input_file(str(path), 'ini'))
+	
+	def test_invalid_ini(self):
+		'''
+		Test "load_input_file" with a broken INI file
+		'''
+		
+		path = self.directory / 'config.ini'
+		path.write_text('no section\n')
+		self.assertRaises(ValueError, load_input_file, str(path), 'ini')
+	
+	def test_unknown_format(self):
+		'''
+		Test "load_input_file" with an unsupported format
+		'''
+		
+		self.assertRaises(ValueError, load_input_file, 'whatever', 'yaml')
+	
+	@patch('sys.stdin', new_callable=lambda: StringIO('{"a": 1}'))
+	def test_stdin(self, mock_stdin):
+		'''
+		Test "load_input_file" with the standard input, which is never cached
+		'''
+		
+		cache = DiskCache(self.directory / 'cache')
+		self.assertEqual({'a' : 1}, load_input_file('-', 'json', cache=cache))
+		self.assertFalse((self.directory / 'cache').exists())
+	
+	def test_cache(self):
+		'''
+		Test that the parsed values are reused until the file changes
+		'''
+		
+		cache = DiskCache(self.directory / 'cache')
+		path = self.directory / 'config.json'
+		path.write_text('{"a": 1}')
+		self.assertEqual({'a' : 1}, load_input_file(str(path), 'json', cache=cache))
+		
+		with patch.dict('simplifiedapp._input.INPUT_FILE_PARSERS', {'json' : None}):
+			self.assertEqual({'a' : 1}, load_input_file(str(path), 'json', cache=cache))
+		
+		path.write_text('{"a": 22}')
+		utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1000000))
+		self.assertEqual({'a' : 22}, load_input_file(str(path), 'json', cache=cache))
+	
+	def test_merge(self):
+		'''
+		Test "load_input_files" with later files overriding the earlier ones
+		'''
+		
+		first, second = self.directory / 'first.json', self.directory / 'second.ini'
+		first.write_text('{"a": 1, "b": 2}')
+		second.write_text('[DEFAULT]\nb = 3\n')
+		self.assertEqual({'a' : 1, 'b' : '3'}, load_input_files([(str(first), 'json'), (str(second), 'ini')]))
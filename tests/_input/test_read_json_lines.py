@@ -0,0 +1,46 @@
+#python
+'''
+Testing the _input.read_json_lines function
+'''
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from simplifiedapp._input import read_json_lines
+
+class TestReadJsonLines(TestCase):
+	'''
+	Tests for the read_json_lines function
+	'''
+	
+	def test_file(self):
+		'''
+		Test "read_json_lines" with a file, skipping blank lines
+		'''
+		
+		with TemporaryDirectory() as temp_dir:
+			path = Path(temp_dir) / 'input.jsonl'
+			path.write_text('{"a": 1}\n\n[2]\n')
+			expected_result = [(1, {'a' : 1}), (3, [2])]
+			self.assertEqual(expected_result, list(read_json_lines(str(path))))
+	
+	@patch('sys.stdin', new_callable=lambda: StringIO('"x"\n'))
+	def test_stdin(self, mock_stdin):
+		'''
+		Test "read_json_lines" with the standard input
+		'''
+		
+		self.assertEqual([(1, 'x')], list(read_json_lines('-')))
+	
+	@patch('sys.stdin', new_callable=lambda: StringIO('{}\n{nope\n'))
+	def test_invalid_line(self, mock_stdin):
+		'''
+		Test "read_json_lines" with an invalid line
+		'''
+		
+		lines = read_json_lines('-')
+		self.assertEqual((1, {}), next(lines))
+		self.assertRaisesRegex(ValueError, 'line 2', next, lines)
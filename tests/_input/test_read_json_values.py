@@ -0,0 +1,76 @@
+#python
+'''
+Testing the _input.read_json_values function
+'''
+
+from io import StringIO
+from json import dumps as json_dumps
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from simplifiedapp._input import read_json_values
+
+VALUES = [1, -2.5e10, 'a, b]', {'key' : [1, 2]}, [], True, None, 12345]
+
+class TestReadJsonValues(TestCase):
+	'''
+	Tests for the read_json_values function
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.path = Path(self.temp_dir.name) / 'input.json'
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def _read(self, text, chunk_size=3):
+		self.path.write_text(text)
+		return list(read_json_values(str(self.path), chunk_size=chunk_size))
+	
+	def test_array(self):
+		'''
+		Test "read_json_values" with a JSON array, in small chunks
+		'''
+		
+		self.assertEqual(VALUES, self._read(json_dumps(VALUES)))
+		self.assertEqual(VALUES, self._read(json_dumps(VALUES, indent=2), chunk_size=1))
+		self.assertEqual([], self._read(' [ ] '))
+	
+	def test_json_lines(self):
+		'''
+		Test "read_json_values" with JSON Lines, in small chunks
+		'''
+		
+		self.assertEqual(VALUES, self._read('\n'.join(json_dumps(value) for value in VALUES) + '\n\n'))
+		self.assertEqual([], self._read(''))
+	
+	def test_lazy(self):
+		'''
+		Test that the values are produced before reading the whole input
+		'''
+		
+		self.path.write_text('[1, 2, ' + 'x' * 100)
+		values = read_json_values(str(self.path), chunk_size=4)
+		self.assertEqual([1, 2], [next(values), next(values)])
+		self.assertRaises(ValueError, next, values)
+		values.close()
+	
+	def test_invalid(self):
+		'''
+		Test "read_json_values" with broken inputs
+		'''
+		
+		for text in ('[1, 2', '[1 2]', '[1] x', '{"a": ', '1 2 x'):
+			with self.subTest(text=text):
+				self.assertRaises(ValueError, self._read, text)
+	
+	@patch('sys.stdin', new_callable=lambda: StringIO('{"a": 1}\n{"a": 2}\n'))
+	def test_stdin(self, mock_stdin):
+		'''
+		Test "read_json_values" with the standard input
+		'''
+		
+		self.assertEqual([{'a' : 1}, {'a' : 2}], list(read_json_values('-')))
@@ -142,3 +142,27 @@ class TestCallableBind(TestCase):
 		}
 		expected_result = ('deepos',), {'kw_arg': 'deepkw'}
 		self.assertEqual(expected_result, Callable(FixtureDeepClassL1.FixtureDeepClassL2.FixtureDeepClassL3.deep_method).bind(**args_w_keys))
+	
+	def test_skipped_default_positional(self):
+		'''
+		Test "Callable.bind" with a default positional parameter skipped before a provided one
+		'''
+		
+		args_w_keys = {
+			'a': 'ay',
+			'b': 'bee',
+			'd': 'dee',
+		}
+		expected_result = ('ay', 'bee', False, 'dee'), {}
+		self.assertEqual(expected_result, Callable(fixture_function_w_default_mixed_args).bind(**args_w_keys))
+	
+	def test_binding_plan_compiled_once(self):
+		'''
+		Test that "Callable.bind" reuses the compiled binding plan
+		'''
+		
+		callable_ = Callable(fixture_function_w_default_mixed_args)
+		callable_.bind('ay', 'bee')
+		plan = callable_.binding_plan
+		callable_.bind('ay', 'bee', d='dee')
+		self.assertIs(plan, callable_.binding_plan)
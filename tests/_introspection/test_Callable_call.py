@@ -8,6 +8,7 @@ from unittest import TestCase
 from fixtures.functions import *
 from fixtures.classes import *
 from simplifiedapp.introspection_patched import Callable
+from simplifiedapp._pool import InstancePool
 
 class TestExecuteCallable(TestCase):
 	'''
@@ -125,6 +126,19 @@ class TestExecuteCallable(TestCase):
 		expected_result = 'ultra-pre-bound-method_b'
 		self.assertEqual(expected_result, Callable(FixtureClassWMethods.bound_method)(init_args, method_args))
 	
+	def test_class_w_bound_method_pooled(self):
+		'''
+		Test "Callable.__call__" with a bound method reusing the parent instance from an explicit pool
+		'''
+		
+		pool = InstancePool()
+		callable_ = Callable(FixtureClassWMethods.bound_method)
+		first = callable_({'init_arg' : 'pre'}, {'pos_arg' : 'first'}, instance_pool=pool)
+		second = callable_({'init_arg' : 'pre'}, {'pos_arg' : 'second'}, instance_pool=pool)
+		self.assertEqual(('ultra-pre-bound-first', 'ultra-pre-bound-second'), (first, second))
+		self.assertEqual(1, len(pool))
+		self.assertFalse(hasattr(Callable, 'instance_pool'))
+	
 	def test_deep_class_w_bound_method(self):
 		'''
 		Test "Callable.__call__" with a bound method on a deep class
@@ -139,3 +153,19 @@ class TestExecuteCallable(TestCase):
 		}
 		expected_result = 'pre-deepos-deepkw'
 		self.assertEqual(expected_result, Callable(FixtureDeepClassL1.FixtureDeepClassL2.FixtureDeepClassL3.deep_method)(init_args, method_args))
+	
+	def test_coroutine_function(self):
+		'''
+		Test "Callable.__call__" with a coroutine function
+		'''
+		
+		callable_ = Callable(fixture_async_function)
+		self.assertTrue(callable_.is_async)
+		self.assertEqual('x|y', callable_(a='x', b='y'))
+	
+	def test_async_generator(self):
+		'''
+		Test "Callable.__call__" with an asynchronous generator function
+		'''
+		
+		self.assertEqual([0, 1], Callable(fixture_async_generator)(count=2))
@@ -0,0 +1,63 @@
+#python
+'''
+Testing the introspection_patched.Callable instance interning
+'''
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from fixtures.functions import *
+from fixtures.classes import *
+from simplifiedapp.introspection_patched import Callable
+
+class TestCallableFlyweight(TestCase):
+	'''
+	Tests for the Callable interning
+	'''
+	
+	def setUp(self):
+		Callable.clear_registry()
+	
+	def test_same_instance(self):
+		'''
+		Test "Callable" returning the same instance for the same callable
+		'''
+		
+		self.assertIs(Callable(fixture_empty_function), Callable(fixture_empty_function))
+		self.assertIsNot(Callable(fixture_empty_function), Callable(fixture_function_w_varargs))
+	
+	def test_signature_computed_once(self):
+		'''
+		Test "Callable.__call__" on an instance method computing the signatures only once
+		'''
+		
+		init_args, method_args = {'init_arg': 'pre'}, {'pos_arg': 'method_b'}
+		with patch.object(Callable, '_get_signature_detect_type', autospec=True, side_effect=Callable._get_signature_detect_type) as mock_detect:
+			for _ in range(5):
+				self.assertEqual('ultra-pre-bound-method_b', Callable(FixtureClassWMethods.bound_method)(init_args, method_args))
+		self.assertEqual(2, mock_detect.call_count)
+	
+	def test_bounded_registry(self):
+		'''
+		Test "Callable" keeping strong references only for the most recent instances
+		'''
+		
+		with patch.object(Callable, 'REGISTRY_SIZE', 2):
+			for callable_ in (fixture_empty_function, fixture_function_w_varargs, fixture_function_w_varkw):
+				Callable(callable_)
+			self.assertEqual(2, len(Callable._recent_instances))
+			self.assertEqual(2, len(Callable._live_instances))
+	
+	def test_unhashable_callable(self):
+		'''
+		Test "Callable" with an unhashable callable (not interned)
+		'''
+		
+		class FixtureUnhashableCallable:
+			__hash__ = None
+			def __call__(self):
+				return True
+		
+		unhashable_callable = FixtureUnhashableCallable()
+		self.assertIsNot(Callable(unhashable_callable), Callable(unhashable_callable))
+		self.assertTrue(Callable(unhashable_callable)())
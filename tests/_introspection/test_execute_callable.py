@@ -3,11 +3,13 @@
 Testing the introspection.param_metadata function
 '''
 
+from inspect import iscoroutine
 from unittest import TestCase
 
 from fixtures.functions import *
 from fixtures.classes import *
 from simplifiedapp._introspection import execute_callable
+from simplifiedapp._pool import InstancePool
 
 class TestExecuteCallable(TestCase):
 	'''
@@ -135,3 +137,31 @@ class TestExecuteCallable(TestCase):
 		}
 		expected_result = 'pre-deepos-deepkw'
 		self.assertEqual(expected_result, execute_callable(FixtureDeepClassL1.FixtureDeepClassL2.FixtureDeepClassL3.deep_method, args_w_keys=args_w_keys))
+
+	def test_coroutine_function(self):
+		'''
+		Test "execute_callable" with a coroutine function
+		'''
+
+		expected_result = 'x|bee'
+		self.assertEqual(expected_result, execute_callable(fixture_async_function, {'a' : 'x'}))
+
+	def test_coroutine_function_raw(self):
+		'''
+		Test "execute_callable" with a coroutine function and no event loop
+		'''
+
+		result = execute_callable(fixture_async_function, {'a' : 'x'}, loop_factory=None)
+		self.assertTrue(iscoroutine(result))
+		result.close()
+
+	def test_class_w_bound_method_pooled(self):
+		'''
+		Test "execute_callable" with an instance method reusing the parent instance from a pool
+		'''
+
+		pool = InstancePool()
+		first = execute_callable(FixtureClassWMethods.bound_method, args_w_keys={'init_arg' : 'foo', 'pos_arg' : 'bar'}, instance_pool=pool)
+		second = execute_callable(FixtureClassWMethods.bound_method, args_w_keys={'init_arg' : 'foo', 'pos_arg' : 'baz'}, instance_pool=pool)
+		self.assertEqual(('ultra-foo-bound-bar', 'ultra-foo-bound-baz'), (first, second))
+		self.assertEqual(1, len(pool))
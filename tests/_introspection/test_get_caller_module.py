@@ -0,0 +1,36 @@
+#python
+'''
+Testing the _introspection.get_caller_module function
+'''
+
+from sys import modules
+from unittest import TestCase
+
+from simplifiedapp._introspection import get_caller_module
+
+class TestGetCallerModule(TestCase):
+	'''
+	Tests for the get_caller_module function
+	'''
+	
+	def test_direct_caller(self):
+		'''
+		Test "get_caller_module" for the module of the caller
+		'''
+
+		self.assertIs(modules[__name__], get_caller_module(depth=0))
+
+	def test_outer_caller(self):
+		'''
+		Test "get_caller_module" going up the stack
+		'''
+
+		import unittest.case
+		self.assertIs(unittest.case, get_caller_module(depth=1))
+
+	def test_too_deep(self):
+		'''
+		Test "get_caller_module" past the top of the stack
+		'''
+
+		self.assertIsNone(get_caller_module(depth=100000))
@@ -84,3 +84,13 @@ class TestGetTarget(TestCase):
 		'''
 
 		self.assertRaises(ValueError, get_target, 'fixtures.fixture_invalid_module_dir')
+
+	def test_module_member_as_string(self):
+		'''
+		Test "get_target" with a "module:qualified.name" string
+		'''
+
+		from fixtures.classes import FixtureDeepClassL1
+		expected_result = (FixtureDeepClassL1.FixtureDeepClassL2, IS_CLASS)
+		self.assertEqual(expected_result, get_target('fixtures.classes:FixtureDeepClassL1.FixtureDeepClassL2'))
+		self.assertRaises(ValueError, get_target, 'fixtures.classes:FixtureMissingClass')
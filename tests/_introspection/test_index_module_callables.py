@@ -0,0 +1,33 @@
+#python
+'''
+Testing the _introspection.index_module_callables function
+'''
+
+from types import ModuleType
+from unittest import TestCase
+
+import fixtures.fixture_module_w_callables
+from simplifiedapp._introspection import index_module_callables
+
+class TestIndexModuleCallables(TestCase):
+	'''
+	Tests for the index_module_callables function
+	'''
+	
+	def test_imported_function(self):
+		'''
+		Test "index_module_callables" leaving out the functions imported by the module
+		'''
+		
+		result = index_module_callables(fixtures.fixture_module_w_callables)
+		self.assertEqual(['first_function', 'second_function', 'ModuleClass'], list(result))
+		self.assertNotIn('join', result)
+	
+	def test_all(self):
+		'''
+		Test "index_module_callables" honoring "__all__"
+		'''
+		
+		module = ModuleType('fixture_module_w_all')
+		exec('from os.path import join\ndef local_function():\n\tpass\ndef hidden_function():\n\tpass\n__all__ = ["join", "local_function", "missing_function"]', vars(module))
+		self.assertEqual(['join', 'local_function'], list(index_module_callables(module)))
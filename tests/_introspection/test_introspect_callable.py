@@ -0,0 +1,65 @@
+#python
+'''
+Testing the _introspection.introspect_callable function
+'''
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from fixtures.functions import *
+from simplifiedapp._cache import DiskCache
+from simplifiedapp._introspection import introspect_callable, object_metadata, parameters_from_callable
+
+class TestIntrospectCallable(TestCase):
+	'''
+	Tests for the introspect_callable function
+	'''
+	
+	def test_without_cache(self):
+		'''
+		Test "introspect_callable" without a cache
+		'''
+		
+		expected_result = object_metadata(fixture_function_w_default_mixed_args), parameters_from_callable(fixture_function_w_default_mixed_args)
+		self.assertEqual(expected_result, introspect_callable(fixture_function_w_default_mixed_args))
+	
+	def test_warm_cache(self):
+		'''
+		Test "introspect_callable" skipping the introspection on a warm cache
+		'''
+		
+		with TemporaryDirectory() as temp_dir:
+			cache = DiskCache(temp_dir)
+			expected_result = introspect_callable(fixture_function_w_default_mixed_args, cache=cache)
+			with patch('simplifiedapp._introspection.parameters_from_callable') as mock_parameters:
+				self.assertEqual(expected_result, introspect_callable(fixture_function_w_default_mixed_args, cache=cache))
+				mock_parameters.assert_not_called()
+	
+	def test_local_callable(self):
+		'''
+		Test "introspect_callable" with a local function (not cacheable)
+		'''
+		
+		def fixture_local_function(a, b=2):
+			pass
+		
+		with TemporaryDirectory() as temp_dir:
+			cache = DiskCache(temp_dir)
+			introspect_callable(fixture_local_function, cache=cache)
+			with patch('simplifiedapp._introspection.parameters_from_callable', return_value={}) as mock_parameters:
+				introspect_callable(fixture_local_function, cache=cache)
+				mock_parameters.assert_called_once()
+	
+	def test_sentinel_default(self):
+		'''
+		Test "introspect_callable" not caching a callable with a sentinel default
+		'''
+		
+		with TemporaryDirectory() as temp_dir:
+			cache = DiskCache(temp_dir)
+			introspect_callable(fixture_function_w_sentinel_default, cache=cache)
+			with patch('simplifiedapp._introspection.parameters_from_callable', wraps=parameters_from_callable) as mock_parameters:
+				metadata, parameters = introspect_callable(fixture_function_w_sentinel_default, cache=cache)
+				mock_parameters.assert_called_once()
+			self.assertIs(FIXTURE_UNSET, parameters['a']['default'])
@@ -4,8 +4,13 @@ Testing the _introspection.object_metadata function
 '''
 
 from unittest import TestCase
+from unittest.mock import patch
+
+from docstring_parser import parse as docstring_parse
 
 from fixtures import _introspection as fixtures_introspection
+from simplifiedapp import _introspection
+from simplifiedapp._introspection import clear_metadata_cache
 from simplifiedapp.introspection_patched import object_metadata
 
 VERSION_REGEXP = r'\d+\.\d+\.\d+(?:\.(dev|post)\d+)?'
@@ -112,3 +117,62 @@ class TestObjectMetadata(TestCase):
 		
 		expected_value = '<lambda>'
 		self.assertEqual(expected_value, metadata['name'])
+	
+	def test_memoized(self):
+		'''
+		Testing "object_metadata" parsing the docstring only once
+		'''
+		
+		clear_metadata_cache(fixtures_introspection.fixture_documented_function)
+		with patch('simplifiedapp._introspection.docstring_parse', wraps=docstring_parse) as mock_parse:
+			first_metadata = object_metadata(fixtures_introspection.fixture_documented_function)
+			self.assertIs(first_metadata, object_metadata(fixtures_introspection.fixture_documented_function))
+			mock_parse.assert_called_once()
+	
+	def test_docstring_change(self):
+		'''
+		Testing "object_metadata" discarding the memoized value when the docstring changes
+		'''
+		
+		def fixture_function():
+			'''First description'''
+		
+		self.assertEqual('First description', object_metadata(fixture_function)['description'])
+		fixture_function.__doc__ = '''Second description'''
+		self.assertEqual('Second description', object_metadata(fixture_function)['description'])
+	
+	def test_clear_cache(self):
+		'''
+		Testing "clear_metadata_cache" with a memoized object that can't be weakly referenced
+		'''
+		
+		with patch('simplifiedapp._introspection.docstring_parse', wraps=docstring_parse) as mock_parse:
+			object_metadata(len)
+			object_metadata(len)
+			clear_metadata_cache(len)
+			object_metadata(len)
+			self.assertEqual(2, mock_parse.call_count)
+	
+	def test_id_cache_bounded(self):
+		'''
+		Testing that the memoized metadata of objects that can't be weakly referenced is bounded
+		'''
+		
+		class SlottedCallable:
+			'''Callable without weak references'''
+			__slots__ = ('__name__',)
+			def __init__(self, name):
+				self.__name__ = name
+			def __call__(self):
+				pass
+		
+		first, second, third, fourth = (SlottedCallable(name) for name in ('first', 'second', 'third', 'fourth'))
+		clear_metadata_cache()
+		with patch('simplifiedapp._introspection.METADATA_ID_CACHE_SIZE', 2):
+			for obj in (first, second, third):
+				_introspection.object_metadata(obj)
+			self.assertEqual([id(second), id(third)], list(_introspection._METADATA_ID_CACHE))
+			_introspection.object_metadata(second)
+			_introspection.object_metadata(fourth)
+			self.assertEqual([id(second), id(fourth)], list(_introspection._METADATA_ID_CACHE))
+		clear_metadata_cache()
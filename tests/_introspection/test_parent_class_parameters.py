@@ -0,0 +1,55 @@
+#python
+'''
+Testing the _introspection.parent_class_parameters function
+'''
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from fixtures.classes import *
+from simplifiedapp._introspection import clear_metadata_cache, parameters_from_class, parent_class_parameters
+
+class TestParentClassParameters(TestCase):
+	'''
+	Tests for the parent_class_parameters function
+	'''
+	
+	def setUp(self):
+		'''
+		Start every test without memoized parameters
+		'''
+		
+		clear_metadata_cache()
+	
+	def test_same_as_class_parameters(self):
+		'''
+		Test that the result matches "parameters_from_class"
+		'''
+		
+		self.assertEqual(parameters_from_class(FixtureClassWMethods), parent_class_parameters(FixtureClassWMethods))
+	
+	@patch('simplifiedapp._introspection.parameters_from_class', wraps=parameters_from_class)
+	def test_memoized(self, mock_parameters):
+		'''
+		Test that the class is introspected only once
+		'''
+		
+		first = parent_class_parameters(FixtureClassWMethods)
+		second = parent_class_parameters(FixtureClassWMethods)
+		self.assertIs(first, second)
+		mock_parameters.assert_called_once_with(FixtureClassWMethods)
+	
+	def test_constructor_change(self):
+		'''
+		Test that a new constructor invalidates the memoized parameters
+		'''
+		
+		class Parent:
+			def __init__(self, first):
+				pass
+		
+		self.assertEqual(['first'], list(parent_class_parameters(Parent)))
+		def __init__(self, second):
+			pass
+		Parent.__init__ = __init__
+		self.assertEqual(['second'], list(parent_class_parameters(Parent)))
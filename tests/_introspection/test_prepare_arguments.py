@@ -0,0 +1,52 @@
+#python
+'''
+Testing the _introspection.prepare_arguments function
+'''
+
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._introspection import compile_arguments, parameters_from_function, prepare_arguments
+
+class TestPrepareArguments(TestCase):
+	'''
+	Tests for the prepare_arguments function
+	'''
+	
+	def test_defaults(self):
+		'''
+		Test "prepare_arguments" filling the missing values with the defaults
+		'''
+		
+		parameters = parameters_from_function(fixture_function_w_result)
+		expected_result = ['ay', 'bee'], {'c' : False, 'd' : 4}
+		self.assertEqual(expected_result, prepare_arguments(parameters, {'a' : 'ay'}))
+	
+	def test_all_values(self):
+		'''
+		Test "prepare_arguments" with values for every parameter
+		'''
+		
+		parameters = parameters_from_function(fixture_function_w_result)
+		args_w_keys = {'a' : 'ay', 'b' : 'be', 'args' : ['x', 'y'], 'c' : True, 'd' : 5, 'kwargs' : {'e' : 'ee'}}
+		expected_result = ['ay', 'be', 'x', 'y'], {'c' : True, 'd' : 5, 'e' : 'ee'}
+		self.assertEqual(expected_result, prepare_arguments(parameters, args_w_keys))
+	
+	def test_missing_value(self):
+		'''
+		Test "prepare_arguments" with a missing required parameter
+		'''
+		
+		parameters = parameters_from_function(fixture_function_w_result)
+		self.assertRaises(ValueError, prepare_arguments, parameters, {})
+	
+	def test_precompiled_plan(self):
+		'''
+		Test "prepare_arguments" with a plan from "compile_arguments"
+		'''
+		
+		parameters = parameters_from_function(fixture_function_w_result)
+		plan = compile_arguments(parameters)
+		for value in ('one', 'two'):
+			expected_result = [value, 'bee'], {'c' : False, 'd' : 4}
+			self.assertEqual(expected_result, prepare_arguments(parameters, {'a' : value}, plan=plan))
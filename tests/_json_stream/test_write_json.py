@@ -0,0 +1,119 @@
+#python
+'''
+Testing the _json_stream.write_json function
+'''
+
+from decimal import Decimal
+from io import BytesIO
+from json import loads as json_loads
+from unittest import TestCase
+from unittest.mock import patch
+
+from simplifiedapp._json_stream import STREAM_THRESHOLD, fast_json_encoder, iter_json_chunks, write_json
+from simplifiedapp._serializers import SerializerRegistry
+
+class TestWriteJson(TestCase):
+	'''
+	Tests for the write_json function
+	'''
+	
+	def _write(self, value, chunk_size=16):
+		stream = BytesIO()
+		write_json(value, stream, chunk_size=chunk_size)
+		return stream.getvalue()
+	
+	def test_small_value(self):
+		'''
+		Test that small values are written as a single JSON document
+		'''
+		
+		self.assertEqual(b'{"a":[1,2],"b":null}\n', self._write({'a' : [1, 2], 'b' : None}))
+	
+	def test_big_structures(self):
+		'''
+		Test that big lists and mappings are walked and produce the same document
+		'''
+		
+		value = {'items' : [{'n' : n, 'tags' : ['x'] * 3} for n in range(STREAM_THRESHOLD * 2)], 'index' : {n : str(n) for n in range(STREAM_THRESHOLD * 2)}}
+		expected = {'items' : value['items'], 'index' : {str(key) : item for key, item in value['index'].items()}}
+		self.assertEqual(expected, json_loads(self._write(value)))
+	
+	def test_small_wrapper(self):
+		'''
+		Test that a small mapping wrapping a big list is walked instead of being encoded in one go
+		'''
+		
+		value = {'items' : list(range(STREAM_THRESHOLD * 100))}
+		pieces = list(iter_json_chunks(value))
+		self.assertGreater(len(pieces), STREAM_THRESHOLD)
+		self.assertLess(max(len(piece) for piece in pieces), 64)
+		self.assertEqual(value, json_loads(self._write(value)))
+	
+	def test_iterator(self):
+		'''
+		Test that iterators are written as arrays, item by item
+		'''
+		
+		self.assertEqual(b'[0,1,2]\n', self._write(iter(range(3))))
+		self.assertEqual(b'[]\n', self._write(iter(())))
+		self.assertGreater(len(list(iter_json_chunks(iter(range(3))))), 3)
+	
+	def test_not_serializable(self):
+		'''
+		Test that values that are not JSON serializable are converted with "str"
+		'''
+		
+		self.assertEqual(b'["1.5"]\n', self._write([Decimal('1.5')]))
+	
+	def test_chunked_writes(self):
+		'''
+		Test that the document is written in several chunks
+		'''
+		
+		stream = BytesIO()
+		with patch.object(stream, 'write', wraps=stream.write) as mock_write:
+			write_json(iter(range(100)), stream, chunk_size=16)
+		self.assertGreater(mock_write.call_count, 1)
+		self.assertEqual(list(range(100)), json_loads(stream.getvalue()))
+	
+	def test_serializers(self):
+		'''
+		Test that the registered serializers are used, with and without orjson
+		'''
+		
+		from dataclasses import dataclass
+		from datetime import date
+		
+		@dataclass
+		class Record:
+			day : date
+		
+		expected = b'[{"day":"2020-01-02"}]\n'
+		self.assertEqual(expected, self._write([Record(date(2020, 1, 2))]))
+		with patch.dict('sys.modules', {'orjson' : None}):
+			self.assertEqual(expected, self._write([Record(date(2020, 1, 2))]))
+	
+	def test_encoders_match(self):
+		'''
+		Test that orjson (if installed) and the standard library encoder produce the same document, including registered serializers for container subclasses
+		'''
+		
+		from typing import NamedTuple
+		
+		class Pair(NamedTuple):
+			x : int
+			y : int
+		
+		class Plain(NamedTuple):
+			x : int
+		
+		class Record(dict):
+			pass
+		
+		registry = SerializerRegistry()
+		registry.register(Pair, lambda value: {'X' : value.x, 'Y' : value.y})
+		value = {'pairs' : [Pair(1, 2), Pair(3, 4)], 'plain' : (Plain(5),), 'record' : Record(a=Plain(6))}
+		expected = b'{"pairs":[{"X":1,"Y":2},{"X":3,"Y":4}],"plain":[[5]],"record":{"a":[6]}}'
+		with patch('simplifiedapp._json_stream.SERIALIZERS', registry):
+			self.assertEqual(expected, fast_json_encoder(prefer_orjson=False)(value))
+			self.assertEqual(expected, fast_json_encoder()(value))
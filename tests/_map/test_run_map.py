@@ -0,0 +1,68 @@
+#python
+'''
+Testing the _map.run_map function
+'''
+
+from io import StringIO
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._introspection import introspect_callable
+from simplifiedapp._map import map_arguments, run_map
+from simplifiedapp._output import IncrementalWriter
+
+class TestRunMap(TestCase):
+	'''
+	Tests for the run_map function
+	'''
+	
+	def _run(self, callable_, args_w_keys, parameter, **kwargs):
+		_, parameters = introspect_callable(callable_)
+		stream = StringIO()
+		with IncrementalWriter(stream) as writer:
+			counts = run_map(callable_, args_w_keys, parameter, parameters, writer, **kwargs)
+		return counts, stream.getvalue()
+	
+	def test_thread_ordered(self):
+		'''
+		Test "run_map" over a variable positional parameter with threads
+		'''
+		
+		expected_result = (3, 0), "a|b|('x',)|False|4|[]\na|b|('y',)|False|4|[]\na|b|('z',)|False|4|[]\n"
+		self.assertEqual(expected_result, self._run(fixture_function_w_result, {'a' : 'a', 'b' : 'b', 'args' : ['x', 'y', 'z']}, 'args', workers=2))
+	
+	def test_thread_unordered(self):
+		'''
+		Test "run_map" with unordered emission
+		'''
+		
+		counts, output = self._run(fixture_function_w_result, {'a' : 'a', 'args' : list(range(10))}, 'args', workers=3, ordered=False)
+		self.assertEqual((10, 0), counts)
+		self.assertEqual(sorted("a|bee|({},)|False|4|[]".format(number) for number in range(10)), sorted(output.splitlines()))
+	
+	def test_process(self):
+		'''
+		Test "run_map" with a process pool
+		'''
+		
+		expected_result = (3, 0), '1\n2\n3\n'
+		self.assertEqual(expected_result, self._run(fixture_function_w_sum, {'values' : ['1', '2', '3']}, 'values', workers=2, executor='process', format_='jsonl'))
+	
+	def test_failure(self):
+		'''
+		Test "run_map" with a failing call
+		'''
+		
+		with self.assertLogs('simplifiedapp._map', level='ERROR'):
+			counts, output = self._run(fixture_function_w_sum, {'values' : ['1', 'x']}, 'values', workers=1, format_='jsonl')
+		self.assertEqual((2, 1), counts)
+		self.assertEqual('1\nnull\n', output)
+	
+	def test_not_iterable(self):
+		'''
+		Test "map_arguments" with a parameter that isn't iterable
+		'''
+		
+		_, parameters = introspect_callable(fixture_function_w_result)
+		self.assertRaises(ValueError, map_arguments, {'a' : 'abc'}, 'a', parameters)
+		self.assertRaises(ValueError, map_arguments, {}, 'unknown', parameters)
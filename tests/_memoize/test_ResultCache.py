@@ -0,0 +1,61 @@
+#python
+'''
+Testing the _memoize.ResultCache class
+'''
+
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from simplifiedapp._memoize import ResultCache
+
+class TestResultCache(TestCase):
+	'''
+	Tests for the ResultCache class
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.directory = Path(self.temp_dir.name)
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def test_roundtrip(self):
+		'''
+		Test storing and loading a result, including None
+		'''
+		
+		cache = ResultCache(self.directory)
+		self.assertTrue(cache.set('key', None))
+		self.assertIsNone(cache.get('key', 'missing'))
+		self.assertEqual('missing', cache.get('other', 'missing'))
+	
+	def test_ttl(self):
+		'''
+		Test that expired results are ignored
+		'''
+		
+		cache = ResultCache(self.directory)
+		with patch('simplifiedapp._memoize.time', return_value=1000.0):
+			cache.set('key', 'value', ttl=10)
+			self.assertEqual('value', cache.get('key', 'missing'))
+		with patch('simplifiedapp._memoize.time', return_value=1010.0):
+			self.assertEqual('missing', cache.get('key', 'missing'))
+	
+	def test_lru_eviction(self):
+		'''
+		Test that the least recently used results are evicted when the cache is too big
+		'''
+		
+		cache = ResultCache(self.directory)
+		cache.set('first', 'x' * 100)
+		cache.set('second', 'y' * 100)
+		cache.max_size = cache._path_for('first').stat().st_size * 2
+		utime(cache._path_for('first'), ns=(1, 1))
+		utime(cache._path_for('second'), ns=(2, 2))
+		cache.get('first')
+		cache.set('third', 'z' * 100)
+		self.assertEqual(('x' * 100, None, 'z' * 100), (cache.get('first'), cache.get('second'), cache.get('third')))
@@ -0,0 +1,108 @@
+#python
+'''
+Testing the _memoize.execute_memoized function
+'''
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from fixtures.functions import FIXTURE_MEMOIZED_CALLS, fixture_async_function, fixture_function_w_result, fixture_memoized_function
+from simplifiedapp._memoize import ResultCache, execute_memoized, memoize, memoize_options, stable_digest
+
+class MemoizedMethods:
+	
+	def __init__(self, factor=1):
+		self.factor = factor
+	
+	@memoize
+	def scale(self, value):
+		FIXTURE_MEMOIZED_CALLS.append(value)
+		return value * self.factor
+
+@memoize
+async def memoized_coroutine(value):
+	return value
+
+class TestExecuteMemoized(TestCase):
+	'''
+	Tests for the execute_memoized function
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.cache = ResultCache(Path(self.temp_dir.name))
+		FIXTURE_MEMOIZED_CALLS.clear()
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def test_memoized(self):
+		'''
+		Test that a memoized function runs once per set of arguments
+		'''
+		
+		results = [execute_memoized(self.cache, fixture_memoized_function, {'a' : a}) for a in ('x', 'x', 'y')]
+		self.assertEqual(['x|bee', 'x|bee', 'y|bee'], results)
+		self.assertEqual([('x', 'bee'), ('y', 'bee')], FIXTURE_MEMOIZED_CALLS)
+	
+	def test_without_cache(self):
+		'''
+		Test that nothing is memoized without a cache
+		'''
+		
+		for _ in range(2):
+			execute_memoized(None, fixture_memoized_function, {'a' : 'x'})
+		self.assertEqual(2, len(FIXTURE_MEMOIZED_CALLS))
+	
+	def test_not_opted_in(self):
+		'''
+		Test that functions that didn't opt in are not memoized
+		'''
+		
+		execute_memoized(self.cache, fixture_function_w_result, {'a' : 'x'})
+		self.assertEqual([], list(Path(self.temp_dir.name).glob('*.pickle')))
+	
+	def test_memoize_decorator(self):
+		'''
+		Test the options set by the decorator, bare and with arguments
+		'''
+		
+		self.assertEqual({'ttl' : None}, memoize_options(memoize(lambda: None)))
+		self.assertEqual({'ttl' : 5}, memoize_options(memoize(ttl=5)(lambda: None)))
+		self.assertIsNone(memoize_options(fixture_async_function))
+	
+	def test_stable_digest(self):
+		'''
+		Test that the digest doesn't depend on the insertion order but does on the types
+		'''
+		
+		self.assertEqual(stable_digest({'a' : 1, 'b' : {2, 3}}), stable_digest({'b' : {3, 2}, 'a' : 1}))
+		self.assertNotEqual(stable_digest([1]), stable_digest((1,)))
+		self.assertNotEqual(stable_digest(1), stable_digest('1'))
+	
+	def test_method_not_memoized(self):
+		'''
+		Test that methods are not memoized, since the key doesn't cover their instance
+		'''
+		
+		results = [execute_memoized(self.cache, MemoizedMethods.scale, {'factor' : factor, 'value' : 2}) for factor in (1, 3)]
+		self.assertEqual([2, 6], results)
+		execute_memoized(self.cache, MemoizedMethods(3).scale, {'value' : 2})
+		self.assertEqual([2, 2, 2], FIXTURE_MEMOIZED_CALLS)
+		self.assertEqual([], list(Path(self.temp_dir.name).glob('*.pickle')))
+	
+	def test_resolve_loop_factory(self):
+		'''
+		Test that the asynchronous results of memoized callables are resolved on the provided loop factory
+		'''
+		
+		from asyncio import new_event_loop
+		
+		loops = []
+		def loop_factory():
+			loops.append(new_event_loop())
+			return loops[-1]
+		
+		self.assertEqual('x', execute_memoized(self.cache, memoized_coroutine, {'value' : 'x'}, resolve_loop_factory=loop_factory))
+		self.assertEqual(1, len(loops))
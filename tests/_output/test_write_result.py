@@ -0,0 +1,197 @@
+#python
+'''
+Testing the _output.write_result function
+'''
+
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest import TestCase
+
+from fixtures.functions import *
+from simplifiedapp._output import write_result
+
+class TestWriteResult(TestCase):
+	'''
+	Tests for the write_result function
+	'''
+	
+	def _write(self, result, format_='auto'):
+		stream = StringIO()
+		write_result(result, stream, format_=format_)
+		return stream.getvalue()
+	
+	def test_string(self):
+		'''
+		Test "write_result" with a string
+		'''
+		
+		self.assertEqual('as is', self._write('as is'))
+	
+	def test_object(self):
+		'''
+		Test "write_result" with an object
+		'''
+		
+		self.assertEqual("{'a': [1, 2]}\n", self._write({'a' : [1, 2]}))
+	
+	def test_container_subclass_serializer(self):
+		'''
+		Test "write_result" using the serializer registered for a subclass of a builtin container
+		'''
+		
+		from typing import NamedTuple
+		from simplifiedapp._serializers import SERIALIZERS
+		
+		class Pair(NamedTuple):
+			x : int
+			y : int
+		
+		self.assertEqual('(1, 2)\n', self._write(Pair(1, 2)))
+		SERIALIZERS.register(Pair, lambda value: 'pair {} & {}'.format(*value))
+		self.assertEqual('pair 1 & 2', self._write(Pair(1, 2)))
+	
+	def test_generator(self):
+		'''
+		Test "write_result" with a generator
+		'''
+		
+		self.assertEqual("{'number': 0}\n{'number': 1}\n", self._write(fixture_generator(2)))
+	
+	def test_generator_jsonl(self):
+		'''
+		Test "write_result" with a generator as JSON Lines
+		'''
+		
+		self.assertEqual('{"number": 0}\n{"number": 1}\n', self._write(fixture_generator(2), format_='jsonl'))
+	
+	def test_list_lines(self):
+		'''
+		Test "write_result" with a list and an explicit line format
+		'''
+		
+		self.assertEqual('a\n1\n', self._write(['a', 1], format_='lines'))
+	
+	def test_scalar_jsonl(self):
+		'''
+		Test "write_result" with a single value as JSON Lines
+		'''
+		
+		self.assertEqual('{"a": 1}\n', self._write({'a' : 1}, format_='jsonl'))
+	
+	def test_async_generator(self):
+		'''
+		Test "write_result" with an asynchronous generator
+		'''
+		
+		self.assertEqual('0\n1\n', self._write(fixture_async_generator(2)))
+	
+	def test_coroutine(self):
+		'''
+		Test "write_result" with a coroutine
+		'''
+		
+		self.assertEqual('x|bee', self._write(fixture_async_function('x')))
+	
+	def test_incremental(self):
+		'''
+		Test that the items reach the stream while the generator is still running
+		'''
+		
+		buffer = BytesIO()
+		stream = TextIOWrapper(buffer, encoding='utf-8')
+		seen = []
+		def generator():
+			yield 'first'
+			seen.append(buffer.getvalue())
+			yield 'second'
+		write_result(generator(), stream)
+		self.assertEqual([b'first\n'], seen)
+		self.assertEqual(b'first\nsecond\n', buffer.getvalue())
+	
+	def test_unknown_format(self):
+		'''
+		Test "write_result" with an unknown format
+		'''
+		
+		self.assertRaises(ValueError, self._write, 'x', 'xml')
+	
+	def test_json(self):
+		'''
+		Test "write_result" with the json format
+		'''
+		
+		self.assertEqual('{"a":[1,2]}\n', self._write({'a' : [1, 2]}, format_='json'))
+	
+	def test_json_async_generator(self):
+		'''
+		Test "write_result" with the json format and an asynchronous generator
+		'''
+		
+		self.assertEqual('[0,1]\n', self._write(fixture_async_generator(2), format_='json'))
+	
+	def test_csv(self):
+		'''
+		Test "write_result" with the csv format and mappings
+		'''
+		
+		self.assertEqual('a,b\r\n1,x\r\n2,\r\n', self._write(iter([{'a' : 1, 'b' : 'x'}, {'a' : 2}]), format_='csv'))
+	
+	def test_tsv_async(self):
+		'''
+		Test "write_result" streaming an asynchronous generator as tsv
+		'''
+		
+		self.assertEqual('0\n1\n', self._write(fixture_async_generator(2), format_='tsv'))
+	
+	def test_queue_depth(self):
+		'''
+		Test "write_result" streaming a generator through the writer thread
+		'''
+		
+		stream = StringIO()
+		write_result(fixture_generator(3), stream, format_='jsonl', queue_depth=2)
+		self.assertEqual('{"number": 0}\n{"number": 1}\n{"number": 2}\n', stream.getvalue())
+	
+	def test_pickle(self):
+		'''
+		Test "write_result" with the pickle format
+		'''
+		
+		from pickle import loads as pickle_loads
+		
+		stream = TextIOWrapper(BytesIO(), encoding='utf-8')
+		write_result(fixture_generator(2), stream, format_='pickle')
+		self.assertEqual([{'number' : 0}, {'number' : 1}], pickle_loads(stream.buffer.getvalue()))
+	
+	def test_raw(self):
+		'''
+		Test "write_result" with the raw format
+		'''
+		
+		self.assertEqual('abc', self._write(iter(['a', b'b', 'c']), format_='raw'))
+	
+	def test_buffer(self):
+		'''
+		Test "write_result" with buffer protocol results
+		'''
+		
+		from array import array
+		
+		stream = TextIOWrapper(BytesIO(), encoding='utf-8')
+		write_result(array('H', [1, 2]), stream)
+		write_result(memoryview(b'0123456789')[::3], stream, format_='raw')
+		self.assertEqual(b'\x01\x00\x02\x000369', stream.buffer.getvalue())
+	
+	def test_buffer_slices(self):
+		'''
+		Test that big buffers are written in slices, without copies
+		'''
+		
+		from unittest.mock import patch
+		from simplifiedapp._output import IncrementalWriter, write_buffer
+		
+		stream = TextIOWrapper(BytesIO(), encoding='utf-8')
+		with patch.object(stream.buffer, 'write', wraps=stream.buffer.write) as mock_write, IncrementalWriter(stream) as writer:
+			write_buffer(bytearray(b'0123456789'), writer, slice_size=4)
+		self.assertEqual(3, mock_write.call_count)
+		self.assertTrue(all(isinstance(call.args[0], memoryview) for call in mock_write.call_args_list))
+		self.assertEqual(b'0123456789', stream.buffer.getvalue())
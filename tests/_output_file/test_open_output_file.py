@@ -0,0 +1,75 @@
+#python
+'''
+Testing the _output_file.open_output_file function
+'''
+
+from bz2 import decompress as bz2_decompress
+from gzip import decompress as gzip_decompress
+from lzma import decompress as lzma_decompress
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from simplifiedapp._output_file import open_output_file
+
+class TestOpenOutputFile(TestCase):
+	'''
+	Tests for the open_output_file function
+	'''
+	
+	def setUp(self):
+		self.temp_dir = TemporaryDirectory()
+		self.directory = Path(self.temp_dir.name)
+	
+	def tearDown(self):
+		self.temp_dir.cleanup()
+	
+	def test_plain(self):
+		'''
+		Test writing text and bytes into a plain file
+		'''
+		
+		path = self.directory / 'out.txt'
+		with open_output_file(path) as stream:
+			stream.write('text|')
+			stream.flush()
+			stream.buffer.write(b'bytes')
+		self.assertEqual(b'text|bytes', path.read_bytes())
+		self.assertEqual([path], list(self.directory.iterdir()))
+	
+	def test_compressed(self):
+		'''
+		Test that the compression is picked by the extension
+		'''
+		
+		for suffix, decompress in (('.gz', gzip_decompress), ('.bz2', bz2_decompress), ('.xz', lzma_decompress)):
+			path = self.directory / ('out.txt' + suffix)
+			with open_output_file(path) as stream:
+				stream.write('compressed')
+			self.assertEqual(b'compressed', decompress(path.read_bytes()))
+	
+	def test_not_visible_until_complete(self):
+		'''
+		Test that the final file doesn't exist until the context exits
+		'''
+		
+		path = self.directory / 'out.txt'
+		with open_output_file(path) as stream:
+			stream.write('x' * 100)
+			stream.flush()
+			self.assertFalse(path.exists())
+		self.assertTrue(path.exists())
+	
+	def test_discarded_on_error(self):
+		'''
+		Test that nothing is left behind (and the existing file is untouched) if there's an error
+		'''
+		
+		path = self.directory / 'out.txt'
+		path.write_text('previous')
+		with self.assertRaises(RuntimeError):
+			with open_output_file(path) as stream:
+				stream.write('partial')
+				raise RuntimeError('failed')
+		self.assertEqual('previous', path.read_text())
+		self.assertEqual([path], list(self.directory.iterdir()))
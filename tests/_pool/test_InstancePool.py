@@ -0,0 +1,125 @@
+#python
+'''
+Testing the _pool.InstancePool class
+'''
+
+from unittest import TestCase
+
+from simplifiedapp._pool import InstancePool, hashable_key
+
+class Resource:
+	'''
+	Class counting its instances and the closed ones
+	'''
+	
+	created = 0
+	
+	def __init__(self, *args, **kwargs):
+		type(self).created += 1
+		self.args, self.kwargs = args, kwargs
+		self.closed = False
+	
+	def close(self):
+		self.closed = True
+
+class ContextResource:
+	'''
+	Class with a context manager interface only
+	'''
+	
+	def __init__(self, value):
+		self.value = value
+		self.exited = False
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.exited = True
+
+class TestInstancePool(TestCase):
+	'''
+	Tests for the InstancePool class
+	'''
+	
+	def setUp(self):
+		Resource.created = 0
+	
+	def test_reuse(self):
+		'''
+		Test that the same arguments get the same instance
+		'''
+		
+		pool = InstancePool()
+		first = pool.get(Resource, ('a',), {'b' : [1, 2]})
+		second = pool.get(Resource, ('a',), {'b' : [1, 2]})
+		self.assertIs(first, second)
+		self.assertEqual(1, Resource.created)
+	
+	def test_different_arguments(self):
+		'''
+		Test that different arguments get different instances
+		'''
+		
+		pool = InstancePool()
+		self.assertIsNot(pool.get(Resource, ([1],)), pool.get(Resource, ((1,),)))
+		self.assertEqual(2, len(pool))
+	
+	def test_eviction(self):
+		'''
+		Test that the least recently used instance is evicted and closed
+		'''
+		
+		pool = InstancePool(max_size=2)
+		first, second = pool.get(Resource, (1,)), pool.get(Resource, (2,))
+		pool.get(Resource, (1,))
+		pool.get(Resource, (3,))
+		self.assertEqual((False, True), (first.closed, second.closed))
+		self.assertEqual(2, len(pool))
+	
+	def test_context_manager_instances(self):
+		'''
+		Test that instances without "close" are exited as context managers
+		'''
+		
+		with InstancePool() as pool:
+			instance = pool.get(ContextResource, ('x',))
+			self.assertFalse(instance.exited)
+		self.assertTrue(instance.exited)
+		self.assertEqual(0, len(pool))
+	
+	def test_unhashable_arguments(self):
+		'''
+		Test that instances with arguments that can't be hashed are not pooled
+		'''
+		
+		pool = InstancePool()
+		self.assertIsNot(pool.get(Resource, (object, bytearray(b'x'))), pool.get(Resource, (object, bytearray(b'x'))))
+		self.assertEqual(0, len(pool))
+	
+	def test_invalid_size(self):
+		'''
+		Test that the pool size should be positive
+		'''
+		
+		self.assertRaises(ValueError, InstancePool, 0)
+
+class TestHashableKey(TestCase):
+	'''
+	Tests for the hashable_key function
+	'''
+	
+	def test_equivalent_values(self):
+		'''
+		Test that equal values produce equal keys
+		'''
+		
+		self.assertEqual(hashable_key({'a' : [1, {2}], 'b' : None}), hashable_key({'b' : None, 'a' : [1, {2}]}))
+	
+	def test_types_distinguished(self):
+		'''
+		Test that equal values of different types produce different keys
+		'''
+		
+		self.assertNotEqual(hashable_key([1]), hashable_key((1,)))
+		self.assertNotEqual(hashable_key(1), hashable_key(True))
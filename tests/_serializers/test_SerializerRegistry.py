@@ -0,0 +1,86 @@
+#python
+'''
+Testing the _serializers.SerializerRegistry class
+'''
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from unittest import TestCase
+
+from simplifiedapp._serializers import SERIALIZERS, SerializerRegistry
+
+@dataclass
+class Point:
+	x : int
+	y : int
+
+class Color(Enum):
+	RED = 'red'
+
+class Base:
+	pass
+
+class Derived(Base):
+	pass
+
+class TestSerializerRegistry(TestCase):
+	'''
+	Tests for the SerializerRegistry class
+	'''
+	
+	def test_mro_dispatch(self):
+		'''
+		Test that the serializer of the closest class in the MRO is used
+		'''
+		
+		registry = SerializerRegistry()
+		registry.register(object, lambda value: 'object')
+		registry.register(Base, lambda value: 'base')
+		self.assertEqual(('base', 'object'), (registry.serialize(Derived()), registry.serialize(1.5)))
+	
+	def test_decorator_clears_cache(self):
+		'''
+		Test registering with the decorator, after a cached lookup
+		'''
+		
+		registry = SerializerRegistry()
+		self.assertIsNone(registry.lookup(Derived))
+		
+		@registry.register(Derived)
+		def serialize_derived(value):
+			return 'derived'
+		
+		self.assertIs(serialize_derived, registry.lookup(Derived))
+		self.assertIn(Derived, registry)
+	
+	def test_default(self):
+		'''
+		Test that the JSON default hook falls back to "str"
+		'''
+		
+		self.assertEqual('1', SerializerRegistry().default(1))
+	
+	def test_builtin_serializers(self):
+		'''
+		Test the serializers registered by default
+		'''
+		
+		self.assertEqual({'x' : 1, 'y' : 2}, SERIALIZERS.serialize(Point(1, 2)))
+		self.assertEqual('red', SERIALIZERS.serialize(Color.RED))
+		self.assertEqual('2020-01-02T03:04:05', SERIALIZERS.serialize(datetime(2020, 1, 2, 3, 4, 5)))
+		self.assertEqual([1], SERIALIZERS.serialize({1}))
+		self.assertEqual('plain', SERIALIZERS.serialize('plain'))
+	
+	def test_serialize_nested(self):
+		'''
+		Test that the content of lists, tuples, and dicts is serialized too, with the container subclasses as plain containers
+		'''
+		
+		class Record(dict):
+			pass
+		
+		registry = SerializerRegistry()
+		registry.register(Base, lambda value: 'base')
+		self.assertEqual({'a' : ['base', [1, 'base']]}, registry.serialize_nested(Record(a=(Derived(), [1, Base()]))))
+		self.assertIs(dict, type(registry.serialize_nested(Record())))
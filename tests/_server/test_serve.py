@@ -0,0 +1,144 @@
+#python
+'''
+Testing the _server.serve function, through the client
+'''
+
+from io import BytesIO
+from json import dumps as json_dumps
+from os import environ
+from pathlib import Path
+from socket import AF_UNIX, SOCK_STREAM, socket
+from stat import S_IMODE
+from subprocess import DEVNULL, PIPE, Popen, run
+from sys import executable
+from tempfile import TemporaryDirectory
+from time import sleep
+from unittest import TestCase
+
+from simplifiedapp._server import CHANNEL_EXIT, EXIT_CODE, REQUEST_HEADER, RESPONSE_FRAME, receive_exactly, run_client
+
+TESTS_DIR = Path(__file__).parent.parent
+PACKAGE_DIR = TESTS_DIR.parent
+
+class TestServe(TestCase):
+	'''
+	Tests for the daemon
+	'''
+	
+	def _serve(self, *options):
+		self.temp_dir = TemporaryDirectory()
+		self.addCleanup(self.temp_dir.cleanup)
+		self.socket_path = Path(self.temp_dir.name) / 'daemon.sock'
+		daemon = Popen([executable, '-m', 'simplifiedapp', 'serve', 'fixtures.fixture_module_w_callables', '--socket', str(self.socket_path), *options], cwd=TESTS_DIR, env=environ | {'PYTHONPATH' : '{}:{}'.format(TESTS_DIR, PACKAGE_DIR)}, stdout=DEVNULL, stderr=DEVNULL)
+		self.addCleanup(daemon.wait)
+		self.addCleanup(daemon.terminate)
+		for _ in range(100):
+			if self.socket_path.is_socket():
+				break
+			sleep(0.05)
+		else:
+			self.fail('The daemon did not start')
+	
+	def _run(self, *argv):
+		stdout, stderr = BytesIO(), BytesIO()
+		exit_code = run_client(self.socket_path, argv, stdout=stdout, stderr=stderr)
+		return exit_code, stdout.getvalue().decode(), stderr.getvalue().decode()
+	
+	def _run_command(self, *argv):
+		return run([executable, '-m', 'simplifiedapp', 'client', *argv], cwd=TESTS_DIR, env=environ | {'PYTHONPATH' : '{}:{}'.format(TESTS_DIR, PACKAGE_DIR)}, stdout=PIPE, stderr=PIPE, text=True)
+	
+	def _send_raw(self, request):
+		payload = json_dumps(request).encode('utf-8')
+		stderr = b''
+		with socket(AF_UNIX, SOCK_STREAM) as connection:
+			connection.connect(str(self.socket_path))
+			connection.sendall(REQUEST_HEADER.pack(len(payload)) + payload)
+			while True:
+				channel, size = RESPONSE_FRAME.unpack(receive_exactly(connection, RESPONSE_FRAME.size))
+				data = receive_exactly(connection, size)
+				if channel == CHANNEL_EXIT:
+					return EXIT_CODE.unpack(data)[0], stderr.decode()
+				stderr += data
+	
+	def test_in_process(self):
+		'''
+		Test several requests served by the daemon process
+		'''
+		
+		self._serve()
+		self.assertEqual((0, 'x|bee', ''), self._run('first_function', 'x'))
+		self.assertEqual((0, 'y|z', ''), self._run('first_function', 'y', 'z'))
+		exit_code, stdout, stderr = self._run('unknown_function')
+		self.assertEqual(2, exit_code)
+		self.assertIn('invalid choice', stderr)
+	
+	def test_preforked(self):
+		'''
+		Test several requests served by preforked workers
+		'''
+		
+		self._serve('--workers', '2')
+		for value in ('a', 'b', 'c'):
+			self.assertEqual((0, '1', ''), self._run('second_function', value))
+	
+	def test_timings_to_stderr(self):
+		'''
+		Test that the stderr of the run goes to the client
+		'''
+		
+		self._serve()
+		exit_code, stdout, stderr = self._run('--timings', 'first_function', 'x')
+		self.assertEqual((0, 'x|bee'), (exit_code, stdout))
+		self.assertIn('total', stderr)
+	
+	def test_socket_mode(self):
+		'''
+		Test that only the owner can use the socket
+		'''
+		
+		self._serve()
+		self.assertEqual(0o600, S_IMODE(self.socket_path.stat().st_mode))
+	
+	def test_client_forwards_help(self):
+		'''
+		Test that the client command forwards "--help" to the target
+		'''
+		
+		self._serve()
+		result = self._run_command('--socket', str(self.socket_path), '--help')
+		self.assertEqual(0, result.returncode, result.stderr)
+		self.assertIn('{first_function,second_function,ModuleClass}', result.stdout)
+	
+	def test_client_forwards_options(self):
+		'''
+		Test that the client command forwards an argv starting with an option, and drops a leading "--"
+		'''
+		
+		self._serve()
+		result = self._run_command('--socket', str(self.socket_path), '--output-format', 'json', 'first_function', 'x')
+		self.assertEqual((0, '"x|bee"'), (result.returncode, result.stdout.strip()))
+		result = self._run_command('--socket', str(self.socket_path), '--', '--output-format', 'json', 'first_function', 'y')
+		self.assertEqual((0, '"y|bee"'), (result.returncode, result.stdout.strip()))
+	
+	def test_client_without_socket(self):
+		'''
+		Test the client command without the socket option
+		'''
+		
+		result = self._run_command('first_function', 'x')
+		self.assertEqual(2, result.returncode)
+		self.assertIn('--socket', result.stderr)
+	
+	def test_invalid_requests(self):
+		'''
+		Test that invalid requests are rejected without stopping the daemon
+		'''
+		
+		self._serve()
+		exit_code, stderr = self._send_raw({'argv' : ['first_function', 'x'], 'env' : {}, 'cwd' : str(Path(self.temp_dir.name) / 'missing')})
+		self.assertEqual(2, exit_code)
+		self.assertIn('Unable to serve the request', stderr)
+		exit_code, stderr = self._send_raw({'argv' : ['first_function', 'x']})
+		self.assertEqual(2, exit_code)
+		self.assertIn('"env"', stderr)
+		self.assertEqual((0, 'x|bee', ''), self._run('first_function', 'x'))
@@ -0,0 +1,94 @@
+#python
+'''
+Testing the _timings.PhaseTimer class
+'''
+
+from io import StringIO
+from json import loads as json_loads
+from time import sleep
+from unittest import TestCase
+
+from simplifiedapp._timings import PhaseTimer, timer_phase
+
+class TestPhaseTimer(TestCase):
+	'''
+	Tests for the PhaseTimer class
+	'''
+	
+	def test_phases_in_order(self):
+		'''
+		Test that the phases are recorded in the order they're first entered
+		'''
+		
+		timer = PhaseTimer()
+		for name in ('second', 'first', 'second'):
+			with timer.phase(name):
+				pass
+		self.assertEqual(['second', 'first'], list(timer.phases))
+	
+	def test_phase_on_exception(self):
+		'''
+		Test that a phase is recorded even if its body raises
+		'''
+		
+		timer = PhaseTimer()
+		with self.assertRaises(ValueError):
+			with timer.phase('failing'):
+				raise ValueError('failing')
+		self.assertIn('failing', timer.phases)
+	
+	def test_nested_phases(self):
+		'''
+		Test that the time of a nested phase isn't counted in the outer one
+		'''
+		
+		timer = PhaseTimer()
+		with timer.phase('outer'):
+			with timer.phase('inner'):
+				sleep(0.05)
+		self.assertEqual(['outer', 'inner'], list(timer.phases))
+		self.assertGreaterEqual(timer.phases['inner'], 0.05)
+		self.assertLess(timer.phases['outer'], 0.025)
+	
+	def test_optional_timer(self):
+		'''
+		Test "timer_phase" without a timer
+		'''
+		
+		with timer_phase(None, 'nothing'):
+			pass
+	
+	def test_text_report(self):
+		'''
+		Test the text report
+		'''
+		
+		timer = PhaseTimer()
+		with timer.phase('some phase'):
+			pass
+		stream = StringIO()
+		timer.report(stream)
+		lines = stream.getvalue().splitlines()
+		self.assertEqual(2, len(lines))
+		self.assertTrue(lines[0].startswith('some phase '))
+		self.assertTrue(lines[1].startswith('total '))
+		self.assertTrue(lines[1].endswith(' ms'))
+	
+	def test_json_report(self):
+		'''
+		Test the JSON report
+		'''
+		
+		timer = PhaseTimer()
+		with timer.phase('some phase'):
+			pass
+		stream = StringIO()
+		timer.report(stream, format_='json')
+		self.assertEqual({'phases', 'total'}, set(json_loads(stream.getvalue())))
+	
+	def test_unknown_format(self):
+		'''
+		Test the report with an unknown format
+		'''
+		
+		self.assertRaises(ValueError, PhaseTimer().report, StringIO(), 'xml')
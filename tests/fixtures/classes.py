@@ -261,4 +261,19 @@ class FixtureDeepClassL1:
 			def __init__(self, init_arg):
 				self.init_arg = init_arg
 			def deep_method(self, pos_arg, /, *, kw_arg):
-				return '-'.join(map(str, (self.init_arg, pos_arg, kw_arg)))
\ No newline at end of file
+				return '-'.join(map(str, (self.init_arg, pos_arg, kw_arg)))
+
+class FixtureCountedClass(FancyStuff):
+	'''
+	'''
+	
+	initializations = 0
+	def __init__(self, init_arg):
+		type(self).initializations += 1
+		self.init_arg = init_arg
+	
+	def bound_method(self, pos_arg):
+		'''
+		'''
+		
+		return '-'.join(map(str, (self.init_arg, pos_arg)))
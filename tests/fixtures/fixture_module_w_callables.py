@@ -0,0 +1,37 @@
+#python
+'''Module with callables
+Fixture module exposing several functions and a class as subcommands.
+'''
+
+from os.path import join
+
+__version__ = '1.2.3'
+
+def first_function(a, b='bee'):
+	'''First function
+	Joins both parameters
+	'''
+	
+	return '|'.join((a, b))
+
+def second_function(*values):
+	'''Second function
+	Counts the values
+	'''
+	
+	return str(len(values))
+
+def _private_function():
+	pass
+
+
+class ModuleClass:
+	'''Module class
+	A class exposed as a subcommand
+	'''
+	
+	def __init__(self, value):
+		self.value = value
+	
+	def __str__(self):
+		return 'ModuleClass({})'.format(self.value)
@@ -100,4 +100,83 @@ def fixture_nested_functions_outer():
 		
 		pass
 	
-	return fixture_nested_functions_inner
\ No newline at end of file
+	return fixture_nested_functions_inner
+	
+def fixture_function_w_result(a, b='bee', *args, c=False, d=4, **kwargs):
+	'''Function with result
+	Joins all the provided parameters into a string
+	'''
+	
+	return '|'.join((str(a), str(b), str(args), str(c), str(d), str(sorted(kwargs.items()))))
+	
+async def fixture_async_function(a, b='bee'):
+	'''Coroutine function
+	Joins the parameters into a string, after yielding control to the event loop
+	'''
+	
+	from asyncio import sleep
+	await sleep(0)
+	return '|'.join((str(a), str(b)))
+	
+async def fixture_async_generator(count=3):
+	'''Asynchronous generator
+	Yields the numbers up to count
+	'''
+	
+	from asyncio import sleep
+	for number in range(int(count)):
+		await sleep(0)
+		yield number
+	
+def fixture_generator(count=3):
+	'''Generator
+	Yields a dict per number up to count
+	'''
+	
+	for number in range(int(count)):
+		yield {'number' : number}
+	
+def fixture_function_w_sum(*values):
+	'''Function with sum
+	Adds up the values, as integers
+	'''
+	
+	return sum(int(value) for value in values)
+	
+def fixture_function_w_iterable(items, factor=1):
+	'''Function with iterable
+	Lazily yields every item multiplied by the factor
+	'''
+	
+	for item in items:
+		yield item * int(factor)
+	
+async def fixture_async_function_w_delay(delay, value='done'):
+	'''Coroutine function with delay
+	Returns the value after sleeping for the delay
+	'''
+	
+	from asyncio import sleep
+	await sleep(float(delay))
+	return value
+	
+FIXTURE_MEMOIZED_CALLS = []
+
+def fixture_memoized_function(a, b='bee'):
+	'''Memoized function
+	Records every call and returns the joined values
+	'''
+	
+	FIXTURE_MEMOIZED_CALLS.append((a, b))
+	return '{}|{}'.format(a, b)
+	
+fixture_memoized_function.__simplifiedapp_memoize__ = True
+
+FIXTURE_UNSET = object()
+
+def fixture_function_w_sentinel_default(a=FIXTURE_UNSET):
+	'''Function with sentinel default
+	Tells if the argument was provided
+	'''
+	
+	return a is not FIXTURE_UNSET
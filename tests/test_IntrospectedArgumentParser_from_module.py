@@ -0,0 +1,58 @@
+#python
+'''
+Testing of the module parser in simplifiedapp
+'''
+
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+import fixtures.fixture_module_w_callables
+from simplifiedapp import IntrospectedArgumentParser, LazyParsersMap, compile_arguments, introspect_callable
+
+from_module = IntrospectedArgumentParser.from_module
+class TestIntrospectedArgumentParserFromModule(TestCase):
+	'''
+	Tests for the IntrospectedArgumentParser.from_module class method
+	'''
+	
+	def test_subcommands_index(self):
+		'''
+		Test IntrospectedArgumentParser.from_module listing the public callables
+		'''
+		
+		parser = from_module(fixtures.fixture_module_w_callables)
+		subparsers = parser._subparsers._group_actions[0]
+		self.assertIsInstance(subparsers.choices, LazyParsersMap)
+		expected_result = ['first_function', 'second_function', 'ModuleClass']
+		self.assertEqual(expected_result, list(subparsers.choices))
+	
+	@patch('simplifiedapp.introspect_callable', wraps=introspect_callable)
+	def test_lazy_construction(self, mock_introspect):
+		'''
+		Test IntrospectedArgumentParser.from_module only introspecting the requested subcommand
+		'''
+		
+		parser = from_module(fixtures.fixture_module_w_callables)
+		mock_introspect.assert_not_called()
+		
+		args = parser.parse_args(['second_function', '1', '2'])
+		mock_introspect.assert_called_once_with(fixtures.fixture_module_w_callables.second_function, cache=None, timer=None)
+		self.assertEqual(fixtures.fixture_module_w_callables.second_function, args.callable)
+		self.assertEqual(['1', '2'], getattr(args, 'second-function-values'))
+		metadata, parameters, plan = args.introspection
+		self.assertEqual('second_function', metadata['name'])
+		self.assertEqual(['values'], list(parameters))
+		self.assertEqual(compile_arguments(parameters), plan)
+	
+	@patch('sys.stdout', new_callable=StringIO)
+	@patch('simplifiedapp.introspect_callable', wraps=introspect_callable)
+	def test_help(self, mock_introspect, mock_stdout):
+		'''
+		Test IntrospectedArgumentParser.from_module help without introspecting any subcommand
+		'''
+		
+		parser = from_module(fixtures.fixture_module_w_callables)
+		self.assertRaises(SystemExit, parser.parse_args, ['--help'])
+		self.assertIn('{first_function,second_function,ModuleClass}', mock_stdout.getvalue())
+		mock_introspect.assert_not_called()
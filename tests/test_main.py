@@ -19,6 +19,12 @@ from simplifiedapp import main
 def empty_callable():
 	return 'Ok from test_main.'
 
+def range_callable(count):
+	return list(range(int(count)))
+
+def builtin_names_callable(workers=4, columns='a,b', timings='no'):
+	return '|'.join((str(workers), columns, timings))
+
 
 class TestMain(TestCase):
 	'''
@@ -147,4 +153,269 @@ class TestMain(TestCase):
 
 		result = self.test_object(fixture_empty_function, ['--log-to-syslog'])
 		self.assertEqual('None\n', mock_stdout.getvalue())
-		
\ No newline at end of file
+		
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_run_module_subcommand(self, mock_stdout):
+		'''
+		Test with a module target and a subcommand
+		'''
+		
+		import fixtures.fixture_module_w_callables
+		
+		self.test_object(fixtures.fixture_module_w_callables, ['first_function', 'x', 'y'])
+		self.assertEqual('x|y', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_module_subcommand_introspected_once(self, mock_stdout):
+		'''
+		Test that the subcommand of a module target is introspected only once
+		'''
+		
+		import fixtures.fixture_module_w_callables
+		from simplifiedapp import introspect_callable
+		
+		with unittest.mock.patch('simplifiedapp.introspect_callable', wraps=introspect_callable) as mock_introspect:
+			self.test_object(fixtures.fixture_module_w_callables, ['second_function', 'x', 'y'])
+		self.assertEqual('2', mock_stdout.getvalue())
+		mock_introspect.assert_called_once()
+
+	@unittest.mock.patch('sys.stderr', new_callable=io.StringIO)
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_timings_json(self, mock_stdout, mock_stderr):
+		'''
+		Test the timings report as a JSON record
+		'''
+		
+		import json
+		import fixtures.fixture_module_w_callables
+		
+		self.test_object(fixtures.fixture_module_w_callables, ['--timings', '--timings-format', 'json', 'first_function', 'x'])
+		self.assertEqual('x|bee', mock_stdout.getvalue())
+		record = json.loads(mock_stderr.getvalue())
+		expected_phases = ['base parser', 'logging setup', 'get_target', 'parser construction', 'argv parsing', 'metadata', 'parameters', 'binding', 'execution', 'output']
+		self.assertEqual(expected_phases, list(record['phases']))
+		self.assertGreaterEqual(record['total'], sum(record['phases'].values()) - 0.01)
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_help_builtin_group(self, mock_stdout):
+		'''
+		Test that the builtin options are listed in their own section of the help
+		'''
+		
+		self.assertRaises(SystemExit, self.test_object, builtin_names_callable, ['--help'])
+		target_section, _, builtin_section = mock_stdout.getvalue().partition('\nsimplifiedapp options:\n')
+		self.assertIn('builtin-names-callable-workers', target_section.partition('\npositional arguments:\n')[2])
+		self.assertNotIn('--map', target_section.partition('\noptions:\n')[2])
+		self.assertIn('--map', builtin_section)
+		self.assertIn('--log-level', builtin_section)
+
+	@unittest.mock.patch('sys.stderr', new_callable=io.StringIO)
+	@unittest.mock.patch.dict('sys.modules', {'uvloop' : None})
+	def test_missing_uvloop(self, mock_stderr):
+		'''
+		Test that requesting uvloop without it being installed is a usage error
+		'''
+		
+		with self.assertRaises(SystemExit) as context:
+			self.test_object(empty_callable, ['--event-loop', 'uvloop'])
+		self.assertEqual(2, context.exception.code)
+		self.assertIn('"uvloop" package is not installed', mock_stderr.getvalue())
+
+	@unittest.mock.patch('sys.stderr', new_callable=io.StringIO)
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_timings_coroutine(self, mock_stdout, mock_stderr):
+		'''
+		Test that awaiting a coroutine is timed as execution, not output
+		'''
+		
+		import json
+		from fixtures.functions import fixture_async_function_w_delay
+		
+		self.test_object(fixture_async_function_w_delay, ['--timings', '--timings-format', 'json', '0.2'])
+		self.assertEqual('done', mock_stdout.getvalue())
+		phases = json.loads(mock_stderr.getvalue())['phases']
+		self.assertGreaterEqual(phases['execution'], 200)
+		self.assertLess(phases['output'], 100)
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_run_coroutine_function(self, mock_stdout):
+		'''
+		Test with a coroutine function target
+		'''
+		
+		from fixtures.functions import fixture_async_function
+		
+		self.test_object(fixture_async_function, ['x'])
+		self.assertEqual('x|bee', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_run_generator_jsonl(self, mock_stdout):
+		'''
+		Test with a generator target streamed as JSON Lines
+		'''
+		
+		from fixtures.functions import fixture_generator
+		
+		self.test_object(fixture_generator, ['--output-format', 'jsonl', '2'])
+		self.assertEqual('{"number": 0}\n{"number": 1}\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdin', new_callable=lambda: io.StringIO('{"a": "x"}\n{"a": "y", "b": "z"}\n'))
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_batch_input(self, mock_stdout, mock_stdin):
+		'''
+		Test the batch mode with a module target reading from stdin
+		'''
+		
+		import fixtures.fixture_module_w_callables
+		
+		self.test_object(fixtures.fixture_module_w_callables, ['--batch-input', '-', 'first_function'])
+		self.assertEqual('x|bee\ny|z\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_map(self, mock_stdout):
+		'''
+		Test the parallel map over a variable positional parameter
+		'''
+		
+		import fixtures.fixture_module_w_callables
+		
+		self.test_object(fixtures.fixture_module_w_callables, ['--map', 'values', '--workers', '2', 'second_function', 'x', 'y', 'z'])
+		self.assertEqual('1\n1\n1\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdin', new_callable=lambda: io.StringIO('{"delay": 0, "value": "a"}\n{"delay": 0, "value": "b"}\n'))
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_batch_concurrency(self, mock_stdout, mock_stdin):
+		'''
+		Test the batch mode with concurrency for a coroutine function
+		'''
+		
+		from fixtures.functions import fixture_async_function_w_delay
+		
+		self.test_object(fixture_async_function_w_delay, ['--batch-input', '-', '--concurrency', '2'])
+		self.assertEqual('a\nb\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_memoized_result(self, mock_stdout):
+		'''
+		Test that the result of a memoized target is reused by a later run with the same arguments
+		'''
+		
+		from tempfile import TemporaryDirectory
+		from fixtures.functions import FIXTURE_MEMOIZED_CALLS, fixture_memoized_function
+		
+		FIXTURE_MEMOIZED_CALLS.clear()
+		with TemporaryDirectory() as cache_dir:
+			for _ in range(2):
+				self.test_object(fixture_memoized_function, ['--cache-dir', cache_dir, 'x'])
+		self.assertEqual('x|beex|bee', mock_stdout.getvalue())
+		self.assertEqual([('x', 'bee')], FIXTURE_MEMOIZED_CALLS)
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_json(self, mock_stdout):
+		'''
+		Test the json switch with a generator
+		'''
+		
+		from fixtures.functions import fixture_generator
+		
+		self.test_object(fixture_generator, ['--json', '2'])
+		self.assertEqual('[{"number":0},{"number":1}]\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_max_items(self, mock_stdout):
+		'''
+		Test the truncation of the formatted result
+		'''
+		
+		self.test_object(range_callable, ['--max-items', '2', '5'])
+		self.assertEqual('[0, 1, ...]\n# elided: 3 items beyond 2 per container\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_tsv_columns(self, mock_stdout):
+		'''
+		Test the tsv output format with explicit columns
+		'''
+		
+		from fixtures.functions import fixture_generator
+		
+		self.test_object(fixture_generator, ['--output-format', 'tsv', '--columns', 'number,missing', '2'])
+		self.assertEqual('number\tmissing\n0\t\n1\t\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_writer_queue(self, mock_stdout):
+		'''
+		Test writing the output from the writer thread
+		'''
+		
+		from fixtures.functions import fixture_generator
+		
+		self.test_object(fixture_generator, ['--writer-queue', '4', '--output-format', 'jsonl', '2'])
+		self.assertEqual('{"number": 0}\n{"number": 1}\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_input_file(self, mock_stdout):
+		'''
+		Test using the values of an input file as defaults
+		'''
+		
+		from tempfile import TemporaryDirectory
+		from fixtures.functions import fixture_async_function
+		
+		with TemporaryDirectory() as temp_dir:
+			path = pathlib.Path(temp_dir) / 'config.json'
+			path.write_text('{"b": "from file"}')
+			self.test_object(fixture_async_function, ['--input-file', str(path), 'json', '--cache-dir', temp_dir, 'x'])
+			self.test_object(fixture_async_function, ['--input-file', str(path), 'json', '--cache-dir', temp_dir, 'y'])
+			self.assertTrue((pathlib.Path(temp_dir) / 'input').is_dir())
+		self.assertEqual('x|from filey|from file', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdin', new_callable=lambda: io.StringIO('1\n2\n3\n'))
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_iterable_input(self, mock_stdout, mock_stdin):
+		'''
+		Test feeding a parameter lazily from JSON Lines in the standard input
+		'''
+		
+		from fixtures.functions import fixture_function_w_iterable
+		
+		self.test_object(fixture_function_w_iterable, ['--iterable-input', 'items', '-', '2'])
+		self.assertEqual('2\n4\n6\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_iterable_input_varargs(self, mock_stdout):
+		'''
+		Test feeding a variable positional parameter from a JSON array
+		'''
+		
+		from tempfile import TemporaryDirectory
+		from fixtures.functions import fixture_function_w_sum
+		
+		with TemporaryDirectory() as temp_dir:
+			path = pathlib.Path(temp_dir) / 'values.json'
+			path.write_text('[1, 2, 3]')
+			self.test_object(fixture_function_w_sum, ['--iterable-input', 'values', str(path)])
+		self.assertEqual('6\n', mock_stdout.getvalue())
+
+	@unittest.mock.patch('sys.stdout', new_callable=io.StringIO)
+	def test_builtin_option_names(self, mock_stdout):
+		'''
+		Test that the builtin options don't replace the defaults of parameters with the same name
+		'''
+		
+		self.test_object(builtin_names_callable, [])
+		self.assertEqual('4|a,b|no', mock_stdout.getvalue())
+
+	def test_output_file(self):
+		'''
+		Test writing the output into a compressed file
+		'''
+		
+		from gzip import decompress
+		from tempfile import TemporaryDirectory
+		from fixtures.functions import fixture_generator
+		
+		with TemporaryDirectory() as temp_dir:
+			path = pathlib.Path(temp_dir) / 'out.jsonl.gz'
+			self.test_object(fixture_generator, ['--output-file', str(path), '--output-format', 'jsonl', '2'])
+			self.assertEqual(b'{"number": 0}\n{"number": 1}\n', decompress(path.read_bytes()))